@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+_loop = None
+_engine = None
+_sessionmaker = None
+_lock = threading.Lock()
+
+
+def _async_url(url):
+    url = make_url(url)
+    return url.set(drivername="postgresql+asyncpg")
+
+
+def _start_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(
+        target=loop.run_forever, name="async-db-loop", daemon=True
+    )
+    thread.start()
+    return loop
+
+
+def init_async_db(app):
+    global _loop, _engine, _sessionmaker
+    with _lock:
+        if _engine is not None:
+            return
+
+        connect_args = {}
+        if app.config.get("DB_STATEMENT_TIMEOUT_MS"):
+            connect_args["server_settings"] = {
+                "statement_timeout": str(app.config["DB_STATEMENT_TIMEOUT_MS"])
+            }
+
+        _loop = _start_loop()
+        _engine = create_async_engine(
+            _async_url(
+                app.config.get("ASYNC_DATABASE_URI")
+                or app.config["SQLALCHEMY_DATABASE_URI"]
+            ),
+            pool_size=app.config.get("ASYNC_DB_POOL_SIZE", 20),
+            max_overflow=app.config.get("ASYNC_DB_MAX_OVERFLOW", 10),
+            pool_recycle=app.config.get("DB_POOL_RECYCLE", 1800),
+            pool_pre_ping=True,
+            connect_args=connect_args,
+        )
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
+
+
+async def run_on_db_loop(coro_fn, *args, **kwargs):
+    if _sessionmaker is None:
+        raise RuntimeError("Async database is not initialised")
+
+    async def runner():
+        async with _sessionmaker() as session:
+            return await coro_fn(session, *args, **kwargs)
+
+    future = asyncio.run_coroutine_threadsafe(runner(), _loop)
+    return await asyncio.wrap_future(future)
+
+
+def dispose_async_db():
+    global _loop, _engine, _sessionmaker
+    with _lock:
+        if _engine is None:
+            return
+        asyncio.run_coroutine_threadsafe(_engine.dispose(), _loop).result()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop = _engine = _sessionmaker = None
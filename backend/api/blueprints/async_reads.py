@@ -0,0 +1,57 @@
+from flask import Blueprint, request
+
+from api.async_db import run_on_db_loop
+from api.helpers.async_read_helper import (
+    count_followers_async,
+    view_all_active_campaigns_async,
+    view_all_comments_by_campaign_async,
+    view_campaign_by_campaign_id_async,
+)
+from api.helpers.pagination_helper import get_page_size
+from api.serializers import output_orjson
+
+async_reads_bp = Blueprint("async_reads", __name__, url_prefix="/async")
+
+
+def _success(data):
+    return output_orjson({"status": "success", "data": data}, 200)
+
+
+def _error(e, code):
+    return output_orjson({"status": "error", "message": str(e)}, code)
+
+
+@async_reads_bp.errorhandler(LookupError)
+def handle_not_found(e):
+    return _error(e, 404)
+
+
+@async_reads_bp.errorhandler(ValueError)
+def handle_bad_request(e):
+    return _error(e, 400)
+
+
+@async_reads_bp.get("/campaigns/<int:campaign_id>")
+async def get_campaign(campaign_id):
+    return _success(
+        await run_on_db_loop(view_campaign_by_campaign_id_async, campaign_id)
+    )
+
+
+@async_reads_bp.get("/campaigns/active")
+async def get_active_campaigns():
+    limit = get_page_size(request.args.get("limit"))
+    return _success(await run_on_db_loop(view_all_active_campaigns_async, limit))
+
+
+@async_reads_bp.get("/campaigns/<int:campaign_id>/followers/count")
+async def get_follower_count(campaign_id):
+    return _success(await run_on_db_loop(count_followers_async, campaign_id))
+
+
+@async_reads_bp.get("/campaigns/<int:campaign_id>/comments")
+async def get_campaign_comments(campaign_id):
+    limit = get_page_size(request.args.get("limit"))
+    return _success(
+        await run_on_db_loop(view_all_comments_by_campaign_async, campaign_id, limit)
+    )
@@ -0,0 +1,87 @@
+from functools import partial
+
+from flask import request
+from flask_restx import Resource
+
+from api import campaigns_ns, donations_ns, payments_ns, users_ns
+from api.helpers.batch_helper import get_loader
+from api.helpers.campaign_helper import view_campaigns_by_ids
+from api.helpers.comment_helper import view_comments_by_ids
+from api.helpers.donation_helper import view_donations_by_ids
+from api.helpers.follow_helper import view_follows_by_ids
+from api.helpers.payment_helper import view_payments_by_ids
+from api.helpers.security_helper import (
+    admin_required,
+    get_request_claims,
+    jwt_required,
+)
+from api.helpers.user_helper import view_users_by_ids
+
+
+def _batch_response(name, batch_fn, id_key):
+    try:
+        page = get_loader(name, batch_fn, id_key).load_many(request.args.get("ids"))
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+    return {"status": "success", "data": page}, 200
+
+
+def _owner_scope(user_id):
+    # Admins may read anyone's rows; everyone else only sees their own, and
+    # ids they do not own are reported as missing.
+    claims, _ = get_request_claims()
+    return None if claims.get("role") == "admin" else user_id
+
+
+@campaigns_ns.route("/batch")
+class CampaignBatch(Resource):
+    def get(self):
+        return _batch_response("campaigns", view_campaigns_by_ids, "campaign_id")
+
+
+@campaigns_ns.route("/comments/batch")
+class CommentBatch(Resource):
+    def get(self):
+        return _batch_response("comments", view_comments_by_ids, "comment_id")
+
+
+@users_ns.route("/batch")
+class UserBatch(Resource):
+    method_decorators = [jwt_required]
+
+    def get(self, user_id):
+        return _batch_response("users", view_users_by_ids, "user_id")
+
+
+@donations_ns.route("/batch")
+class DonationBatch(Resource):
+    method_decorators = [jwt_required]
+
+    def get(self, user_id):
+        owner_id = _owner_scope(user_id)
+        return _batch_response(
+            f"donations:{owner_id}",
+            partial(view_donations_by_ids, owner_id=owner_id),
+            "donation_id",
+        )
+
+
+@payments_ns.route("/batch")
+class PaymentBatch(Resource):
+    method_decorators = [admin_required]
+
+    def get(self):
+        return _batch_response("payments", view_payments_by_ids, "payment_id")
+
+
+@users_ns.route("/follows/batch")
+class FollowBatch(Resource):
+    method_decorators = [jwt_required]
+
+    def get(self, user_id):
+        owner_id = _owner_scope(user_id)
+        return _batch_response(
+            f"follows:{owner_id}",
+            partial(view_follows_by_ids, owner_id=owner_id),
+            "follow_id",
+        )
@@ -0,0 +1,61 @@
+from flask import request
+from flask_restx import Resource
+
+from api import campaigns_ns
+from api.helpers.campaign_helper import view_all_campaigns_paginated
+from api.helpers.conditional_helper import (
+    conditional_response,
+    get_campaign_collection_version,
+    get_campaign_with_version,
+    make_etag,
+)
+from api.helpers.pagination_helper import get_page_size
+
+
+@campaigns_ns.route("/")
+class CampaignList(Resource):
+    def get(self):
+        category = request.args.get("category")
+        status = request.args.get("status")
+        try:
+            last_modified = get_campaign_collection_version(category, status)
+            per_page = get_page_size(request.args.get("limit"))
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        def build():
+            page = view_all_campaigns_paginated(
+                cursor=request.args.get("cursor"),
+                per_page=per_page,
+                category=category,
+                status=status,
+                projection=True,
+            )
+            return {"status": "success", "data": page}
+
+        try:
+            return conditional_response(
+                make_etag("campaigns", last_modified), last_modified, build
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+
+@campaigns_ns.route("/<int:campaign_id>")
+class CampaignDetail(Resource):
+    def get(self, campaign_id):
+        found = get_campaign_with_version(campaign_id)
+        if found is None:
+            return {
+                "status": "error",
+                "message": f"No campaign with campaign id: {campaign_id} was found",
+            }, 404
+
+        # The body is serialised from the same row the version came from, so
+        # an ETag never labels an older (e.g. cached) representation.
+        campaign, last_modified = found
+        return conditional_response(
+            make_etag("campaign", campaign_id, last_modified),
+            last_modified,
+            lambda: {"status": "success", "data": campaign.to_dict()},
+        )
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from flask import Response, request, stream_with_context
+from flask_restx import Resource
+
+from api import donations_ns, payments_ns
+from api.helpers.export_helper import (
+    DONATION_EXPORT_COLUMNS,
+    PAYMENT_EXPORT_COLUMNS,
+    export_fieldnames,
+    iter_donation_export,
+    iter_payment_export,
+    stream_export,
+)
+from api.helpers.security_helper import admin_required
+
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _export_response(batches, columns, basename):
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in MIMETYPES:
+        return {"status": "error", "message": f"Invalid export format: {export_format}"}, 400
+
+    compress = request.accept_encodings["gzip"] > 0
+    body = stream_export(
+        batches, export_fieldnames(columns), export_format, compress=compress
+    )
+    filename = f"{basename}-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format}"
+    response = Response(stream_with_context(body), mimetype=MIMETYPES[export_format])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["Vary"] = "Accept-Encoding"
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+@payments_ns.route("/export")
+class PaymentExport(Resource):
+    method_decorators = [admin_required]
+
+    def get(self):
+        return _export_response(iter_payment_export(), PAYMENT_EXPORT_COLUMNS, "payments")
+
+
+@donations_ns.route("/campaign/<int:campaign_id>/export")
+class CampaignDonationExport(Resource):
+    method_decorators = [admin_required]
+
+    def get(self, campaign_id):
+        return _export_response(
+            iter_donation_export(campaign_id),
+            DONATION_EXPORT_COLUMNS,
+            f"campaign-{campaign_id}-donations",
+        )
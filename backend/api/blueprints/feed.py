@@ -0,0 +1,22 @@
+from flask import request
+from flask_restx import Resource
+
+from api import updates_ns
+from api.helpers.feed_helper import view_feed_by_user
+from api.helpers.security_helper import jwt_required
+
+
+@updates_ns.route("/feed")
+class UpdateFeed(Resource):
+    method_decorators = [jwt_required]
+
+    def get(self, user_id):
+        try:
+            page = view_feed_by_user(
+                user_id,
+                cursor=request.args.get("cursor"),
+                limit=request.args.get("limit"),
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+        return {"status": "success", "data": page}, 200
@@ -0,0 +1,34 @@
+from datetime import date
+
+from flask import request
+from flask_restx import Resource
+
+from api import payments_ns
+from api.helpers.payment_helper import get_payment_summary
+from api.helpers.security_helper import admin_required
+
+
+def _parse_date(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: expected YYYY-MM-DD")
+
+
+@payments_ns.route("/summary")
+class PaymentSummary(Resource):
+    method_decorators = [admin_required]
+
+    def get(self):
+        try:
+            summary = get_payment_summary(
+                start_date=_parse_date("start_date"),
+                end_date=_parse_date("end_date"),
+                granularity=request.args.get("granularity", "day").lower(),
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+        return {"status": "success", "data": summary}, 200
@@ -0,0 +1,56 @@
+from flask import request
+from flask_restx import Resource
+
+from api import donations_ns, payments_ns
+from api.helpers.donation_helper import create_donation
+from api.helpers.idempotency_helper import idempotent
+from api.helpers.payment_helper import create_donor_payment
+from api.helpers.security_helper import jwt_required
+from api.models.cf_models import DonationStatus
+
+
+@donations_ns.route("/")
+class DonationCreate(Resource):
+    method_decorators = [jwt_required]
+
+    @idempotent("donations.create")
+    def post(self, user_id):
+        data = request.get_json(silent=True) or {}
+        try:
+            donation = create_donation(
+                user_id=user_id,
+                campaign_id=data.get("campaign_id"),
+                amount=data.get("amount"),
+                status=DonationStatus.PENDING,
+                commit=False,
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+        except RuntimeError as e:
+            return {"status": "error", "message": str(e)}, 500
+        return {"status": "success", "data": donation}, 201
+
+
+@payments_ns.route("/")
+class PaymentCreate(Resource):
+    method_decorators = [jwt_required]
+
+    @idempotent("payments.create")
+    def post(self, user_id):
+        data = request.get_json(silent=True) or {}
+        try:
+            payment = create_donor_payment(
+                user_id=user_id,
+                donation_id=data.get("donation_id"),
+                payment_method=data.get("payment_method"),
+                amount=data.get("amount"),
+                transaction_ref=data.get("transaction_ref"),
+                commit=False,
+            )
+        except PermissionError as e:
+            return {"status": "error", "message": str(e)}, 403
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+        except RuntimeError as e:
+            return {"status": "error", "message": str(e)}, 500
+        return {"status": "success", "data": payment}, 201
@@ -0,0 +1,19 @@
+from flask import request
+from flask_restx import Resource
+
+from api import campaigns_ns
+from api.helpers.pagination_helper import get_page_size
+from api.helpers.trending_helper import view_trending_campaigns
+
+
+@campaigns_ns.route("/trending")
+class TrendingCampaigns(Resource):
+    def get(self):
+        try:
+            campaigns = view_trending_campaigns(
+                category=request.args.get("category"),
+                limit=get_page_size(request.args.get("limit")),
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+        return {"status": "success", "data": campaigns}, 200
@@ -0,0 +1,91 @@
+import os
+
+from celery import Celery, Task
+
+DEFAULT_BROKER_URL = "redis://localhost:6379/0"
+DEFAULT_BROKER_CONNECT_TIMEOUT = 1
+
+
+def _env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def celery_config(app):
+    connect_timeout = float(
+        os.environ.get("CELERY_BROKER_CONNECT_TIMEOUT", DEFAULT_BROKER_CONNECT_TIMEOUT)
+    )
+    config = {
+        "broker_url": os.environ.get("CELERY_BROKER_URL", DEFAULT_BROKER_URL),
+        "result_backend": os.environ.get("CELERY_RESULT_BACKEND"),
+        "task_ignore_result": True,
+        "task_always_eager": _env_flag("CELERY_TASK_ALWAYS_EAGER"),
+        "task_eager_propagates": True,
+        "task_acks_late": True,
+        # enqueue() runs inside request handlers after the commit: fail fast
+        # when the broker is down instead of holding the request open.
+        "broker_connection_timeout": connect_timeout,
+        "broker_transport_options": {
+            "socket_connect_timeout": connect_timeout,
+            "socket_timeout": connect_timeout,
+        },
+        "task_publish_retry_policy": {"max_retries": 1, "interval_start": 0},
+        "worker_prefetch_multiplier": 1,
+        "beat_schedule": {
+            "retry-fan-outs": {
+                "task": "api.tasks.retry_fan_outs",
+                "schedule": 5 * 60,
+            },
+            "refresh-analytics": {
+                "task": "api.tasks.refresh_analytics",
+                "schedule": 15 * 60,
+            },
+            "refresh-trending": {
+                "task": "api.tasks.refresh_trending",
+                "schedule": 5 * 60,
+            },
+            "reconcile-payments": {
+                "task": "api.tasks.reconcile_payments",
+                "schedule": 60 * 60,
+            },
+            # Sharded comments serve comments.likes, so keep the fold short.
+            "fold-like-shards": {
+                "task": "api.tasks.fold_like_shards",
+                "schedule": 30,
+            },
+            "purge-idempotency-keys": {
+                "task": "api.tasks.purge_idempotency_keys",
+                "schedule": 60 * 60,
+            },
+        },
+    }
+    config.update(app.config.get("CELERY", {}))
+    return config
+
+
+def init_celery(app):
+    class FlaskTask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery_app = Celery(app.name, task_cls=FlaskTask)
+    celery_app.config_from_object(celery_config(app))
+    celery_app.set_default()
+    app.extensions["celery"] = celery_app
+    return celery_app
+
+
+def enqueue(task, *args, **kwargs):
+    from flask import current_app
+
+    # Callers enqueue after their transaction has committed, so a broker
+    # outage (or an eager task failing) must not turn a saved write into an
+    # error response.
+    try:
+        return task.delay(*args, **kwargs)
+    except Exception as e:
+        current_app.logger.error(f"Could not enqueue {task.name}: {str(e)}")
+        return None
@@ -0,0 +1,89 @@
+import json
+
+import click
+
+from api import app
+
+
+@app.cli.command("reconcile-counters")
+@click.option("--dry-run", is_flag=True, help="Report drift without fixing it.")
+def reconcile_counters(dry_run):
+    from api.helpers.campaign_counter_helper import reconcile_campaign_counters
+
+    report = reconcile_campaign_counters(dry_run=dry_run)
+    click.echo(json.dumps(report, indent=2))
+
+
+@app.cli.command("import-settlements")
+@click.argument("settlement_file", type=click.File("r", encoding="utf-8"))
+@click.option("--batch-size", default=1000, show_default=True)
+def import_settlements(settlement_file, batch_size):
+    import csv
+
+    from api.helpers.bulk_import_helper import iter_import_batches
+
+    totals = {"rows": 0, "imported": 0, "errors": 0}
+    for report in iter_import_batches(csv.DictReader(settlement_file), batch_size):
+        totals["rows"] += report["rows"]
+        totals["imported"] += report["imported"]
+        totals["errors"] += len(report["errors"])
+        for error in report["errors"]:
+            click.echo(json.dumps(error), err=True)
+    click.echo(json.dumps(totals))
+
+
+@app.cli.command("refresh-analytics")
+@click.option("--full", is_flag=True, help="Rebuild rollups from scratch.")
+def refresh_analytics(full):
+    from api.helpers.campaign_analytics_helper import refresh_campaign_analytics
+
+    click.echo(json.dumps(refresh_campaign_analytics(full=full), default=str))
+
+
+@app.cli.command("close-payment-days")
+@click.option(
+    "--through",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Last day to close (defaults to yesterday, UTC).",
+)
+@click.option("--full", is_flag=True, help="Re-close every day from scratch.")
+def close_payment_days_command(through, full):
+    from api.helpers.payment_helper import close_payment_days
+
+    try:
+        report = close_payment_days(
+            through=through.date() if through else None, full=full
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--through")
+    click.echo(json.dumps(report, default=str))
+
+
+@app.cli.command("purge-idempotency-keys")
+@click.option("--batch-size", default=1000, show_default=True)
+def purge_idempotency_keys(batch_size):
+    from api.helpers.idempotency_helper import purge_expired_idempotency_keys
+
+    click.echo(json.dumps({"purged": purge_expired_idempotency_keys(batch_size)}))
+
+
+@app.cli.command("refresh-trending")
+@click.option("--full", is_flag=True, help="Rescore every campaign from scratch.")
+def refresh_trending(full):
+    from api.helpers.trending_helper import refresh_trending_scores
+
+    click.echo(json.dumps(refresh_trending_scores(full=full), default=str))
+
+
+@app.cli.command("fold-like-shards")
+def fold_like_shards():
+    from api.helpers.comment_helper import fold_all_like_shards
+
+    click.echo(json.dumps({"comments": fold_all_like_shards()}))
+
+
+@app.cli.command("retry-fan-outs")
+def retry_fan_outs():
+    from api.helpers.notification_helper import retry_pending_fan_outs
+
+    click.echo(json.dumps(retry_pending_fan_outs()))
@@ -1,4 +1,4 @@
-from api import db, bcrypt
+from api import db
 from api.models.cf_models import AdminReviews
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
@@ -0,0 +1,82 @@
+from api.models.cf_models import CampaignStatus, Campaigns, Comments, Follows, Users
+from api.helpers.campaign_helper import CAMPAIGN_LIST_COLUMNS, _campaign_row_to_dict
+from api.helpers.pagination_helper import get_page_size
+from sqlalchemy import func, select
+
+
+def _campaign_select():
+    return select(*CAMPAIGN_LIST_COLUMNS).outerjoin(
+        Users, Users.user_id == Campaigns.creator_id
+    )
+
+
+async def view_campaign_by_campaign_id_async(session, campaign_id):
+    row = (
+        await session.execute(
+            _campaign_select().where(Campaigns.campaign_id == campaign_id)
+        )
+    ).first()
+    if not row:
+        raise LookupError(f"No campaign with campaign id: {campaign_id} was found")
+    return _campaign_row_to_dict(row)
+
+
+async def view_all_active_campaigns_async(session, limit=None):
+    rows = (
+        await session.execute(
+            _campaign_select()
+            .where(Campaigns.status == CampaignStatus.ACTIVE)
+            .order_by(Campaigns.created_at.desc(), Campaigns.campaign_id.desc())
+            .limit(get_page_size(limit))
+        )
+    ).all()
+    return [_campaign_row_to_dict(row) for row in rows]
+
+
+async def count_followers_async(session, campaign_id):
+    count = (
+        await session.execute(
+            select(func.count(Follows.follow_id)).where(
+                Follows.campaign_id == campaign_id
+            )
+        )
+    ).scalar()
+    return {"campaign_id": campaign_id, "follower_count": count or 0}
+
+
+async def view_all_comments_by_campaign_async(session, campaign_id, limit=None):
+    rows = (
+        await session.execute(
+            select(
+                Comments.comment_id,
+                Comments.content,
+                Comments.likes,
+                Comments.created_at,
+                Users.user_id,
+                Users.username,
+                Users.profile_image,
+                Campaigns.campaign_id,
+                Campaigns.title,
+            )
+            .join(Users, Users.user_id == Comments.user_id)
+            .join(Campaigns, Campaigns.campaign_id == Comments.campaign_id)
+            .where(Comments.campaign_id == campaign_id)
+            .order_by(Comments.created_at.desc(), Comments.comment_id.desc())
+            .limit(get_page_size(limit))
+        )
+    ).all()
+    return [
+        {
+            "comment_id": r.comment_id,
+            "content": r.content,
+            "likes": r.likes,
+            "created_at": r.created_at,
+            "user": {
+                "user_id": r.user_id,
+                "username": r.username,
+                "profile_image": r.profile_image,
+            },
+            "campaign": {"campaign_id": r.campaign_id, "title": r.title},
+        }
+        for r in rows
+    ]
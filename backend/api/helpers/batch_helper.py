@@ -0,0 +1,121 @@
+from api import db
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import any_, bindparam, event
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+DEFAULT_MAX_BATCH_SIZE = 100
+
+
+def get_max_batch_size():
+    if has_app_context():
+        return current_app.config.get("BATCH_MAX_IDS", DEFAULT_MAX_BATCH_SIZE)
+    return DEFAULT_MAX_BATCH_SIZE
+
+
+def parse_ids(ids):
+    if ids is None:
+        raise ValueError("ids cannot be empty")
+    if isinstance(ids, str):
+        ids = [part for part in ids.split(",") if part.strip()]
+
+    parsed, seen = [], set()
+    for raw in ids:
+        try:
+            row_id = int(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid id: {raw}")
+        if row_id not in seen:
+            seen.add(row_id)
+            parsed.append(row_id)
+
+    if not parsed:
+        raise ValueError("ids cannot be empty")
+    if len(parsed) > get_max_batch_size():
+        raise ValueError(f"Too many ids. At most {get_max_batch_size()} per request")
+    return parsed
+
+
+def batch_get(
+    model, id_column, ids, options=(), serializer=lambda row: row.to_dict(), filters=()
+):
+    ids = parse_ids(ids)
+    rows = (
+        db.session.query(model)
+        .options(*options)
+        .filter(
+            id_column
+            == any_(bindparam("batch_ids", ids, type_=ARRAY(id_column.type))),
+            *filters,
+        )
+        .all()
+    )
+    found = {getattr(row, id_column.key): row for row in rows}
+    return {
+        "items": [serializer(found[row_id]) for row_id in ids if row_id in found],
+        "missing": [row_id for row_id in ids if row_id not in found],
+    }
+
+
+class RequestLoader:
+    def __init__(self, batch_fn, id_key):
+        self.batch_fn = batch_fn
+        self.id_key = id_key
+        self._results = {}
+        self._missing = set()
+        self._pending = []
+
+    def _known(self, row_id):
+        return row_id in self._results or row_id in self._missing
+
+    def want(self, ids):
+        for row_id in parse_ids(ids):
+            if not self._known(row_id) and row_id not in self._pending:
+                self._pending.append(row_id)
+
+    def dispatch(self):
+        max_batch_size = get_max_batch_size()
+        while self._pending:
+            chunk = self._pending[:max_batch_size]
+            del self._pending[:max_batch_size]
+            page = self.batch_fn(chunk)
+            for item in page["items"]:
+                self._results[item[self.id_key]] = item
+            self._missing.update(page["missing"])
+
+    def load_many(self, ids):
+        ids = parse_ids(ids)
+        self.want(ids)
+        self.dispatch()
+        return {
+            "items": [self._results[row_id] for row_id in ids if row_id in self._results],
+            "missing": [row_id for row_id in ids if row_id in self._missing],
+        }
+
+    def load(self, row_id):
+        page = self.load_many([row_id])
+        return page["items"][0] if page["items"] else None
+
+
+def get_loader(name, batch_fn, id_key):
+    loaders = g.setdefault("batch_loaders", {})
+    if name not in loaders:
+        loaders[name] = RequestLoader(batch_fn, id_key)
+    return loaders[name]
+
+
+def load_one(name, batch_fn, id_key, row_id):
+    # Inside a request the lookup goes through the request's loader, so ids
+    # queued with want() or already read are served without another query.
+    if has_request_context():
+        return get_loader(name, batch_fn, id_key).load(row_id)
+    page = batch_fn([row_id])
+    return page["items"][0] if page["items"] else None
+
+
+@event.listens_for(Session, "after_commit")
+def _reset_loaders(session):
+    # Rows read before a commit may have changed; later lookups in the same
+    # request start from an empty loader.
+    if has_app_context():
+        g.pop("batch_loaders", None)
@@ -0,0 +1,332 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from api import db
+from api.models.cf_models import (
+    Campaigns,
+    CampaignPaymentStatus,
+    Donations,
+    DonationStatus,
+    Payments,
+    Users,
+)
+from api.helpers.cache_helper import invalidate_on_commit, make_key
+from sqlalchemy import bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_ERRORS = 100
+AMOUNT_QUANTUM = Decimal("0.01")
+
+
+def _max_amount(*columns):
+    digits = min(column.type.precision - column.type.scale for column in columns)
+    return Decimal(10) ** digits - AMOUNT_QUANTUM
+
+
+# The amount is written to both tables, so the narrower column sets the cap.
+MAX_AMOUNT = _max_amount(Donations.amount, Payments.amount)
+
+PAYMENT_TO_DONATION_STATUS = {
+    CampaignPaymentStatus.PENDING: DonationStatus.PENDING,
+    CampaignPaymentStatus.SUCCESSFUL: DonationStatus.COMPLETED,
+    CampaignPaymentStatus.FAILED: DonationStatus.CANCELLED,
+    CampaignPaymentStatus.REFUNDED: DonationStatus.REFUNDED,
+}
+
+
+def _batches(records, batch_size):
+    iterator = iter(records)
+    start = 0
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield start, batch
+        start += len(batch)
+
+
+def _validate_record(record):
+    ref = str(record.get("transaction_ref") or "").strip()
+    if not ref:
+        raise ValueError("transaction_ref cannot be empty")
+
+    try:
+        user_id = int(record["user_id"])
+        campaign_id = int(record["campaign_id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("user_id and campaign_id must be integers")
+
+    try:
+        amount = Decimal(str(record.get("amount"))).quantize(AMOUNT_QUANTUM)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {record.get('amount')}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {record.get('amount')}")
+    if amount <= 0:
+        raise ValueError("Amount must be greater than 0.")
+    if amount > MAX_AMOUNT:
+        raise ValueError(f"Amount cannot exceed {MAX_AMOUNT}.")
+
+    payment_method = str(record.get("payment_method") or "").strip()
+    if not payment_method:
+        raise ValueError("Payment method cannot be empty.")
+
+    status = record.get("payment_status") or CampaignPaymentStatus.SUCCESSFUL
+    try:
+        status = (
+            status
+            if isinstance(status, CampaignPaymentStatus)
+            else CampaignPaymentStatus(str(status).lower())
+        )
+    except ValueError:
+        raise ValueError(
+            f"Invalid payment status. Must be one of: {[s.value for s in CampaignPaymentStatus]}"
+        )
+
+    return {
+        "transaction_ref": ref,
+        "user_id": user_id,
+        "campaign_id": campaign_id,
+        "amount": amount,
+        "payment_method": payment_method,
+        "payment_status": status,
+        "donation_status": PAYMENT_TO_DONATION_STATUS[status],
+    }
+
+
+def _existing_ids(column, ids):
+    if not ids:
+        return set()
+    return set(db.session.execute(select(column).where(column.in_(ids))).scalars())
+
+
+def _validate_batch(start, batch):
+    errors = []
+    rows = []
+    seen_refs = set()
+
+    for offset, record in enumerate(batch):
+        try:
+            row = _validate_record(record)
+        except ValueError as e:
+            errors.append({"row": start + offset, "error": str(e)})
+            continue
+        if row["transaction_ref"] in seen_refs:
+            errors.append(
+                {"row": start + offset, "error": "Duplicate transaction_ref in file"}
+            )
+            continue
+        seen_refs.add(row["transaction_ref"])
+        row["row"] = start + offset
+        rows.append(row)
+
+    users = _existing_ids(Users.user_id, {r["user_id"] for r in rows})
+    campaigns = _existing_ids(Campaigns.campaign_id, {r["campaign_id"] for r in rows})
+    imported = _existing_ids(Payments.transaction_ref, seen_refs)
+
+    valid = []
+    for row in rows:
+        if row["transaction_ref"] in imported:
+            errors.append({"row": row["row"], "error": "Already imported", "skipped": True})
+        elif row["user_id"] not in users:
+            errors.append({"row": row["row"], "error": f"User {row['user_id']} not found"})
+        elif row["campaign_id"] not in campaigns:
+            errors.append(
+                {"row": row["row"], "error": f"Campaign {row['campaign_id']} not found"}
+            )
+        else:
+            valid.append(row)
+    return valid, errors
+
+
+def _lock_campaigns(rows):
+    # The same per-campaign lock apply_donation_transition takes, in id order
+    # so concurrent imports cannot deadlock. Held until the batch commits, it
+    # keeps the donor check below from racing another completion.
+    campaign_ids = sorted(
+        {r["campaign_id"] for r in rows if r["donation_status"] == DonationStatus.COMPLETED}
+    )
+    if campaign_ids:
+        db.session.execute(
+            select(Campaigns.campaign_id)
+            .where(Campaigns.campaign_id.in_(campaign_ids))
+            .order_by(Campaigns.campaign_id)
+            .with_for_update()
+        )
+
+
+def _new_donor_pairs(rows):
+    pairs = {
+        (r["campaign_id"], r["user_id"])
+        for r in rows
+        if r["donation_status"] == DonationStatus.COMPLETED
+    }
+    if not pairs:
+        return set()
+
+    existing = db.session.execute(
+        select(Donations.campaign_id, Donations.user_id)
+        .where(
+            tuple_(Donations.campaign_id, Donations.user_id).in_(pairs),
+            Donations.status == DonationStatus.COMPLETED,
+        )
+        .distinct()
+    ).all()
+    return pairs - {tuple(pair) for pair in existing}
+
+
+def _apply_campaign_totals(rows, new_donor_pairs):
+    totals = {}
+    for row in rows:
+        if row["donation_status"] != DonationStatus.COMPLETED:
+            continue
+        entry = totals.setdefault(
+            row["campaign_id"], {"cid": row["campaign_id"], "delta": 0, "count": 0, "donors": 0}
+        )
+        entry["delta"] += row["amount"]
+        entry["count"] += 1
+    for campaign_id, _ in new_donor_pairs:
+        totals[campaign_id]["donors"] += 1
+
+    if not totals:
+        return
+
+    # executemany through the ORM would demand primary-key parameters, so
+    # run the per-campaign deltas as a Core UPDATE on the session connection.
+    campaigns = Campaigns.__table__
+    db.session.connection().execute(
+        update(campaigns)
+        .where(campaigns.c.campaign_id == bindparam("cid"))
+        .values(
+            raised_amount=func.coalesce(campaigns.c.raised_amount, 0)
+            + bindparam("delta"),
+            completed_donation_count=campaigns.c.completed_donation_count
+            + bindparam("count"),
+            donor_count=campaigns.c.donor_count + bindparam("donors"),
+        ),
+        list(totals.values()),
+    )
+    invalidate_on_commit(
+        db.session,
+        keys={make_key("campaign", campaign_id) for campaign_id in totals},
+        prefixes={"campaign_list:"},
+    )
+
+
+def _insert_batch(rows):
+    _lock_campaigns(rows)
+    new_donor_pairs = _new_donor_pairs(rows)
+    now = datetime.utcnow()
+
+    donation_ids = db.session.execute(
+        insert(Donations).returning(Donations.donation_id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": r["user_id"],
+                "campaign_id": r["campaign_id"],
+                "amount": r["amount"],
+                "status": r["donation_status"],
+                "completed_at": (
+                    now if r["donation_status"] == DonationStatus.COMPLETED else None
+                ),
+            }
+            for r in rows
+        ],
+    ).scalars().all()
+
+    for row, donation_id in zip(rows, donation_ids):
+        row["donation_id"] = donation_id
+
+    inserted_refs = set(
+        db.session.execute(
+            pg_insert(Payments)
+            .on_conflict_do_nothing(index_elements=["transaction_ref"])
+            .returning(Payments.transaction_ref),
+            [
+                {
+                    "donation_id": r["donation_id"],
+                    "amount": r["amount"],
+                    "payment_method": r["payment_method"],
+                    "payment_status": r["payment_status"],
+                    "transaction_ref": r["transaction_ref"],
+                }
+                for r in rows
+            ],
+        ).scalars()
+    )
+
+    raced = [r for r in rows if r["transaction_ref"] not in inserted_refs]
+    if raced:
+        db.session.execute(
+            delete(Donations).where(
+                Donations.donation_id.in_([r["donation_id"] for r in raced])
+            )
+        )
+        rows = [r for r in rows if r["transaction_ref"] in inserted_refs]
+        new_donor_pairs = new_donor_pairs & {
+            (r["campaign_id"], r["user_id"])
+            for r in rows
+            if r["donation_status"] == DonationStatus.COMPLETED
+        }
+
+    _apply_campaign_totals(rows, new_donor_pairs)
+    return rows, raced
+
+
+def iter_import_batches(records, batch_size=DEFAULT_BATCH_SIZE):
+    for start, batch in _batches(records, batch_size):
+        valid, errors = _validate_batch(start, batch)
+        inserted = []
+        if valid:
+            try:
+                inserted, raced = _insert_batch(valid)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                inserted = []
+                errors.extend(
+                    {"row": r["row"], "error": f"Batch insert failed: {str(e)}"}
+                    for r in valid
+                )
+            else:
+                errors.extend(
+                    {"row": r["row"], "error": "Already imported", "skipped": True}
+                    for r in raced
+                )
+
+        yield {
+            "first_row": start,
+            "rows": len(batch),
+            "imported": len(inserted),
+            "errors": sorted(errors, key=lambda e: e["row"]),
+        }
+
+
+def import_donations(
+    records, batch_size=DEFAULT_BATCH_SIZE, on_batch=None, max_errors=DEFAULT_MAX_ERRORS
+):
+    summary = {
+        "rows": 0,
+        "imported": 0,
+        "skipped": 0,
+        "failed": 0,
+        "errors": [],
+        "errors_truncated": False,
+    }
+    for report in iter_import_batches(records, batch_size):
+        summary["rows"] += report["rows"]
+        summary["imported"] += report["imported"]
+        for error in report["errors"]:
+            if error.get("skipped"):
+                summary["skipped"] += 1
+                continue
+            summary["failed"] += 1
+            if len(summary["errors"]) < max_errors:
+                summary["errors"].append(error)
+            else:
+                summary["errors_truncated"] = True
+        if on_batch:
+            on_batch(report)
+    return summary
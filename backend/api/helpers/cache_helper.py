@@ -0,0 +1,268 @@
+import copy
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from inspect import signature
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from api.database import primary_scope
+from api.models.cf_models import Campaigns, Users
+
+DEFAULT_TTL = 60
+DEFAULT_MAXSIZE = 10000
+
+_PENDING_KEY = "cache_invalidations"
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class LRUCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.incr("misses")
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.incr("misses")
+                return None
+            self._data.move_to_end(key)
+        self.stats.incr("hits")
+        return copy.deepcopy(value)
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.ttl)
+        with self._lock:
+            self._data[key] = (copy.deepcopy(value), expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+        self.stats.incr("invalidations", len(keys))
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            stale = [key for key in self._data if key.startswith(prefix)]
+            for key in stale:
+                del self._data[key]
+        self.stats.incr("invalidations", len(stale))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """Redis-backed cache with generation-versioned prefixes.
+
+    delete_prefix() bumps a counter instead of scanning the keyspace: every
+    key embeds the generations of its colon-separated parents, so bumping a
+    parent orphans its entries and the TTL reclaims them.
+    """
+
+    def __init__(self, client, ttl=DEFAULT_TTL, prefix="cf:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.generations_key = f"{prefix}generations"
+        self.stats = CacheStats()
+
+    @staticmethod
+    def _scopes(key):
+        parts = key.split(":")
+        return [""] + [":".join(parts[:i]) for i in range(1, len(parts))]
+
+    def _physical_key(self, key):
+        generations = self.client.hmget(self.generations_key, self._scopes(key))
+        version = ".".join((g.decode() if g else "0") for g in generations)
+        return f"{self.prefix}{key}#{version}"
+
+    def get(self, key):
+        raw = self.client.get(self._physical_key(key))
+        if raw is None:
+            self.stats.incr("misses")
+            return None
+        self.stats.incr("hits")
+        return pickle.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self._physical_key(key), pickle.dumps(value), ex=ttl or self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*[self._physical_key(key) for key in keys])
+        self.stats.incr("invalidations", len(keys))
+
+    def delete_prefix(self, prefix):
+        self.client.hincrby(self.generations_key, prefix.rstrip(":"), 1)
+        self.stats.incr("invalidations")
+
+    def clear(self):
+        self.delete_prefix("")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _build_cache(config):
+    ttl = config.get("CACHE_TTL", DEFAULT_TTL)
+    if config.get("CACHE_BACKEND", "memory") == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND is 'redis' but the redis package is not installed")
+
+        client = redis.Redis.from_url(
+            config.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        )
+        return RedisCache(client, ttl=ttl, prefix=config.get("CACHE_KEY_PREFIX", "cf:"))
+    return LRUCache(maxsize=config.get("CACHE_MAXSIZE", DEFAULT_MAXSIZE), ttl=ttl)
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _build_cache(current_app.config if has_app_context() else {})
+    return _cache
+
+
+def set_cache(cache):
+    global _cache
+    _cache = cache
+
+
+def get_cache_stats():
+    return get_cache().stats.to_dict()
+
+
+def _cache_enabled():
+    return has_app_context() and current_app.config.get("CACHE_ENABLED", True)
+
+
+def make_key(namespace, *args, **kwargs):
+    parts = [namespace, *[str(arg) for arg in args]]
+    parts += [f"{name}={kwargs[name]}" for name in sorted(kwargs)]
+    return ":".join(parts)
+
+
+def cached(namespace, ttl=None):
+    def decorator(f):
+        call_signature = signature(f)
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not _cache_enabled():
+                return f(*args, **kwargs)
+
+            # Key on the bound call, so f(1) and f(user_id=1) share an entry
+            # that the positional keys built by the invalidators match.
+            bound = call_signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache = get_cache()
+            key = make_key(namespace, *bound.args, **bound.kwargs)
+            value = cache.get(key)
+            if value is None:
+                # Fill from the primary: a lagging replica would pin a value
+                # older than the invalidation that caused this miss.
+                with primary_scope():
+                    value = f(*args, **kwargs)
+                cache.set(key, value, ttl)
+            return value
+
+        decorated_function.uncached = f
+        return decorated_function
+
+    return decorator
+
+
+def invalidate_on_commit(session, keys=(), prefixes=()):
+    pending = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    pending[0].update(keys)
+    pending[1].update(prefixes)
+
+
+def _campaign_invalidations(campaign):
+    return {make_key("campaign", campaign.campaign_id)}, {"campaign_list:"}
+
+
+def _user_invalidations(user):
+    keys = {make_key("user", user.user_id), make_key("user_by_username", user.username)}
+    history = inspect(user).attrs.username.history
+    keys.update(make_key("user_by_username", old) for old in history.deleted or ())
+    return keys, {"campaign_list:", "campaign:"}
+
+
+_INVALIDATORS = {
+    Campaigns: _campaign_invalidations,
+    Users: _user_invalidations,
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    for obj in list(session.dirty) + list(session.deleted) + list(session.new):
+        invalidator = _INVALIDATORS.get(type(obj))
+        if invalidator is None:
+            continue
+        keys, prefixes = invalidator(obj)
+        invalidate_on_commit(session, keys, prefixes)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    cache = get_cache() if has_app_context() else _cache
+    if not pending or cache is None:
+        return
+
+    keys, prefixes = pending
+    if keys:
+        cache.delete(*keys)
+    for prefix in prefixes:
+        cache.delete_prefix(prefix)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
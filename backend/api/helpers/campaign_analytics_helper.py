@@ -0,0 +1,268 @@
+from datetime import date, datetime, time, timedelta
+
+from api import db
+from api.database import read_only
+from api.models.cf_models import (
+    AnalyticsWatermarks,
+    CampaignDailyStats,
+    DonorCampaignTotals,
+    Donations,
+    DonationStatus,
+    Follows,
+    Users,
+)
+from flask import current_app, has_app_context
+from sqlalchemy import func, select, text
+
+WATERMARK_NAME = "campaign_daily_stats"
+DEFAULT_LOOKBACK_DAYS = 3
+
+REFRESH_DAILY_STATS_SQL = text(
+    """
+    INSERT INTO campaign_daily_stats (
+        campaign_id, day, donation_count, completed_donation_count,
+        donation_amount, new_followers, new_comments
+    )
+    SELECT campaign_id, day,
+           SUM(donation_count), SUM(completed_donation_count),
+           SUM(donation_amount), SUM(new_followers), SUM(new_comments)
+    FROM (
+        SELECT campaign_id, created_at::date AS day,
+               COUNT(*) AS donation_count,
+               COUNT(*) FILTER (WHERE status = 'COMPLETED') AS completed_donation_count,
+               COALESCE(SUM(amount) FILTER (WHERE status = 'COMPLETED'), 0) AS donation_amount,
+               0 AS new_followers, 0 AS new_comments
+        FROM donations
+        WHERE created_at >= :since
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT campaign_id, created_at::date, 0, 0, 0, COUNT(*), 0
+        FROM follows
+        WHERE created_at >= :since
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT campaign_id, created_at::date, 0, 0, 0, 0, COUNT(*)
+        FROM comments
+        WHERE created_at >= :since
+        GROUP BY 1, 2
+    ) AS activity
+    GROUP BY campaign_id, day
+    ON CONFLICT (campaign_id, day) DO UPDATE SET
+        donation_count = EXCLUDED.donation_count,
+        completed_donation_count = EXCLUDED.completed_donation_count,
+        donation_amount = EXCLUDED.donation_amount,
+        new_followers = EXCLUDED.new_followers,
+        new_comments = EXCLUDED.new_comments
+    """
+)
+
+# Donations created before the window but completed, refunded or cancelled
+# inside it: recompute the donation columns of the (campaign, day) buckets
+# they were created in. Follower and comment counts of those days are final.
+REFRESH_LATE_DONATION_STATS_SQL = text(
+    """
+    INSERT INTO campaign_daily_stats (
+        campaign_id, day, donation_count, completed_donation_count,
+        donation_amount, new_followers, new_comments
+    )
+    SELECT d.campaign_id, touched.day,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE d.status = 'COMPLETED'),
+           COALESCE(SUM(d.amount) FILTER (WHERE d.status = 'COMPLETED'), 0),
+           0, 0
+    FROM (
+        SELECT DISTINCT campaign_id, created_at::date AS day
+        FROM donations
+        WHERE updated_at >= :since AND created_at < :since
+    ) AS touched
+    JOIN donations d
+      ON d.campaign_id = touched.campaign_id
+     AND d.created_at >= touched.day AND d.created_at < touched.day + 1
+    GROUP BY d.campaign_id, touched.day
+    ON CONFLICT (campaign_id, day) DO UPDATE SET
+        donation_count = EXCLUDED.donation_count,
+        completed_donation_count = EXCLUDED.completed_donation_count,
+        donation_amount = EXCLUDED.donation_amount
+    """
+)
+
+REFRESH_DONOR_TOTALS_SQL = text(
+    """
+    INSERT INTO donor_campaign_totals (campaign_id, user_id, total_amount, donation_count)
+    SELECT d.campaign_id, d.user_id,
+           COALESCE(SUM(d.amount) FILTER (WHERE d.status = 'COMPLETED'), 0),
+           COUNT(*) FILTER (WHERE d.status = 'COMPLETED')
+    FROM donations d
+    JOIN (
+        SELECT DISTINCT campaign_id, user_id
+        FROM donations
+        WHERE created_at >= :since OR updated_at >= :since
+    ) AS touched
+      ON touched.campaign_id = d.campaign_id AND touched.user_id = d.user_id
+    GROUP BY d.campaign_id, d.user_id
+    ON CONFLICT (campaign_id, user_id) DO UPDATE SET
+        total_amount = EXCLUDED.total_amount,
+        donation_count = EXCLUDED.donation_count
+    """
+)
+
+
+def _lookback_days():
+    if has_app_context():
+        return current_app.config.get("ANALYTICS_LOOKBACK_DAYS", DEFAULT_LOOKBACK_DAYS)
+    return DEFAULT_LOOKBACK_DAYS
+
+
+def refresh_campaign_analytics(full=False):
+    started_at = datetime.utcnow()
+    watermark = db.session.get(AnalyticsWatermarks, WATERMARK_NAME, with_for_update=True)
+
+    if full or watermark is None:
+        since = datetime.min
+    else:
+        since_day = watermark.refreshed_through.date() - timedelta(days=_lookback_days())
+        since = datetime.combine(since_day, time.min)
+
+    try:
+        db.session.query(CampaignDailyStats).filter(
+            CampaignDailyStats.day >= since.date()
+        ).delete(synchronize_session=False)
+        db.session.execute(REFRESH_DAILY_STATS_SQL, {"since": since})
+        if not full:
+            db.session.execute(REFRESH_LATE_DONATION_STATS_SQL, {"since": since})
+
+        if full:
+            db.session.query(DonorCampaignTotals).delete(synchronize_session=False)
+        db.session.execute(REFRESH_DONOR_TOTALS_SQL, {"since": since})
+        db.session.query(DonorCampaignTotals).filter(
+            DonorCampaignTotals.donation_count == 0
+        ).delete(synchronize_session=False)
+
+        if watermark is None:
+            watermark = AnalyticsWatermarks(name=WATERMARK_NAME, refreshed_through=started_at)
+            db.session.add(watermark)
+        else:
+            watermark.refreshed_through = started_at
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not refresh campaign analytics: {str(e)}")
+
+    return {
+        "refreshed_from": None if since == datetime.min else since,
+        "refreshed_through": started_at,
+    }
+
+
+def _window_start(days):
+    return date.today() - timedelta(days=days - 1)
+
+
+@read_only
+def get_campaign_daily_stats(campaign_id, days=30):
+    stats = (
+        CampaignDailyStats.query.filter(
+            CampaignDailyStats.campaign_id == campaign_id,
+            CampaignDailyStats.day >= _window_start(days),
+        )
+        .order_by(CampaignDailyStats.day)
+        .all()
+    )
+    return [s.to_dict() for s in stats]
+
+
+@read_only
+def get_follower_growth(campaign_id, days=30):
+    cumulative = func.sum(CampaignDailyStats.new_followers).over(
+        order_by=CampaignDailyStats.day
+    )
+    history = (
+        select(
+            CampaignDailyStats.day,
+            CampaignDailyStats.new_followers,
+            cumulative.label("total_followers"),
+        )
+        .where(CampaignDailyStats.campaign_id == campaign_id)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(history)
+        .where(history.c.day >= _window_start(days))
+        .order_by(history.c.day)
+    ).all()
+    return [
+        {
+            "day": r.day.isoformat(),
+            "new_followers": r.new_followers,
+            "total_followers": int(r.total_followers),
+        }
+        for r in rows
+    ]
+
+
+@read_only
+def get_comment_velocity(campaign_id, days=7):
+    total = (
+        db.session.query(func.coalesce(func.sum(CampaignDailyStats.new_comments), 0))
+        .filter(
+            CampaignDailyStats.campaign_id == campaign_id,
+            CampaignDailyStats.day >= _window_start(days),
+        )
+        .scalar()
+    )
+    return {
+        "campaign_id": campaign_id,
+        "days": days,
+        "comments": int(total),
+        "comments_per_day": round(total / days, 2),
+    }
+
+
+@read_only
+def get_follow_to_donate_conversion(campaign_id):
+    donated = (
+        select(Donations.donation_id)
+        .where(
+            Donations.campaign_id == Follows.campaign_id,
+            Donations.user_id == Follows.user_id,
+            Donations.status == DonationStatus.COMPLETED,
+        )
+        .exists()
+    )
+    followers, converted = db.session.execute(
+        select(
+            func.count(Follows.follow_id),
+            func.count(Follows.follow_id).filter(donated),
+        ).where(Follows.campaign_id == campaign_id)
+    ).one()
+    return {
+        "campaign_id": campaign_id,
+        "followers": followers,
+        "converted_followers": converted,
+        "conversion_rate": round(converted / followers, 4) if followers else 0.0,
+    }
+
+
+@read_only
+def get_top_donors(campaign_id=None, limit=10):
+    total = func.sum(DonorCampaignTotals.total_amount).label("total_amount")
+    count = func.sum(DonorCampaignTotals.donation_count).label("donation_count")
+    query = (
+        db.session.query(Users.user_id, Users.username, total, count)
+        .join(DonorCampaignTotals, DonorCampaignTotals.user_id == Users.user_id)
+    )
+    if campaign_id is not None:
+        query = query.filter(DonorCampaignTotals.campaign_id == campaign_id)
+    query = (
+        query.group_by(Users.user_id, Users.username).order_by(total.desc()).limit(limit)
+    )
+
+    return [
+        {
+            "user_id": r.user_id,
+            "username": r.username,
+            "total_amount": float(r.total_amount),
+            "donation_count": int(r.donation_count),
+        }
+        for r in query.all()
+    ]
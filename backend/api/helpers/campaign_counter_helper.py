@@ -0,0 +1,170 @@
+from datetime import datetime
+
+from api import db
+from api.models.cf_models import Campaigns, Donations, DonationStatus
+from api.helpers.cache_helper import invalidate_on_commit, make_key
+from sqlalchemy import and_, func, select, update
+
+
+def _has_other_completed_donation(donation):
+    return db.session.query(
+        select(Donations.donation_id)
+        .where(
+            Donations.campaign_id == donation.campaign_id,
+            Donations.user_id == donation.user_id,
+            Donations.status == DonationStatus.COMPLETED,
+            Donations.donation_id != donation.donation_id,
+        )
+        .exists()
+    ).scalar()
+
+
+def apply_donation_transition(donation, old_status, new_status):
+    was_completed = old_status == DonationStatus.COMPLETED
+    is_completed = new_status == DonationStatus.COMPLETED
+    if was_completed == is_completed:
+        return
+
+    donation.completed_at = datetime.utcnow() if is_completed else None
+    sign = 1 if is_completed else -1
+    # Serialise transitions per campaign so the distinct-donor check below
+    # sees donations completed by concurrent transactions.
+    db.session.execute(
+        select(Campaigns.campaign_id)
+        .where(Campaigns.campaign_id == donation.campaign_id)
+        .with_for_update()
+    )
+    donor_delta = 0 if _has_other_completed_donation(donation) else sign
+
+    db.session.execute(
+        update(Campaigns)
+        .where(Campaigns.campaign_id == donation.campaign_id)
+        .values(
+            raised_amount=func.coalesce(Campaigns.raised_amount, 0)
+            + sign * donation.amount,
+            completed_donation_count=Campaigns.completed_donation_count + sign,
+            donor_count=Campaigns.donor_count + donor_delta,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    invalidate_on_commit(
+        db.session,
+        keys={make_key("campaign", donation.campaign_id)},
+        prefixes={"campaign_list:"},
+    )
+
+
+def _completed_totals():
+    return (
+        select(
+            Donations.campaign_id.label("campaign_id"),
+            func.sum(Donations.amount).label("raised_amount"),
+            func.count(func.distinct(Donations.user_id)).label("donor_count"),
+            func.count(Donations.donation_id).label("completed_donation_count"),
+        )
+        .where(Donations.status == DonationStatus.COMPLETED)
+        .group_by(Donations.campaign_id)
+        .subquery()
+    )
+
+
+def find_counter_drift(campaign_ids=None):
+    totals = _completed_totals()
+    expected_raised = func.coalesce(totals.c.raised_amount, 0)
+    expected_donors = func.coalesce(totals.c.donor_count, 0)
+    expected_completed = func.coalesce(totals.c.completed_donation_count, 0)
+
+    rows = db.session.execute(
+        select(
+            Campaigns.campaign_id,
+            Campaigns.raised_amount,
+            Campaigns.donor_count,
+            Campaigns.completed_donation_count,
+            expected_raised.label("expected_raised_amount"),
+            expected_donors.label("expected_donor_count"),
+            expected_completed.label("expected_completed_donation_count"),
+        )
+        .outerjoin(totals, totals.c.campaign_id == Campaigns.campaign_id)
+        .where(
+            (func.coalesce(Campaigns.raised_amount, 0) != expected_raised)
+            | (Campaigns.donor_count != expected_donors)
+            | (Campaigns.completed_donation_count != expected_completed),
+            *(
+                []
+                if campaign_ids is None
+                else [Campaigns.campaign_id.in_(campaign_ids)]
+            ),
+        )
+    ).all()
+
+    return [
+        {
+            "campaign_id": r.campaign_id,
+            "raised_amount": {
+                "stored": float(r.raised_amount or 0),
+                "expected": float(r.expected_raised_amount),
+            },
+            "donor_count": {
+                "stored": r.donor_count,
+                "expected": r.expected_donor_count,
+            },
+            "completed_donation_count": {
+                "stored": r.completed_donation_count,
+                "expected": r.expected_completed_donation_count,
+            },
+        }
+        for r in rows
+    ]
+
+
+def reconcile_campaign_counters(dry_run=False):
+    drift = find_counter_drift()
+    if dry_run or not drift:
+        return {"drifted_campaigns": len(drift), "fixed": False, "drift": drift}
+
+    completed = and_(
+        Donations.campaign_id == Campaigns.campaign_id,
+        Donations.status == DonationStatus.COMPLETED,
+    )
+    try:
+        # Take the per-campaign lock apply_donation_transition holds, in id
+        # order, before recounting. Otherwise the UPDATE can wait on an
+        # in-flight transition and then write totals from a snapshot that
+        # misses it.
+        db.session.execute(
+            select(Campaigns.campaign_id)
+            .where(Campaigns.campaign_id.in_([d["campaign_id"] for d in drift]))
+            .order_by(Campaigns.campaign_id)
+            .with_for_update()
+        )
+        drift = find_counter_drift([d["campaign_id"] for d in drift])
+        db.session.execute(
+            update(Campaigns)
+            .where(Campaigns.campaign_id.in_([d["campaign_id"] for d in drift]))
+            .values(
+                raised_amount=func.coalesce(
+                    select(func.sum(Donations.amount))
+                    .where(completed)
+                    .scalar_subquery(),
+                    0,
+                ),
+                donor_count=select(func.count(func.distinct(Donations.user_id)))
+                .where(completed)
+                .scalar_subquery(),
+                completed_donation_count=select(func.count(Donations.donation_id))
+                .where(completed)
+                .scalar_subquery(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        invalidate_on_commit(
+            db.session,
+            keys={make_key("campaign", d["campaign_id"]) for d in drift},
+            prefixes={"campaign_list:"},
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not reconcile campaign counters: {str(e)}")
+
+    return {"drifted_campaigns": len(drift), "fixed": True, "drift": drift}
@@ -1,4 +1,5 @@
-from api import db, bcrypt
+from api import db
+from api.database import read_only
 from api.models.cf_models import (
     Users,
     CampaignCategory,
@@ -8,6 +9,76 @@ from api.models.cf_models import (
 )
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from api.helpers.pagination_helper import is_paginated, keyset_paginate
+from api.helpers.cache_helper import cached
+from api.helpers.batch_helper import batch_get, load_one
+from api.celery_app import enqueue
+from api.tasks import notify_campaign_followers
+
+
+CAMPAIGN_LIST_COLUMNS = (
+    Campaigns.campaign_id,
+    Campaigns.title,
+    Campaigns.description,
+    Campaigns.category,
+    Campaigns.goal_amount,
+    Campaigns.raised_amount,
+    Campaigns.donor_count,
+    Campaigns.completed_donation_count,
+    Campaigns.status,
+    Campaigns.created_at,
+    Users.user_id.label("creator_user_id"),
+    Users.username.label("creator_username"),
+    Users.profile_image.label("creator_profile_image"),
+)
+
+
+def _campaign_list_query(projection=False):
+    if projection:
+        return db.session.query(*CAMPAIGN_LIST_COLUMNS).outerjoin(
+            Users, Users.user_id == Campaigns.creator_id
+        )
+    return Campaigns.query.options(joinedload(Campaigns.creator))
+
+
+def _campaign_row_to_dict(row):
+    return {
+        "campaign_id": row.campaign_id,
+        "title": row.title,
+        "description": row.description,
+        "category": row.category.value,
+        "goal_amount": float(row.goal_amount),
+        "raised_amount": float(row.raised_amount or 0),
+        "donor_count": row.donor_count,
+        "completed_donation_count": row.completed_donation_count,
+        "status": row.status.value,
+        "created_at": row.created_at,
+        "creator": (
+            {
+                "user_id": row.creator_user_id,
+                "username": row.creator_username,
+                "profile_image": row.creator_profile_image,
+            }
+            if row.creator_user_id is not None
+            else None
+        ),
+    }
+
+
+def _list_campaigns(query, projection=False, cursor=None, limit=None, with_total=False):
+    serializer = _campaign_row_to_dict if projection else Campaigns.to_dict
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Campaigns.created_at,
+            Campaigns.campaign_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+    return [serializer(row) for row in query.all()]
 
 
 def create_campaign(
@@ -53,16 +124,33 @@ def delete_campaign(campaign_id):
         raise RuntimeError(f"Could not delete campaign {campaign_id}: {str(e)}")
 
 
+@cached("campaign")
 def view_campaign_by_campaign_id(campaign_id):
-    campaign = Campaigns.query.get(campaign_id)
+    campaign = load_one("campaigns", view_campaigns_by_ids, "campaign_id", campaign_id)
     if not campaign:
         raise ValueError(f"No campaign with campaign id: {campaign_id} was found")
-    return campaign.to_dict()
+    return campaign
+
 
+@read_only
+def view_campaigns_by_ids(campaign_ids):
+    return batch_get(
+        Campaigns,
+        Campaigns.campaign_id,
+        campaign_ids,
+        options=[joinedload(Campaigns.creator)],
+    )
 
-def view_all_campaigns_by_creator(creator_id):
-    campaigns = Campaigns.query.filter_by(creator_id=creator_id).all()
-    return [campaign.to_dict() for campaign in campaigns]
+
+@cached("campaign_list:creator")
+@read_only
+def view_all_campaigns_by_creator(
+    creator_id, projection=False, cursor=None, limit=None
+):
+    query = _campaign_list_query(projection).filter(
+        Campaigns.creator_id == creator_id
+    )
+    return _list_campaigns(query, projection, cursor, limit)
 
 
 def update_campaign_status(campaign_id, new_status):
@@ -92,6 +180,7 @@ def update_campaign_status(campaign_id, new_status):
         db.session.rollback()
         raise RuntimeError(f"Failed to update campaign status: {str(e)}")
 
+    enqueue(notify_campaign_followers, campaign_update.update_id)
     return campaign.to_dict()
 
 
@@ -109,7 +198,6 @@ def update_campaign(campaign_id, **kwargs):
         "description",
         "category",
         "goal_amount",
-        "raised_amount",
     ]
     changes = {}
 
@@ -145,50 +233,71 @@ def update_campaign(campaign_id, **kwargs):
         db.session.rollback()
         raise RuntimeError(f"Failed to update campaign: {str(e)}")
 
+    enqueue(notify_campaign_followers, campaign_update.update_id)
     return campaign.to_dict()
 
 
-def search_campaign_by_title(title):
-    campaigns = Campaigns.query.filter(Campaigns.title.ilike(f"%{title}%")).all()
-    return [campaign.to_dict() for campaign in campaigns]
+@read_only
+def search_campaign_by_title(title, projection=False, cursor=None, limit=None):
+    query = _campaign_list_query(projection).filter(Campaigns.title.ilike(f"%{title}%"))
+    return _list_campaigns(query, projection, cursor, limit)
 
 
-def view_campaigns_by_category(category):
+@cached("campaign_list:category")
+@read_only
+def view_campaigns_by_category(category, projection=False, cursor=None, limit=None):
     try:
         if not isinstance(category, CampaignCategory):
             category = CampaignCategory(category)
     except Exception as e:
         raise ValueError(f"Invalid category: {category}")
 
-    campaigns = Campaigns.query.filter_by(category=category).all()
-    return [campaign.to_dict() for campaign in campaigns]
+    query = _campaign_list_query(projection).filter(Campaigns.category == category)
+    return _list_campaigns(query, projection, cursor, limit)
 
 
-def view_all_active_campaigns():
-    campaigns = Campaigns.query.filter_by(status=CampaignStatus.ACTIVE).all()
-    return [campaign.to_dict() for campaign in campaigns]
+@cached("campaign_list:active")
+@read_only
+def view_all_active_campaigns(projection=False, cursor=None, limit=None):
+    query = _campaign_list_query(projection).filter(
+        Campaigns.status == CampaignStatus.ACTIVE
+    )
+    return _list_campaigns(query, projection, cursor, limit)
 
 
-def view_all_campaigns():
-    return [campaign.to_dict() for campaign in Campaigns.query.all()]
+@cached("campaign_list:all")
+@read_only
+def view_all_campaigns(projection=False, cursor=None, limit=None, with_total=False):
+    return _list_campaigns(
+        _campaign_list_query(projection), projection, cursor, limit, with_total
+    )
 
 
-def view_all_completed_campaigns():
-    campaigns = Campaigns.query.filter_by(status=CampaignStatus.COMPLETED).all()
-    return [campaign.to_dict() for campaign in campaigns]
+@cached("campaign_list:completed")
+@read_only
+def view_all_completed_campaigns(projection=False, cursor=None, limit=None):
+    query = _campaign_list_query(projection).filter(
+        Campaigns.status == CampaignStatus.COMPLETED
+    )
+    return _list_campaigns(query, projection, cursor, limit)
 
 
-def view_all_campaigns_paginated(page=1, per_page=10, category=None, status=None):
-    query = Campaigns.query
+@cached("campaign_list:paginated")
+@read_only
+def view_all_campaigns_paginated(
+    cursor=None, per_page=10, category=None, status=None, projection=False
+):
+    query = _campaign_list_query(projection)
     if category:
         try:
-            query = query.filter_by(category=CampaignCategory(category))
+            query = query.filter(Campaigns.category == CampaignCategory(category))
         except Exception as e:
             raise ValueError(f"Invalid category: {category}")
     if status:
         try:
-            query = query.filter_by(status=CampaignStatus(status))
+            query = query.filter(Campaigns.status == CampaignStatus(status))
         except Exception as e:
             raise ValueError(f"Invalid status: {status}")
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    return [c.to_dict() for c in pagination.items]
+    return _list_campaigns(
+        query, projection, cursor=cursor, limit=per_page, with_total=True
+    )
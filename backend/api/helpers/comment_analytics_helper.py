@@ -1,12 +1,15 @@
 from sqlalchemy import func
 from api import db
-from api.models import Comments, Users, Campaigns
+from api.database import read_only
+from api.models.cf_models import Comments, Users, Campaigns
 
 
+@read_only
 def get_total_comments():
     return db.session.query(func.count(Comments.comment_id)).scalar()
 
 
+@read_only
 def get_total_comments_by_user(user_id):
     return (
         db.session.query(func.count(Comments.comment_id))
@@ -15,6 +18,7 @@ def get_total_comments_by_user(user_id):
     )
 
 
+@read_only
 def get_total_comments_by_campaign(campaign_id):
     return (
         db.session.query(func.count(Comments.comment_id))
@@ -23,13 +27,14 @@ def get_total_comments_by_campaign(campaign_id):
     )
 
 
+@read_only
 def get_top_commenters(limit=5):
     results = (
         db.session.query(
             Users.username, func.count(Comments.comment_id).label("comment_count")
         )
         .join(Comments, Users.user_id == Comments.user_id)
-        .group_by(Users.username)
+        .group_by(Users.user_id, Users.username)
         .order_by(func.count(Comments.comment_id).desc())
         .limit(limit)
         .all()
@@ -38,21 +43,32 @@ def get_top_commenters(limit=5):
     return [{"username": r.username, "comment_count": r.comment_count} for r in results]
 
 
+@read_only
 def get_top_commented_campaigns(limit=5):
     results = (
         db.session.query(
-            Campaigns.title, func.count(Comments.comment_id).label("comment_count")
+            Campaigns.campaign_id,
+            Campaigns.title,
+            func.count(Comments.comment_id).label("comment_count"),
         )
         .join(Comments, Campaigns.campaign_id == Comments.campaign_id)
-        .group_by(Campaigns.title)
+        .group_by(Campaigns.campaign_id, Campaigns.title)
         .order_by(func.count(Comments.comment_id).desc())
         .limit(limit)
         .all()
     )
 
-    return [{"title": r.title, "comment_count": r.comment_count} for r in results]
+    return [
+        {
+            "campaign_id": r.campaign_id,
+            "title": r.title,
+            "comment_count": r.comment_count,
+        }
+        for r in results
+    ]
 
 
+@read_only
 def get_average_likes_per_comment():
     avg_likes = db.session.query(func.avg(Comments.likes)).scalar()
     return round(avg_likes or 0, 2)
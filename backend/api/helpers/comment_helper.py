@@ -1,7 +1,16 @@
-from api import db, bcrypt
-from api.models.cf_models import Comments, Users, Campaigns
+import random
+
+from api import db
+from flask import current_app
+from api.models.cf_models import Comments, CommentLikeShards
 from datetime import datetime
+from sqlalchemy import func, text
 from sqlalchemy.exc import IntegrityError
+from api.helpers.pagination_helper import is_paginated, keyset_paginate
+from api.helpers.batch_helper import batch_get, load_one
+from api.helpers.fieldset_helper import apply_fieldset
+from api.database import read_only
+from sqlalchemy.orm import joinedload
 
 
 def create_comment(user_id, campaign_id, content):
@@ -44,55 +53,245 @@ def update_comment(comment_id, updated_content):
 
 
 def view_comment_by_comment_id(comment_id):
-    comment = Comments.query.get(comment_id)
+    comment = load_one("comments", view_comments_by_ids, "comment_id", comment_id)
     if not comment:
         raise ValueError(f"Could not find comment with comment id: {comment_id}")
-    return comment.to_dict()
+    return comment
+
+
+@read_only
+def view_comments_by_ids(comment_ids):
+    return batch_get(
+        Comments,
+        Comments.comment_id,
+        comment_ids,
+        options=[joinedload(Comments.user), joinedload(Comments.campaign)],
+    )
+
+
+def view_all_comments_by_user(
+    user_id, cursor=None, limit=None, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Comments.query.filter_by(user_id=user_id),
+        Comments,
+        fields,
+        expand,
+        always=(Comments.created_at,),
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Comments.created_at,
+            Comments.comment_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    comments = query.all()
+    return [serializer(comment) for comment in comments]
+
+
+def view_all_comments_by_campaign(
+    campaign_id, cursor=None, limit=None, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Comments.query.filter_by(campaign_id=campaign_id),
+        Comments,
+        fields,
+        expand,
+        always=(Comments.created_at,),
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Comments.created_at,
+            Comments.comment_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    comments = query.all()
+    return [serializer(comment) for comment in comments]
 
 
-def view_all_comments_by_user(user_id):
-    comments = Comments.query.filter_by(user_id=user_id).all()
-    return [comment.to_dict() for comment in comments]
+TOGGLE_LIKE_SQL = text(
+    """
+    WITH removed AS (
+        DELETE FROM user_comment_likes
+        WHERE user_id = :user_id AND comment_id = :comment_id
+        RETURNING comment_id
+    ),
+    added AS (
+        INSERT INTO user_comment_likes (user_id, comment_id)
+        SELECT :user_id, :comment_id
+        WHERE NOT EXISTS (SELECT 1 FROM removed)
+        ON CONFLICT DO NOTHING
+        RETURNING comment_id
+    ),
+    delta AS (
+        SELECT (SELECT count(*) FROM added) - (SELECT count(*) FROM removed) AS n
+    ),
+    updated AS (
+        UPDATE comments
+        SET likes = GREATEST(COALESCE(likes, 0) + (SELECT n FROM delta), 0)
+        WHERE comment_id = :comment_id AND NOT sharded_likes
+        RETURNING likes
+    ),
+    sharded AS (
+        INSERT INTO comment_like_shards (comment_id, shard, likes)
+        SELECT c.comment_id, :shard, (SELECT n FROM delta)
+        FROM comments c
+        WHERE c.comment_id = :comment_id AND c.sharded_likes
+        ON CONFLICT (comment_id, shard)
+        DO UPDATE SET likes = comment_like_shards.likes + EXCLUDED.likes
+        RETURNING likes
+    )
+    SELECT
+        (SELECT n FROM delta) AS delta,
+        COALESCE(
+            (SELECT likes FROM updated),
+            (SELECT COALESCE(c.likes, 0) + COALESCE(SUM(s.likes), 0) + (SELECT n FROM delta)
+             FROM comments c
+             LEFT JOIN comment_like_shards s ON s.comment_id = c.comment_id
+             WHERE c.comment_id = :comment_id
+             GROUP BY c.likes)
+        ) AS likes
+    """
+)
 
+FOLD_LIKE_SHARDS_SQL = text(
+    """
+    WITH folded AS (
+        DELETE FROM comment_like_shards
+        WHERE comment_id = :comment_id
+        RETURNING likes
+    )
+    UPDATE comments
+    SET likes = GREATEST(
+        COALESCE(likes, 0) + COALESCE((SELECT SUM(likes) FROM folded), 0), 0
+    )
+    WHERE comment_id = :comment_id
+    RETURNING likes
+    """
+)
 
-def view_all_comments_by_campaign(campaign_id):
-    comments = Comments.query.filter_by(campaign_id=campaign_id).all()
-    return [comment.to_dict() for comment in comments]
+
+FOLD_ALL_LIKE_SHARDS_SQL = text(
+    """
+    WITH folded AS (
+        DELETE FROM comment_like_shards
+        RETURNING comment_id, likes
+    ), totals AS (
+        SELECT comment_id, SUM(likes) AS likes
+        FROM folded
+        GROUP BY comment_id
+    )
+    UPDATE comments c
+    SET likes = GREATEST(COALESCE(c.likes, 0) + totals.likes, 0)
+    FROM totals
+    WHERE c.comment_id = totals.comment_id
+    RETURNING c.comment_id
+    """
+)
+
+
+def _like_shard_count():
+    return current_app.config.get("COMMENT_LIKE_SHARDS", 16)
 
 
 def toggle_like(comment_id, user_id):
-    user = Users.query.get(user_id)
-    comment = Comments.query.get(comment_id)
+    try:
+        row = db.session.execute(
+            TOGGLE_LIKE_SQL,
+            {
+                "comment_id": comment_id,
+                "user_id": user_id,
+                "shard": random.randrange(_like_shard_count()),
+            },
+        ).one()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise ValueError(
+            f"User with user id: {user_id} or comment with comment id: {comment_id} not found"
+        )
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not toggle like for comment {comment_id}: {str(e)}")
+
+    if row.likes is None:
+        raise ValueError(f"Comment with comment id: {comment_id} not found")
+
+    # delta is 0 when a concurrent like won the insert: the like exists.
+    liked = row.delta >= 0
+    if row.delta == 0:
+        message = "Comment already liked"
+    else:
+        message = f"Comment {'liked' if liked else 'unliked'} successfully"
+    return {
+        "message": message,
+        "comment_id": comment_id,
+        "liked": liked,
+        "likes": max(row.likes, 0),
+    }
 
-    if not user:
-        raise ValueError(f"User with user id: {user_id} not found")
 
+def set_sharded_likes(comment_id, enabled=True):
+    comment = Comments.query.get(comment_id)
     if not comment:
-        raise ValueError(f"Comment with comment id: {comment_id} not found")
+        raise ValueError(f"Comment with id {comment_id} not found")
 
     try:
-        if comment in user.liked_comments:
-            user.liked_comments.remove(comment)
-            comment.likes = comment.likes - 1 if comment.likes > 0 else 0
-            action = "unliked"
-        else:
-            user.liked_comments.append(comment)
-            comment.likes = comment.likes + 1
-            action = "liked"
+        if not enabled:
+            db.session.execute(FOLD_LIKE_SHARDS_SQL, {"comment_id": comment_id})
+        comment.sharded_likes = enabled
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not update like sharding for comment {comment_id}: {str(e)}")
+
+    return comment.to_dict()
+
 
+def fold_like_shards(comment_id):
+    try:
+        likes = db.session.execute(
+            FOLD_LIKE_SHARDS_SQL, {"comment_id": comment_id}
+        ).scalar()
         db.session.commit()
-        return {
-            "message": f"Comment {action} successfully",
-            "comment": comment.to_dict(),
-        }
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not fold like shards for comment {comment_id}: {str(e)}")
+
+    if likes is None:
+        raise ValueError(f"Comment with id {comment_id} not found")
+    return likes
+
 
+def fold_all_like_shards():
+    try:
+        folded = db.session.execute(FOLD_ALL_LIKE_SHARDS_SQL).all()
+        db.session.commit()
     except Exception as e:
         db.session.rollback()
-        raise RuntimeError(f"Could not toggle like for comment {comment_id}: {str(e)}")
+        raise RuntimeError(f"Could not fold like shards: {str(e)}")
+    return len(folded)
 
 
 def get_total_likes(comment_id):
-    comment = Comments.query.get(comment_id)
-    if not comment:
+    likes = (
+        db.session.query(
+            func.coalesce(Comments.likes, 0)
+            + func.coalesce(func.sum(CommentLikeShards.likes), 0)
+        )
+        .outerjoin(CommentLikeShards, CommentLikeShards.comment_id == Comments.comment_id)
+        .filter(Comments.comment_id == comment_id)
+        .group_by(Comments.likes)
+        .scalar()
+    )
+    if likes is None:
         raise ValueError(f"Comment with id {comment_id} not found")
-    return comment.likes
+    return max(likes, 0)
@@ -0,0 +1,117 @@
+import hashlib
+from datetime import datetime
+
+from api import db
+from api.database import read_only
+from api.models.cf_models import (
+    AnalyticsWatermarks,
+    CampaignCategory,
+    Campaigns,
+    CampaignStatus,
+    Users,
+)
+from flask import Response, current_app, request
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload
+from werkzeug.http import http_date
+
+DEFAULT_CACHE_MAX_AGE = 15
+DEFAULT_STALE_WHILE_REVALIDATE = 60
+CAMPAIGN_DELETIONS_WATERMARK = "campaign_deletions"
+
+
+@event.listens_for(Campaigns, "after_delete")
+def _record_campaign_deletion(mapper, connection, target):
+    # max(updated_at) cannot see a deleted row, so deletions move their own
+    # watermark, which the collection version below folds in.
+    now = datetime.utcnow()
+    connection.execute(
+        pg_insert(AnalyticsWatermarks)
+        .values(name=CAMPAIGN_DELETIONS_WATERMARK, refreshed_through=now)
+        .on_conflict_do_update(
+            index_elements=[AnalyticsWatermarks.name],
+            set_={"refreshed_through": now},
+        )
+    )
+
+
+@read_only
+def get_campaign_with_version(campaign_id):
+    campaign = (
+        Campaigns.query.options(joinedload(Campaigns.creator))
+        .filter(Campaigns.campaign_id == campaign_id)
+        .first()
+    )
+    if campaign is None:
+        return None
+    creator_updated_at = campaign.creator.updated_at if campaign.creator else None
+    return campaign, max(filter(None, (campaign.updated_at, creator_updated_at)))
+
+
+@read_only
+def get_campaign_collection_version(category=None, status=None):
+    if category:
+        try:
+            CampaignCategory(category)
+        except ValueError:
+            raise ValueError(f"Invalid category: {category}")
+    if status:
+        try:
+            CampaignStatus(status)
+        except ValueError:
+            raise ValueError(f"Invalid status: {status}")
+
+    # Three index-only lookups instead of a count over the filtered set. The
+    # version ignores the filters: any campaign or user change, or any
+    # deletion, revalidates every list variant.
+    return db.session.execute(
+        select(
+            func.greatest(
+                select(func.max(Campaigns.updated_at)).scalar_subquery(),
+                select(func.max(Users.updated_at)).scalar_subquery(),
+                select(AnalyticsWatermarks.refreshed_through)
+                .where(AnalyticsWatermarks.name == CAMPAIGN_DELETIONS_WATERMARK)
+                .scalar_subquery(),
+            )
+        )
+    ).scalar()
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1()
+    for part in (*parts, request.query_string):
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def _cache_headers(etag, last_modified):
+    max_age = current_app.config.get("CAMPAIGN_CACHE_MAX_AGE", DEFAULT_CACHE_MAX_AGE)
+    stale = current_app.config.get(
+        "CAMPAIGN_STALE_WHILE_REVALIDATE", DEFAULT_STALE_WHILE_REVALIDATE
+    )
+    headers = {
+        "ETag": f'W/"{etag}"',
+        "Cache-Control": f"public, max-age={max_age}, stale-while-revalidate={stale}",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(
+            tzinfo=None
+        )
+    return False
+
+
+def conditional_response(etag, last_modified, build):
+    headers = _cache_headers(etag, last_modified)
+    if _not_modified(etag, last_modified):
+        return Response(status=304, headers=headers)
+    return build(), 200, headers
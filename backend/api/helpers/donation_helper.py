@@ -1,10 +1,16 @@
-from api import db, bcrypt
+from api import db
 from api.models.cf_models import Donations, DonationStatus
+from api.helpers.campaign_counter_helper import apply_donation_transition
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
+from api.helpers.pagination_helper import is_paginated, keyset_paginate
+from api.helpers.batch_helper import batch_get, load_one
+from api.helpers.fieldset_helper import apply_fieldset
+from api.database import read_only
+from sqlalchemy.orm import joinedload
 
 
-def create_donation(user_id, campaign_id, amount, status=""):
+def create_donation(user_id, campaign_id, amount, status="", commit=True):
     if not amount:
         raise ValueError("Amount cannot be empty/0")
 
@@ -21,7 +27,10 @@ def create_donation(user_id, campaign_id, amount, status=""):
 
     db.session.add(donation)
     try:
-        db.session.commit()
+        db.session.flush()
+        apply_donation_transition(donation, None, donation.status)
+        if commit:
+            db.session.commit()
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Could not create donation: {str(e)}")
@@ -30,35 +39,93 @@ def create_donation(user_id, campaign_id, amount, status=""):
 
 
 def view_donation_by_donation_id(donation_id):
-    donation = Donations.query.get(donation_id)
+    donation = load_one(
+        "donations:None", view_donations_by_ids, "donation_id", donation_id
+    )
     if not donation:
         raise ValueError(f"Could not find donation with donation id: {donation_id}")
 
-    return donation.to_dict()
+    return donation
+
+
+@read_only
+def view_donations_by_ids(donation_ids, owner_id=None):
+    return batch_get(
+        Donations,
+        Donations.donation_id,
+        donation_ids,
+        options=[joinedload(Donations.user), joinedload(Donations.campaign)],
+        filters=[] if owner_id is None else [Donations.user_id == owner_id],
+    )
 
 
-def view_all_donations_by_user(user_id):
-    donations = Donations.query.filter_by(user_id=user_id).all()
+def view_all_donations_by_user(
+    user_id, cursor=None, limit=None, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Donations.query.filter_by(user_id=user_id),
+        Donations,
+        fields,
+        expand,
+        always=(Donations.created_at,),
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Donations.created_at,
+            Donations.donation_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    donations = query.all()
     if not donations:
         raise ValueError(f"No donation found by user id: {user_id}")
 
-    return [donation.to_dict() for donation in donations]
+    return [serializer(donation) for donation in donations]
+
 
+def view_all_donations_by_campaign(
+    campaign_id, cursor=None, limit=None, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Donations.query.filter_by(campaign_id=campaign_id),
+        Donations,
+        fields,
+        expand,
+        always=(Donations.created_at,),
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Donations.created_at,
+            Donations.donation_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+        )
 
-def view_all_donations_by_campaign(campaign_id):
-    donations = Donations.query.filter_by(campaign_id=campaign_id).all()
+    donations = query.all()
     if not donations:
         raise ValueError(f"No donation found by campaign id: {campaign_id}")
 
-    return [donation.to_dict() for donation in donations]
+    return [serializer(donation) for donation in donations]
+
+
+def _get_donation_for_update(donation_id):
+    return db.session.get(
+        Donations, donation_id, with_for_update=True, populate_existing=True
+    )
 
 
 def updateDonationStatus(donation_id, status):
-    donation = Donations.query.get(donation_id)
+    donation = _get_donation_for_update(donation_id)
 
     if not donation:
         raise ValueError(f"Could not find donation with donation id: {donation_id}")
 
+    old_status = donation.status
     try:
         donation.status = (
             status if isinstance(status, DonationStatus) else DonationStatus(status)
@@ -67,6 +134,7 @@ def updateDonationStatus(donation_id, status):
         raise ValueError(f"Invalid donation status: {status}")
 
     try:
+        apply_donation_transition(donation, old_status, donation.status)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
@@ -76,14 +144,16 @@ def updateDonationStatus(donation_id, status):
 
 
 def cancel_donation(donation_id):
-    donation = Donations.query.get(donation_id)
+    donation = _get_donation_for_update(donation_id)
 
     if not donation:
         raise ValueError("Donation not found")
 
+    old_status = donation.status
     donation.status = DonationStatus.CANCELLED
 
     try:
+        apply_donation_transition(donation, old_status, donation.status)
         db.session.commit()
     except Exception as e:
         db.session.rollback()
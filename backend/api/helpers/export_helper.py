@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+
+from api import db
+from api.database import read_only_scope
+from api.models.cf_models import Campaigns, Donations, Payments, Users
+from sqlalchemy import select
+
+DEFAULT_YIELD_PER = 1000
+EXPORT_FORMATS = ("csv", "ndjson")
+
+PAYMENT_EXPORT_COLUMNS = (
+    Payments.payment_id,
+    Payments.amount,
+    Payments.payment_method,
+    Payments.payment_status,
+    Payments.transaction_ref,
+    Payments.transaction_date,
+    Donations.donation_id,
+    Donations.amount.label("donation_amount"),
+    Users.user_id.label("donor_id"),
+    Users.username.label("donor_username"),
+    Campaigns.campaign_id,
+    Campaigns.title.label("campaign_title"),
+)
+
+DONATION_EXPORT_COLUMNS = (
+    Donations.donation_id,
+    Donations.amount,
+    Donations.status,
+    Donations.created_at,
+    Users.user_id.label("donor_id"),
+    Users.username.label("donor_username"),
+    Donations.campaign_id,
+)
+
+
+def _export_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _iter_batches(statement, yield_per):
+    with read_only_scope():
+        result = db.session.execute(statement.execution_options(yield_per=yield_per))
+        for partition in result.mappings().partitions():
+            yield [
+                {key: _export_value(value) for key, value in row.items()}
+                for row in partition
+            ]
+
+
+def iter_payment_export(yield_per=DEFAULT_YIELD_PER):
+    statement = (
+        select(*PAYMENT_EXPORT_COLUMNS)
+        .join(Donations, Donations.donation_id == Payments.donation_id)
+        .outerjoin(Users, Users.user_id == Donations.user_id)
+        .outerjoin(Campaigns, Campaigns.campaign_id == Donations.campaign_id)
+        .order_by(Payments.payment_id)
+    )
+    return _iter_batches(statement, yield_per)
+
+
+def iter_donation_export(campaign_id, yield_per=DEFAULT_YIELD_PER):
+    statement = (
+        select(*DONATION_EXPORT_COLUMNS)
+        .outerjoin(Users, Users.user_id == Donations.user_id)
+        .where(Donations.campaign_id == campaign_id)
+        .order_by(Donations.donation_id)
+    )
+    return _iter_batches(statement, yield_per)
+
+
+def export_fieldnames(columns):
+    return [column.key for column in columns]
+
+
+def stream_csv(batches, fieldnames):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_ndjson(batches):
+    for batch in batches:
+        yield "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in batch)
+
+
+def gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(batches, fieldnames, export_format="csv", compress=False):
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid export format. Must be one of: {list(EXPORT_FORMATS)}")
+
+    chunks = (
+        stream_csv(batches, fieldnames)
+        if export_format == "csv"
+        else stream_ndjson(batches)
+    )
+    if compress:
+        return gzip_stream(chunks)
+    return (chunk.encode() for chunk in chunks)
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from api import db
+from api.database import read_only
+from api.helpers.pagination_helper import decode_cursor, encode_cursor, get_page_size
+from flask import current_app, has_app_context
+from sqlalchemy import text
+
+DEFAULT_FEED_BACKFILL_SIZE = 20
+MAX_UPDATE_ID = 2**31 - 1
+
+FEED_PAGE_SQL = text(
+    """
+    WITH followed AS (
+        SELECT f.campaign_id
+        FROM follows f
+        JOIN campaigns c ON c.campaign_id = f.campaign_id
+        WHERE f.user_id = :user_id AND c.fan_out_on_read
+    ), items AS (
+        (
+            SELECT n.update_id, n.created_at, n.is_read
+            FROM notifications n
+            WHERE n.user_id = :user_id
+              AND (n.created_at, n.update_id) < (:before_created_at, :before_update_id)
+            ORDER BY n.created_at DESC, n.update_id DESC
+            LIMIT :limit
+        )
+        UNION ALL
+        SELECT pulled.update_id, pulled.created_at, false
+        FROM followed
+        CROSS JOIN LATERAL (
+            SELECT u.update_id, u.created_at
+            FROM campaign_updates u
+            WHERE u.campaign_id = followed.campaign_id
+              AND (u.created_at, u.update_id) < (:before_created_at, :before_update_id)
+              AND NOT EXISTS (
+                  SELECT 1 FROM notifications n
+                  WHERE n.user_id = :user_id AND n.update_id = u.update_id
+              )
+            ORDER BY u.created_at DESC, u.update_id DESC
+            LIMIT :limit
+        ) AS pulled
+    ), page AS (
+        SELECT * FROM items
+        ORDER BY created_at DESC, update_id DESC
+        LIMIT :limit
+    )
+    SELECT page.update_id, page.created_at, page.is_read, u.content,
+           c.campaign_id, c.title
+    FROM page
+    JOIN campaign_updates u ON u.update_id = page.update_id
+    JOIN campaigns c ON c.campaign_id = u.campaign_id
+    ORDER BY page.created_at DESC, page.update_id DESC
+    """
+)
+
+BACKFILL_FEED_SQL = text(
+    """
+    INSERT INTO notifications (user_id, campaign_id, update_id, is_read, created_at)
+    SELECT :user_id, u.campaign_id, u.update_id, false, u.created_at
+    FROM campaign_updates u
+    JOIN campaigns c ON c.campaign_id = u.campaign_id
+    WHERE u.campaign_id = :campaign_id AND NOT c.fan_out_on_read
+    ORDER BY u.created_at DESC, u.update_id DESC
+    LIMIT :limit
+    ON CONFLICT (user_id, update_id) DO NOTHING
+    """
+)
+
+CLEAR_FEED_SQL = text(
+    """
+    DELETE FROM notifications
+    WHERE user_id = :user_id AND campaign_id = :campaign_id
+    """
+)
+
+
+def backfill_feed(user_id, campaign_id):
+    limit = DEFAULT_FEED_BACKFILL_SIZE
+    if has_app_context():
+        limit = current_app.config.get("FEED_BACKFILL_SIZE", limit)
+    db.session.execute(
+        BACKFILL_FEED_SQL,
+        {"user_id": user_id, "campaign_id": campaign_id, "limit": limit},
+    )
+
+
+def clear_feed(user_id, campaign_id):
+    db.session.execute(
+        CLEAR_FEED_SQL, {"user_id": user_id, "campaign_id": campaign_id}
+    )
+
+
+@read_only
+def view_feed_by_user(user_id, cursor=None, limit=None):
+    page_size = get_page_size(limit)
+    before_created_at, before_update_id = datetime.max, MAX_UPDATE_ID
+    if cursor:
+        before_created_at, before_update_id = decode_cursor(cursor)
+
+    rows = db.session.execute(
+        FEED_PAGE_SQL,
+        {
+            "user_id": user_id,
+            "before_created_at": before_created_at,
+            "before_update_id": before_update_id,
+            "limit": page_size + 1,
+        },
+    ).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    return {
+        "items": [
+            {
+                "update_id": r.update_id,
+                "content": r.content,
+                "created_at": r.created_at,
+                "is_read": r.is_read,
+                "campaign": {"campaign_id": r.campaign_id, "title": r.title},
+            }
+            for r in rows
+        ],
+        "next_cursor": (
+            encode_cursor(rows[-1].created_at, rows[-1].update_id) if has_more else None
+        ),
+        "page_size": page_size,
+    }
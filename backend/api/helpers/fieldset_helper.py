@@ -0,0 +1,144 @@
+from functools import lru_cache
+
+from api.models.cf_models import (
+    Campaigns,
+    Comments,
+    Donations,
+    Follows,
+    Payments,
+    Users,
+)
+from api.serializers import compile_serializer, default_fields, parse_fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+# Relations a client may ask for with expand=, keyed by the name they appear
+# under in to_dict(), mapped to the relationship attribute that backs them.
+EXPANSIONS = {
+    Payments: {"donation": "donation"},
+    Donations: {"donor": "user", "campaign": "campaign"},
+    Comments: {"user": "user", "campaign": "campaign"},
+    Follows: {"user": "user", "campaign": "campaign"},
+    Campaigns: {"creator": "creator"},
+}
+
+# Relations that to_dict() reads on an expanded relation, e.g. the donor and
+# campaign inside each payment's donation.
+DEFAULT_NESTED_LOADS = {Payments: {"donation": ("user", "campaign")}}
+
+NESTED_FIELDS = {
+    Users: ("user_id", "username", "profile_image"),
+    Campaigns: ("campaign_id", "title"),
+    Donations: ("donation_id", "amount"),
+}
+
+
+@lru_cache(maxsize=256)
+def _serializer(model, fields):
+    return compile_serializer(model, fields)
+
+
+def _field_name(field):
+    return field[0] if isinstance(field, tuple) else field
+
+
+def _field_attr(field):
+    return field[1] if isinstance(field, tuple) else field
+
+
+class Fieldset:
+    def __init__(self, model, fields=None, expand=None, nested=False):
+        self.model = model
+        self.mapper = inspect(model)
+        relations = EXPANSIONS.get(model, {})
+        available = NESTED_FIELDS[model] if nested else default_fields(model)
+
+        # Naming a relation in fields (fields=donation.amount) implies
+        # expanding it; otherwise it would silently drop out of the response.
+        expand = dict(expand or {})
+        for name in fields or {}:
+            if name in relations:
+                expand.setdefault(name, None)
+
+        for name in expand:
+            if name not in relations:
+                raise ValueError(f"Cannot expand '{name}' on {model.__tablename__}")
+        for name in fields or {}:
+            if name not in relations and name not in map(_field_name, available):
+                raise ValueError(f"Unknown field '{name}' on {model.__tablename__}")
+
+        self.columns = tuple(
+            field for field in available if not fields or _field_name(field) in fields
+        )
+        self.relations = {}
+        for name, subtree in expand.items():
+            if fields and name not in fields:
+                continue
+            attr = relations[name]
+            target = self.mapper.relationships[attr].mapper.class_
+            child_fields = (fields or {}).get(name) or None
+            self.relations[name] = (attr, Fieldset(target, child_fields, subtree, nested=True))
+        self._serialize_columns = _serializer(model, self.columns)
+
+    def _load_columns(self, always=()):
+        columns = [
+            getattr(self.model, self.mapper.get_property_by_column(column).key)
+            for column in self.mapper.primary_key
+        ]
+        columns.extend(getattr(self.model, _field_attr(field)) for field in self.columns)
+        for attr, _ in self.relations.values():
+            columns.extend(
+                getattr(self.model, self.mapper.get_property_by_column(column).key)
+                for column in self.mapper.relationships[attr].local_columns
+            )
+        columns.extend(always)
+        return columns
+
+    def _relation_options(self):
+        options = []
+        for attr, child in self.relations.values():
+            loader = selectinload(getattr(self.model, attr))
+            options.append(
+                loader.options(load_only(*child._load_columns()), *child._relation_options())
+            )
+        return options
+
+    def options(self, *always):
+        return [load_only(*self._load_columns(always)), *self._relation_options()]
+
+    def serialize(self, row):
+        out = self._serialize_columns(row)
+        for name, (attr, child) in self.relations.items():
+            related = getattr(row, attr)
+            out[name] = child.serialize(related) if related is not None else None
+        return out
+
+
+def _default_options(model):
+    options = []
+    for attr in EXPANSIONS.get(model, {}).values():
+        loader = selectinload(getattr(model, attr))
+        nested = DEFAULT_NESTED_LOADS.get(model, {}).get(attr, ())
+        if nested:
+            target = inspect(model).relationships[attr].mapper.class_
+            loader = loader.options(*(selectinload(getattr(target, n)) for n in nested))
+        options.append(loader)
+    return options
+
+
+def _as_tree(value):
+    if value is None or isinstance(value, dict):
+        return value
+    if isinstance(value, (list, tuple, set)):
+        value = ",".join(value)
+    return parse_fields(value)
+
+
+def apply_fieldset(query, model, fields=None, expand=None, always=()):
+    fields, expand = _as_tree(fields), _as_tree(expand)
+    if fields is None and expand is None:
+        # to_dict() walks every relation; load them per query, not per row.
+        return query.options(*_default_options(model)), model.to_dict
+
+    fieldset = Fieldset(model, fields, expand)
+    return query.options(*fieldset.options(*always)), fieldset.serialize
@@ -1,7 +1,23 @@
 from api import db
+from api.database import read_only
 from api.models.cf_models import Follows, Users, Campaigns
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
+from api.helpers.pagination_helper import is_paginated, keyset_paginate
+from api.helpers.feed_helper import backfill_feed, clear_feed
+from api.helpers.batch_helper import batch_get, load_one
+from api.helpers.fieldset_helper import apply_fieldset
+from sqlalchemy.orm import joinedload
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+FOLLOW_UNIQUE_CONSTRAINT = "uq_follows_user_id_campaign_id"
+
+
+def _violation(error):
+    orig = getattr(error, "orig", None)
+    diag = getattr(orig, "diag", None)
+    return getattr(orig, "pgcode", None), getattr(diag, "constraint_name", None)
 
 
 def follow_campaign(user_id, campaign_id):
@@ -13,10 +29,17 @@ def follow_campaign(user_id, campaign_id):
 
     db.session.add(follow)
     try:
+        db.session.flush()
+        backfill_feed(user_id, campaign_id)
         db.session.commit()
-    except IntegrityError:
+    except IntegrityError as e:
         db.session.rollback()
-        raise RuntimeError("Could not follow campaign due to database integrity error.")
+        code, constraint = _violation(e)
+        if code == UNIQUE_VIOLATION and constraint == FOLLOW_UNIQUE_CONSTRAINT:
+            raise ValueError("User already follows this campaign.")
+        if code == FOREIGN_KEY_VIOLATION:
+            raise LookupError(f"No user {user_id} or campaign {campaign_id} to follow.")
+        raise RuntimeError(f"Could not follow campaign: {str(e)}")
     except Exception as e:
         db.session.rollback()
         raise RuntimeError(f"Could not follow campaign: {str(e)}")
@@ -31,6 +54,7 @@ def unfollow_campaign(user_id, campaign_id):
 
     try:
         db.session.delete(follow)
+        clear_feed(user_id, campaign_id)
         db.session.commit()
         return {"message": f"User {user_id} unfollowed campaign {campaign_id} successfully."}
     except Exception as e:
@@ -39,31 +63,81 @@ def unfollow_campaign(user_id, campaign_id):
 
 
 def view_follow_by_id(follow_id):
-    follow = Follows.query.get(follow_id)
+    follow = load_one("follows:None", view_follows_by_ids, "follow_id", follow_id)
     if not follow:
         raise ValueError(f"No follow record found with follow id: {follow_id}")
-    return follow.to_dict()
-
-
-def view_all_follows():
-    follows = Follows.query.all()
+    return follow
+
+
+@read_only
+def view_follows_by_ids(follow_ids, owner_id=None):
+    return batch_get(
+        Follows,
+        Follows.follow_id,
+        follow_ids,
+        options=[joinedload(Follows.user), joinedload(Follows.campaign)],
+        filters=[] if owner_id is None else [Follows.user_id == owner_id],
+    )
+
+
+@read_only
+def view_all_follows(
+    cursor=None, limit=None, with_total=False, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Follows.query, Follows, fields, expand, always=(Follows.created_at,)
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Follows.created_at,
+            Follows.follow_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+
+    follows = query.all()
     if not follows:
         raise ValueError("No follow records found.")
-    return [f.to_dict() for f in follows]
-
-
-def view_all_followed_campaigns_by_user(user_id):
-    follows = Follows.query.filter_by(user_id=user_id).all()
+    return [serializer(f) for f in follows]
+
+
+def view_all_followed_campaigns_by_user(
+    user_id, cursor=None, limit=None, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Follows.query.filter_by(user_id=user_id),
+        Follows,
+        fields,
+        expand,
+        always=(Follows.created_at,),
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Follows.created_at,
+            Follows.follow_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    follows = query.all()
     if not follows:
         raise ValueError(f"No campaigns followed by user id: {user_id}")
-    return [f.to_dict() for f in follows]
+    return [serializer(f) for f in follows]
 
 
-def view_all_followers_by_campaign(campaign_id):
-    follows = Follows.query.filter_by(campaign_id=campaign_id).all()
+def view_all_followers_by_campaign(campaign_id, fields=None, expand=None):
+    query, serializer = apply_fieldset(
+        Follows.query.filter_by(campaign_id=campaign_id), Follows, fields, expand
+    )
+    follows = query.all()
     if not follows:
         raise ValueError(f"No followers found for campaign id: {campaign_id}")
-    return [f.to_dict() for f in follows]
+    return [serializer(f) for f in follows]
 
 
 def is_user_following(user_id, campaign_id):
@@ -71,11 +145,13 @@ def is_user_following(user_id, campaign_id):
     return {"is_following": bool(follow)}
 
 
+@read_only
 def count_followers(campaign_id):
     count = db.session.query(db.func.count(Follows.follow_id)).filter_by(campaign_id=campaign_id).scalar()
     return {"campaign_id": campaign_id, "follower_count": count or 0}
 
 
+@read_only
 def count_followed_campaigns(user_id):
     count = db.session.query(db.func.count(Follows.follow_id)).filter_by(user_id=user_id).scalar()
     return {"user_id": user_id, "followed_campaigns_count": count or 0}
@@ -0,0 +1,222 @@
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+
+from api import db
+from api.helpers.security_helper import get_request_claims
+from api.models.cf_models import IdempotencyKeys
+from api.serializers import dumps
+from flask import current_app, request
+from sqlalchemy import text
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+DEFAULT_IDEMPOTENCY_TTL = 24 * 60 * 60
+MAX_KEY_LENGTH = 255
+
+CLAIM_KEY_SQL = text(
+    """
+    INSERT INTO idempotency_keys (scope, key, request_hash, created_at, expires_at)
+    VALUES (:scope, :key, :request_hash, :now, :expires_at)
+    ON CONFLICT (scope, key) DO UPDATE SET
+        request_hash = EXCLUDED.request_hash,
+        status_code = NULL,
+        response = NULL,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+    WHERE idempotency_keys.expires_at <= EXCLUDED.created_at
+    RETURNING key
+    """
+)
+
+STORE_RESPONSE_SQL = text(
+    """
+    UPDATE idempotency_keys
+    SET status_code = :status_code, response = CAST(:response AS json)
+    WHERE scope = :scope AND key = :key
+    """
+)
+
+RELEASE_KEY_SQL = text(
+    """
+    DELETE FROM idempotency_keys
+    WHERE scope = :scope AND key = :key AND status_code IS NULL
+    """
+)
+
+PURGE_EXPIRED_SQL = text(
+    """
+    DELETE FROM idempotency_keys
+    WHERE ctid IN (
+        SELECT ctid FROM idempotency_keys
+        WHERE expires_at <= :now
+        LIMIT :batch_size
+    )
+    """
+)
+
+
+def _ttl():
+    return current_app.config.get("IDEMPOTENCY_KEY_TTL", DEFAULT_IDEMPOTENCY_TTL)
+
+
+def _request_hash():
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b"\0")
+    digest.update(request.full_path.encode())
+    digest.update(b"\0")
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _scoped_key(key):
+    # Stored as a fixed-length digest so the user prefix can never push a
+    # client key over the column length.
+    claims, _ = get_request_claims()
+    user_id = claims.get("user_id") if claims else None
+    scoped = key if user_id is None else f"{user_id}:{key}"
+    return hashlib.sha256(scoped.encode()).hexdigest()
+
+
+def claim_key(scope, key, request_hash):
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        CLAIM_KEY_SQL,
+        {
+            "scope": scope,
+            "key": key,
+            "request_hash": request_hash,
+            "now": now,
+            "expires_at": now + timedelta(seconds=_ttl()),
+        },
+    ).first()
+    return claimed is not None
+
+
+def store_response(scope, key, body, status_code):
+    db.session.execute(
+        STORE_RESPONSE_SQL,
+        {
+            "scope": scope,
+            "key": key,
+            "status_code": status_code,
+            "response": dumps(body).decode(),
+        },
+    )
+
+
+def release_key(scope, key):
+    db.session.execute(RELEASE_KEY_SQL, {"scope": scope, "key": key})
+
+
+def _replay(scope, key, request_hash):
+    db.session.rollback()
+    record = db.session.get(IdempotencyKeys, (scope, key))
+    if record is None:
+        return {
+            "status": "error",
+            "message": "Idempotency key expired while replaying, please retry",
+        }, 409
+    if record.request_hash != request_hash:
+        return {
+            "status": "error",
+            "message": "Idempotency key was already used with a different request",
+        }, 422
+    if record.status_code is None:
+        return {
+            "status": "error",
+            "message": "A request with this idempotency key is still being processed",
+        }, 409
+    return record.response, record.status_code, {REPLAYED_HEADER: "true"}
+
+
+def _unpack(result):
+    if isinstance(result, tuple):
+        body = result[0]
+        status_code = result[1] if len(result) > 1 else 200
+        return body, status_code
+    return result, 200
+
+
+def _commit(scope, key, request_hash, body, status_code):
+    if status_code >= 400:
+        # Error responses are replayed too, but without whatever the view
+        # wrote before failing; the rollback also drops the claim.
+        db.session.rollback()
+        if not claim_key(scope, key, request_hash):
+            return
+    if isinstance(body, (dict, list)):
+        store_response(scope, key, body, status_code)
+    else:
+        release_key(scope, key)
+    db.session.commit()
+
+
+def idempotent(scope):
+    """Replay the stored response for a repeated Idempotency-Key.
+
+    The view must leave its writes uncommitted: the response is stored in
+    the same transaction as the write and both are committed here, so a
+    crash can never leave a committed write without its response.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key and len(key) > MAX_KEY_LENGTH:
+                return {
+                    "status": "error",
+                    "message": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters",
+                }, 400
+
+            if key:
+                key = _scoped_key(key)
+                request_hash = _request_hash()
+                if not claim_key(scope, key, request_hash):
+                    return _replay(scope, key, request_hash)
+
+            try:
+                result = f(*args, **kwargs)
+            except Exception:
+                db.session.rollback()
+                raise
+
+            body, status_code = _unpack(result)
+            if status_code >= 500:
+                db.session.rollback()
+                return result
+
+            try:
+                if key:
+                    _commit(scope, key, request_hash, body, status_code)
+                elif status_code >= 400:
+                    db.session.rollback()
+                else:
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                return {"status": "error", "message": f"Could not save the request: {str(e)}"}, 500
+            return result
+
+        return decorated_function
+
+    return decorator
+
+
+def purge_expired_idempotency_keys(batch_size=1000):
+    purged = 0
+    while True:
+        try:
+            deleted = db.session.execute(
+                PURGE_EXPIRED_SQL,
+                {"now": datetime.utcnow(), "batch_size": batch_size},
+            ).rowcount
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise RuntimeError(f"Could not purge idempotency keys: {str(e)}")
+        purged += deleted
+        if deleted < batch_size:
+            return purged
@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+
+from api import db
+from api.models.cf_models import Campaigns, CampaignUpdates, Follows
+from flask import current_app, has_app_context
+from sqlalchemy import select, text
+
+DEFAULT_FAN_OUT_BATCH_SIZE = 5000
+DEFAULT_FAN_OUT_LIMIT = 10000
+DEFAULT_FAN_OUT_RETRY_AFTER_SECONDS = 5 * 60
+DEFAULT_FAN_OUT_RETRY_LIMIT = 100
+
+FAN_OUT_BATCH_SQL = text(
+    """
+    WITH batch AS (
+        SELECT follow_id, user_id, created_at
+        FROM follows
+        WHERE campaign_id = :campaign_id
+          AND (created_at, follow_id) > (:after_created_at, :after_follow_id)
+        ORDER BY created_at, follow_id
+        LIMIT :batch_size
+    ), inserted AS (
+        INSERT INTO notifications (user_id, campaign_id, update_id, is_read, created_at)
+        SELECT user_id, :campaign_id, :update_id, false, :created_at
+        FROM batch
+        ON CONFLICT (user_id, update_id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM batch) AS batch_count,
+        (SELECT COUNT(*) FROM inserted) AS inserted_count,
+        last.created_at AS last_created_at,
+        last.follow_id AS last_follow_id
+    FROM (SELECT 1) AS one
+    LEFT JOIN LATERAL (
+        SELECT created_at, follow_id FROM batch
+        ORDER BY created_at DESC, follow_id DESC
+        LIMIT 1
+    ) AS last ON true
+    """
+)
+
+
+def _config(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+def _switch_to_fan_out_on_read(campaign_id):
+    follower_count = (
+        db.session.query(db.func.count(Follows.follow_id))
+        .filter(Follows.campaign_id == campaign_id)
+        .scalar()
+    )
+    if follower_count <= _config("FAN_OUT_LIMIT", DEFAULT_FAN_OUT_LIMIT):
+        return False
+
+    try:
+        db.session.query(Campaigns).filter(
+            Campaigns.campaign_id == campaign_id
+        ).update({"fan_out_on_read": True}, synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not switch campaign to fan-out on read: {str(e)}")
+    return True
+
+
+def _mark_fanned_out(update_id):
+    db.session.query(CampaignUpdates).filter(
+        CampaignUpdates.update_id == update_id
+    ).update({"fanned_out": True}, synchronize_session=False)
+
+
+def fan_out_campaign_update(update_id, batch_size=None):
+    campaign_update = db.session.get(CampaignUpdates, update_id)
+    if not campaign_update:
+        raise ValueError(f"No campaign update found with update id: {update_id}")
+
+    fan_out_on_read = db.session.query(Campaigns.fan_out_on_read).filter(
+        Campaigns.campaign_id == campaign_update.campaign_id
+    ).scalar()
+    if fan_out_on_read or _switch_to_fan_out_on_read(campaign_update.campaign_id):
+        try:
+            _mark_fanned_out(update_id)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise RuntimeError(f"Could not mark campaign update as fanned out: {str(e)}")
+        return {"update_id": update_id, "notified": 0, "fan_out_on_read": True}
+
+    batch_size = batch_size or _config("FAN_OUT_BATCH_SIZE", DEFAULT_FAN_OUT_BATCH_SIZE)
+    params = {
+        "campaign_id": campaign_update.campaign_id,
+        "update_id": update_id,
+        "created_at": campaign_update.created_at,
+        "after_created_at": datetime.min,
+        "after_follow_id": 0,
+        "batch_size": batch_size,
+    }
+    notified = 0
+    while True:
+        try:
+            row = db.session.execute(FAN_OUT_BATCH_SQL, params).one()
+            if row.batch_count < batch_size:
+                _mark_fanned_out(update_id)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise RuntimeError(f"Could not notify campaign followers: {str(e)}")
+
+        notified += row.inserted_count
+        if row.batch_count < batch_size:
+            return {"update_id": update_id, "notified": notified, "fan_out_on_read": False}
+        params["after_created_at"] = row.last_created_at
+        params["after_follow_id"] = row.last_follow_id
+
+
+def retry_pending_fan_outs(limit=None):
+    # enqueue() logs and drops the task when the broker is down, leaving the
+    # update unmarked. Give the original task time to run before retrying.
+    retry_after = _config(
+        "FAN_OUT_RETRY_AFTER_SECONDS", DEFAULT_FAN_OUT_RETRY_AFTER_SECONDS
+    )
+    update_ids = db.session.scalars(
+        select(CampaignUpdates.update_id)
+        .where(
+            ~CampaignUpdates.fanned_out,
+            CampaignUpdates.created_at < datetime.utcnow() - timedelta(seconds=retry_after),
+        )
+        .order_by(CampaignUpdates.update_id)
+        .limit(limit or _config("FAN_OUT_RETRY_LIMIT", DEFAULT_FAN_OUT_RETRY_LIMIT))
+    ).all()
+
+    retried, failed = [], []
+    for update_id in update_ids:
+        try:
+            fan_out_campaign_update(update_id)
+        except RuntimeError as e:
+            current_app.logger.error(f"Could not fan out update {update_id}: {str(e)}")
+            failed.append(update_id)
+        else:
+            retried.append(update_id)
+    return {"retried": retried, "failed": failed}
@@ -0,0 +1,117 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import current_app, has_app_context
+from sqlalchemy import text, tuple_
+
+from api import db
+
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at, row_id):
+    payload = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def get_page_size(limit=None):
+    max_page_size = DEFAULT_MAX_PAGE_SIZE
+    if has_app_context():
+        max_page_size = current_app.config.get(
+            "PAGINATION_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE
+        )
+
+    if limit is None:
+        return min(DEFAULT_PAGE_SIZE, max_page_size)
+
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid page size: {limit}")
+    if limit <= 0:
+        raise ValueError("Page size must be greater than 0")
+    return min(limit, max_page_size)
+
+
+def _planner_estimate(query):
+    # The planner's row estimate for the filtered query: as cheap as
+    # reltuples, but it accounts for the WHERE clause.
+    statement = query.statement.compile(
+        dialect=db.session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    plan = (
+        db.session.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", {})
+        .scalar()
+    )
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_approximate_total(table_name, query=None):
+    if query is not None and query.whereclause is not None:
+        return _planner_estimate(query)
+
+    estimate = db.session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"),
+        {"table_name": table_name},
+    ).scalar()
+    return max(estimate or 0, 0)
+
+
+def keyset_paginate(
+    query,
+    created_column,
+    id_column,
+    serializer=lambda row: row.to_dict(),
+    cursor=None,
+    limit=None,
+    with_total=False,
+):
+    page_size = get_page_size(limit)
+    filtered_query = query
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_column, id_column) < (created_at, row_id))
+
+    rows = (
+        query.order_by(created_column.desc(), id_column.desc())
+        .limit(page_size + 1)
+        .all()
+    )
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_column.key), getattr(last, id_column.key)
+        )
+
+    page = {
+        "items": [serializer(row) for row in rows],
+        "next_cursor": next_cursor,
+        "page_size": page_size,
+    }
+    if with_total:
+        page["approximate_total"] = get_approximate_total(
+            created_column.class_.__tablename__, filtered_query
+        )
+    return page
+
+
+def is_paginated(cursor=None, limit=None):
+    return cursor is not None or limit is not None
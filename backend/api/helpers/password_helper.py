@@ -0,0 +1,157 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+DEFAULT_QUEUE_TIMEOUT = 5
+DEFAULT_BCRYPT_ROUNDS = 12
+
+# Parameters werkzeug/bcrypt fill in when a method leaves them out, so that
+# "scrypt" and "scrypt:32768:8:1" compare equal.
+METHOD_DEFAULTS = {
+    "scrypt": ("32768", "8", "1"),
+    "pbkdf2": ("sha256", str(DEFAULT_PBKDF2_ITERATIONS)),
+    "bcrypt": (str(DEFAULT_BCRYPT_ROUNDS),),
+}
+
+
+def _hash(password, method):
+    if method.startswith("bcrypt"):
+        import bcrypt
+
+        _, _, rounds = method.partition(":")
+        salt = bcrypt.gensalt(rounds=int(rounds or DEFAULT_BCRYPT_ROUNDS))
+        return bcrypt.hashpw(password.encode(), salt).decode()
+    return generate_password_hash(password, method=method)
+
+
+def _verify(stored_hash, password):
+    if stored_hash.startswith("$2"):
+        import bcrypt
+
+        return bcrypt.checkpw(password.encode(), stored_hash.encode())
+    return check_password_hash(stored_hash, password)
+
+
+def _normalize_method(method):
+    name, *params = method.split(":")
+    defaults = METHOD_DEFAULTS.get(name, ())
+    params += defaults[len(params):]
+    if name == "bcrypt":
+        params = [str(int(p)) for p in params]
+    return ":".join([name, *params])
+
+
+def _hash_params(stored_hash):
+    if stored_hash.startswith("$2"):
+        rounds = stored_hash.split("$")[2]
+        return f"bcrypt:{int(rounds)}"
+    return stored_hash.split("$", 1)[0]
+
+
+class PasswordHasher:
+    def __init__(self, method=DEFAULT_METHOD, workers=None, max_pending=None, timeout=None):
+        self.method = method
+        self._normalized_method = _normalize_method(method)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.timeout = timeout or DEFAULT_QUEUE_TIMEOUT
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.queue_depth = 0
+        self.rejected = 0
+        self.completed = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _track(self, delta):
+        with self._lock:
+            self.queue_depth += delta
+            if delta < 0:
+                self.completed += 1
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise RuntimeError("Password hashing service is busy, please retry")
+
+        self._track(1)
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._track(-1)
+            self._slots.release()
+
+    def hash(self, password):
+        return self._submit(_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        if not stored_hash:
+            return False
+        return self._submit(_verify, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        return _normalize_method(_hash_params(stored_hash)) != self._normalized_method
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "max_pending": self.max_pending,
+            "workers": self.workers,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher():
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                config = current_app.config if has_app_context() else {}
+                _hasher = PasswordHasher(
+                    method=config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+                    workers=config.get("PASSWORD_HASH_WORKERS"),
+                    max_pending=config.get("PASSWORD_HASH_MAX_PENDING"),
+                    timeout=config.get("PASSWORD_HASH_QUEUE_TIMEOUT"),
+                )
+    return _hasher
+
+
+def hash_password(password):
+    return get_password_hasher().hash(password)
+
+
+def verify_password(stored_hash, password):
+    return get_password_hasher().verify(stored_hash, password)
+
+
+def password_needs_rehash(stored_hash):
+    return get_password_hasher().needs_rehash(stored_hash)
+
+
+def get_password_hashing_stats():
+    return get_password_hasher().stats()
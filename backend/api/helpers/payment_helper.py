@@ -1,10 +1,27 @@
 from api import db
-from api.models.cf_models import Payments, CampaignPaymentStatus
+from api.database import read_only
+from api.models.cf_models import (
+    AnalyticsWatermarks,
+    CampaignPaymentStatus,
+    Donations,
+    PaymentDailyTotals,
+    Payments,
+)
+from flask import current_app, has_app_context
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime
-
-
-def create_payment(donation_id, amount, payment_method, payment_status):
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from api.helpers.pagination_helper import is_paginated, keyset_paginate
+from api.helpers.batch_helper import batch_get, load_one
+from api.helpers.fieldset_helper import apply_fieldset
+from sqlalchemy.orm import joinedload
+
+
+def create_payment(
+    donation_id, amount, payment_method, payment_status, transaction_ref=None,
+    commit=True,
+):
     if not amount or amount <= 0:
         raise ValueError("Amount must be greater than 0.")
 
@@ -27,11 +44,15 @@ def create_payment(donation_id, amount, payment_method, payment_status):
         amount=amount,
         payment_method=payment_method,
         payment_status=payment_status,
+        transaction_ref=transaction_ref,
     )
 
     db.session.add(payment)
     try:
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
     except IntegrityError:
         db.session.rollback()
         raise RuntimeError("Payment creation failed due to database integrity error.")
@@ -42,25 +63,87 @@ def create_payment(donation_id, amount, payment_method, payment_status):
     return payment.to_dict()
 
 
+def create_donor_payment(user_id, donation_id, payment_method, amount=None,
+                         transaction_ref=None, commit=True):
+    donation = db.session.get(Donations, donation_id)
+    if not donation:
+        raise ValueError(f"Could not find donation with donation id: {donation_id}")
+    if donation.user_id != user_id:
+        raise PermissionError("You can only pay for your own donations")
+    if amount is not None:
+        try:
+            matches = Decimal(str(amount)) == donation.amount
+        except InvalidOperation:
+            matches = False
+        if not matches:
+            raise ValueError(
+                f"Amount must match the donation amount of {donation.amount}"
+            )
+
+    return create_payment(
+        donation_id=donation.donation_id,
+        amount=donation.amount,
+        payment_method=payment_method,
+        payment_status=CampaignPaymentStatus.PENDING,
+        transaction_ref=transaction_ref,
+        commit=commit,
+    )
+
+
 def view_payment_by_payment_id(payment_id):
-    payment = Payments.query.get(payment_id)
+    payment = load_one("payments", view_payments_by_ids, "payment_id", payment_id)
     if not payment:
         raise ValueError(f"Could not find payment with payment id: {payment_id}")
-    return payment.to_dict()
+    return payment
+
+
+@read_only
+def view_payments_by_ids(payment_ids):
+    donation = joinedload(Payments.donation)
+    return batch_get(
+        Payments,
+        Payments.payment_id,
+        payment_ids,
+        options=[
+            donation.joinedload(Donations.user),
+            donation.joinedload(Donations.campaign),
+        ],
+    )
+
 
+@read_only
+def view_all_payments(
+    cursor=None, limit=None, with_total=False, fields=None, expand=None
+):
+    query, serializer = apply_fieldset(
+        Payments.query, Payments, fields, expand, always=(Payments.transaction_date,)
+    )
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            query,
+            Payments.transaction_date,
+            Payments.payment_id,
+            serializer=serializer,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
 
-def view_all_payments():
-    payments = Payments.query.all()
+    payments = query.all()
     if not payments:
         raise ValueError("No payments found.")
-    return [p.to_dict() for p in payments]
+    return [serializer(p) for p in payments]
 
 
-def view_all_payments_by_donation(donation_id):
-    payments = Payments.query.filter_by(donation_id=donation_id).all()
+@read_only
+def view_all_payments_by_donation(donation_id, fields=None, expand=None):
+    query, serializer = apply_fieldset(
+        Payments.query.filter_by(donation_id=donation_id), Payments, fields, expand
+    )
+    payments = query.all()
     if not payments:
         raise ValueError(f"No payments found for donation id: {donation_id}")
-    return [p.to_dict() for p in payments]
+    return [serializer(p) for p in payments]
 
 
 def update_payment_status(payment_id, new_status):
@@ -121,17 +204,20 @@ def delete_payment(payment_id):
         raise RuntimeError(f"Could not delete payment: {str(e)}")
 
 
+@read_only
 def get_total_payments():
     total = db.session.query(db.func.count(Payments.payment_id)).scalar()
     return {"total_payments": total or 0}
 
 
+@read_only
 def get_total_payment_amount():
     total = db.session.query(db.func.sum(Payments.amount)).scalar()
     return {"total_amount": float(total or 0)}
 
 
-def filter_payments_by_status(status):
+@read_only
+def filter_payments_by_status(status, fields=None, expand=None):
     try:
         status_enum = (
             status
@@ -143,17 +229,181 @@ def filter_payments_by_status(status):
             f"Invalid payment status. Must be one of: {[s.value for s in CampaignPaymentStatus]}"
         )
 
-    payments = Payments.query.filter_by(payment_status=status_enum).all()
+    query, serializer = apply_fieldset(
+        Payments.query.filter_by(payment_status=status_enum), Payments, fields, expand
+    )
+    payments = query.all()
     if not payments:
         raise ValueError(f"No payments found with status: {status_enum.value}")
 
-    return [p.to_dict() for p in payments]
+    return [serializer(p) for p in payments]
 
 
-def filter_payments_by_method(method):
-    payments = Payments.query.filter(
-        db.func.lower(Payments.payment_method) == method.lower()
-    ).all()
+@read_only
+def filter_payments_by_method(method, fields=None, expand=None):
+    query, serializer = apply_fieldset(
+        Payments.query.filter(db.func.lower(Payments.payment_method) == method.lower()),
+        Payments,
+        fields,
+        expand,
+    )
+    payments = query.all()
     if not payments:
         raise ValueError(f"No payments found using method: {method}")
-    return [p.to_dict() for p in payments]
\ No newline at end of file
+    return [serializer(p) for p in payments]
+
+
+PAYMENT_LEDGER_WATERMARK = "payment_daily_totals"
+DEFAULT_LEDGER_LOOKBACK_DAYS = 3
+SUMMARY_GRANULARITIES = ("day", "week", "month")
+
+CLOSE_PAYMENT_DAYS_SQL = text(
+    """
+    INSERT INTO payment_daily_totals (
+        day, payment_method, payment_status, payment_count, total_amount
+    )
+    SELECT transaction_date::date, payment_method, payment_status,
+           COUNT(*), COALESCE(SUM(amount), 0)
+    FROM payments
+    WHERE transaction_date >= :since AND transaction_date < :until
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, payment_method, payment_status) DO UPDATE SET
+        payment_count = EXCLUDED.payment_count,
+        total_amount = EXCLUDED.total_amount
+    """
+)
+
+PAYMENT_SUMMARY_SQL = """
+    WITH ledger AS (
+        SELECT day, payment_method, payment_status, payment_count, total_amount
+        FROM payment_daily_totals
+        WHERE day < :open_from
+          AND (CAST(:start AS date) IS NULL OR day >= :start)
+          AND (CAST(:end AS date) IS NULL OR day < :end)
+        UNION ALL
+        SELECT transaction_date::date, payment_method, payment_status,
+               COUNT(*), COALESCE(SUM(amount), 0)
+        FROM payments
+        WHERE transaction_date >= GREATEST(:open_from, COALESCE(CAST(:start AS date), :open_from))
+          AND (CAST(:end AS date) IS NULL OR transaction_date < :end)
+        GROUP BY 1, 2, 3
+    )
+    SELECT date_trunc('{granularity}', day)::date AS bucket,
+           payment_method,
+           payment_status,
+           GROUPING(date_trunc('{granularity}', day), payment_method, payment_status) AS grouping_id,
+           SUM(payment_count) AS payment_count,
+           SUM(total_amount) AS total_amount
+    FROM ledger
+    GROUP BY GROUPING SETS (
+        (date_trunc('{granularity}', day)),
+        (payment_method),
+        (payment_status),
+        ()
+    )
+"""
+
+
+def _ledger_watermark():
+    return db.session.get(AnalyticsWatermarks, PAYMENT_LEDGER_WATERMARK)
+
+
+def _ledger_lookback_days():
+    if has_app_context():
+        return current_app.config.get(
+            "PAYMENT_LEDGER_LOOKBACK_DAYS", DEFAULT_LEDGER_LOOKBACK_DAYS
+        )
+    return DEFAULT_LEDGER_LOOKBACK_DAYS
+
+
+def close_payment_days(through=None, full=False):
+    today = datetime.utcnow().date()
+    through = through or (today - timedelta(days=1))
+    if through >= today:
+        raise ValueError("Only days before today (UTC) can be closed")
+
+    watermark = db.session.get(
+        AnalyticsWatermarks, PAYMENT_LEDGER_WATERMARK, with_for_update=True
+    )
+    if full or watermark is None:
+        since = date.min
+    else:
+        # Re-close the trailing window so late status/amount changes to
+        # recently closed payments still reach the ledger.
+        closed_through = watermark.refreshed_through.date()
+        since = closed_through + timedelta(days=1 - _ledger_lookback_days())
+        through = max(through, closed_through)
+    if since > through:
+        return {"closed_from": None, "closed_through": through}
+
+    try:
+        db.session.query(PaymentDailyTotals).filter(
+            PaymentDailyTotals.day >= since, PaymentDailyTotals.day <= through
+        ).delete(synchronize_session=False)
+        db.session.execute(
+            CLOSE_PAYMENT_DAYS_SQL,
+            {
+                "since": datetime.combine(since, datetime.min.time()),
+                "until": datetime.combine(through + timedelta(days=1), datetime.min.time()),
+            },
+        )
+        closed_through = datetime.combine(through, datetime.min.time())
+        if watermark is None:
+            db.session.add(
+                AnalyticsWatermarks(
+                    name=PAYMENT_LEDGER_WATERMARK, refreshed_through=closed_through
+                )
+            )
+        else:
+            watermark.refreshed_through = closed_through
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not close payment days: {str(e)}")
+
+    return {
+        "closed_from": None if since == date.min else since,
+        "closed_through": through,
+    }
+
+
+@read_only
+def get_payment_summary(start_date=None, end_date=None, granularity="day"):
+    if granularity not in SUMMARY_GRANULARITIES:
+        raise ValueError(
+            f"Invalid granularity. Must be one of: {list(SUMMARY_GRANULARITIES)}"
+        )
+
+    watermark = _ledger_watermark()
+    open_from = (
+        watermark.refreshed_through.date() + timedelta(days=1) if watermark else date.min
+    )
+    rows = db.session.execute(
+        text(PAYMENT_SUMMARY_SQL.format(granularity=granularity)),
+        {
+            "open_from": open_from,
+            "start": start_date,
+            "end": end_date + timedelta(days=1) if end_date else None,
+        },
+    ).all()
+
+    summary = {
+        "total": {"payment_count": 0, "total_amount": 0.0},
+        "by_method": {},
+        "by_status": {},
+        f"by_{granularity}": {},
+    }
+    for r in rows:
+        totals = {
+            "payment_count": int(r.payment_count or 0),
+            "total_amount": float(r.total_amount or 0),
+        }
+        if r.grouping_id == 7:
+            summary["total"] = totals
+        elif r.grouping_id == 3:
+            summary[f"by_{granularity}"][r.bucket.isoformat()] = totals
+        elif r.grouping_id == 5:
+            summary["by_method"][r.payment_method] = totals
+        elif r.grouping_id == 6:
+            summary["by_status"][CampaignPaymentStatus[r.payment_status].value] = totals
+    return summary
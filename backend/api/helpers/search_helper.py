@@ -0,0 +1,92 @@
+from api import db
+from api.database import read_only
+from api.models.cf_models import CampaignCategory, CampaignStatus
+from api.helpers.pagination_helper import get_page_size
+from sqlalchemy import text
+
+CAMPAIGN_SEARCH_SQL = text(
+    """
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', :keyword) AS tsq
+    ),
+    matches AS (
+        SELECT c.campaign_id, c.title, c.description, c.category, c.status,
+               c.goal_amount, c.raised_amount, c.created_at,
+               ts_rank(c.search_vector, query.tsq) AS rank
+        FROM campaigns c, query
+        WHERE c.search_vector @@ query.tsq
+    ),
+    facets AS (
+        SELECT
+            (SELECT json_object_agg(category, n)
+             FROM (SELECT category, count(*) AS n FROM matches GROUP BY category) f
+            ) AS category_facets,
+            (SELECT json_object_agg(status, n)
+             FROM (SELECT status, count(*) AS n FROM matches GROUP BY status) f
+            ) AS status_facets
+    )
+    SELECT facets.category_facets, facets.status_facets, top.*
+    FROM facets
+    LEFT JOIN LATERAL (
+        SELECT * FROM matches
+        WHERE (CAST(:category AS text) IS NULL OR category::text = :category)
+          AND (CAST(:status AS text) IS NULL OR status::text = :status)
+        ORDER BY rank DESC, campaign_id DESC
+        LIMIT :limit
+    ) AS top ON true
+    """
+)
+
+
+def _facet_values(facets, enum_cls):
+    return {enum_cls[name].value: count for name, count in (facets or {}).items()}
+
+
+@read_only
+def search_campaigns(keyword, category=None, status=None, limit=None):
+    if not keyword or not keyword.strip():
+        raise ValueError("Search keyword cannot be empty")
+
+    try:
+        if category and not isinstance(category, CampaignCategory):
+            category = CampaignCategory(category)
+        if status and not isinstance(status, CampaignStatus):
+            status = CampaignStatus(status)
+    except ValueError as e:
+        raise ValueError(f"Invalid category or status: {str(e)}")
+
+    rows = db.session.execute(
+        CAMPAIGN_SEARCH_SQL,
+        {
+            "keyword": keyword.strip(),
+            "category": category.name if category else None,
+            "status": status.name if status else None,
+            "limit": get_page_size(limit),
+        },
+    ).all()
+
+    facets = rows[0] if rows else None
+    results = [
+        {
+            "campaign_id": r.campaign_id,
+            "title": r.title,
+            "description": r.description,
+            "category": CampaignCategory[r.category].value,
+            "status": CampaignStatus[r.status].value,
+            "goal_amount": float(r.goal_amount),
+            "raised_amount": float(r.raised_amount or 0),
+            "created_at": r.created_at,
+            "rank": float(r.rank),
+        }
+        for r in rows
+        if r.campaign_id is not None
+    ]
+
+    return {
+        "results": results,
+        "facets": {
+            "category": _facet_values(facets and facets.category_facets, CampaignCategory),
+            "status": _facet_values(facets and facets.status_facets, CampaignStatus),
+        },
+    }
+
@@ -1,7 +1,53 @@
 import jwt
 import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from flask import current_app, request, jsonify
+from flask import current_app, g, request, jsonify
+
+DEFAULT_TOKEN_CACHE_SIZE = 4096
+
+
+class VerifiedTokenCache:
+    def __init__(self, maxsize=DEFAULT_TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._data.get(digest)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[digest]
+                return None
+            self._data.move_to_end(digest)
+            return payload
+
+    def set(self, digest, payload):
+        expires_at = payload.get("exp")
+        if expires_at is None:
+            return
+        with self._lock:
+            self._data[digest] = (payload, expires_at)
+            self._data.move_to_end(digest)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_token_cache = VerifiedTokenCache()
+
+
+def clear_token_cache():
+    _token_cache.clear()
 
 
 def generate_jwt(user_id, role):
@@ -19,101 +65,67 @@ def generate_jwt(user_id, role):
 
 
 def verify_jwt(token):
-    try:
-        payload = jwt.decode(
-            token, current_app.config["SECRET_KEY"], algorithms=["HS256"]
-        )
+    secret = current_app.config["SECRET_KEY"]
+    digest = hashlib.sha256(f"{secret}\0{token}".encode()).digest()
+    payload = _token_cache.get(digest)
+    if payload is not None:
         return payload
+
+    try:
+        payload = jwt.decode(token, secret, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         raise ValueError("Token expired. Please log in again")
     except jwt.InvalidTokenError:
         raise ValueError("Invalid token")
 
+    _token_cache.set(digest, payload)
+    return payload
 
-def jwt_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return (
-                jsonify({"status": "error", "message": "Authorization header missing"}),
-                401,
-            )
 
-        token = auth_header.split(" ")[1]
+def get_request_claims():
+    if "jwt_claims" in g:
+        return g.jwt_claims, g.jwt_error
 
+    claims, error = None, None
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        error = "Authorization header missing"
+    else:
         try:
-            payload = verify_jwt(token)
-            return f(user_id=payload["user_id"], *args, **kwargs)
+            claims = verify_jwt(auth_header[7:])
         except ValueError as e:
-            return jsonify({"status": "error", "message": str(e)}), 401
+            error = str(e)
 
-    return decorated_function
+    g.jwt_claims, g.jwt_error = claims, error
+    return claims, error
 
 
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        try:
-            from flask_login import current_user
-
-            if (
-                getattr(current_user, "is_authenticated", False)
-                and str(getattr(current_user, "role", "")).lower() == "admin"
-            ):
-                return f(*args, **kwargs)
-        except Exception:
-            pass
-
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return (
-                jsonify({"status": "error", "message": "Authorization header missing"}),
-                401,
-            )
-
-        token = auth_header.split(" ")[1]
-
-        try:
-            payload = verify_jwt(token)
-            if payload.get("role") != "admin":
-                return jsonify({"status": "error", "message": "Admins only"}), 403
+def _role_required(role, message):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            claims, error = get_request_claims()
+            if claims is None:
+                return jsonify({"status": "error", "message": error}), 401
+            if role and claims.get("role") != role:
+                return jsonify({"status": "error", "message": message}), 403
             return f(*args, **kwargs)
-        except ValueError as e:
-            return jsonify({"status": "error", "message": str(e)}), 401
 
-    return decorated_function
+        return decorated_function
+
+    return decorator
 
 
-def creator_required(f):
+def jwt_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        try:
-            from flask_login import current_user
-
-            if (
-                getattr(current_user, "is_authenticated", False)
-                and str(getattr(current_user, "role", "")).lower() == "creator"
-            ):
-                return f(*args, **kwargs)
-        except Exception:
-            pass
+        claims, error = get_request_claims()
+        if claims is None:
+            return jsonify({"status": "error", "message": error}), 401
+        return f(user_id=claims["user_id"], *args, **kwargs)
 
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return (
-                jsonify({"status": "error", "message": "Authorization header missing"}),
-                401,
-            )
+    return decorated_function
 
-        token = auth_header.split(" ")[1]
 
-        try:
-            payload = verify_jwt(token)
-            if payload.get("role") != "creator":
-                return jsonify({"status": "error", "message": "Creators only"}), 403
-            return f(*args, **kwargs)
-        except ValueError as e:
-            return jsonify({"status": "error", "message": str(e)}), 401
-
-    return decorated_function
+admin_required = _role_required("admin", "Admins only")
+creator_required = _role_required("creator", "Creators only")
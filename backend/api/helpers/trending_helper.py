@@ -0,0 +1,164 @@
+import math
+from datetime import datetime, timedelta
+
+from api import db
+from api.database import read_only
+from api.helpers.cache_helper import cached, invalidate_on_commit
+from api.helpers.campaign_helper import _campaign_list_query, _campaign_row_to_dict
+from api.models.cf_models import (
+    AnalyticsWatermarks,
+    CampaignCategory,
+    Campaigns,
+    CampaignStatus,
+)
+from flask import current_app, has_app_context
+from sqlalchemy import text
+
+WATERMARK_NAME = "campaign_trending_scores"
+TRENDING_EPOCH = datetime(2024, 1, 1)
+DEFAULT_HALF_LIFE_HOURS = 48
+DEFAULT_SETTLE_SECONDS = 60
+DEFAULT_WEIGHTS = {
+    "donation": 3.0,
+    "percent_of_goal": 0.5,
+    "follow": 2.0,
+    "comment": 1.0,
+}
+
+# Scores are kept as ln(sum(weight * exp((event_time - epoch) / tau))). Every
+# campaign decays by the same factor over time, so ordering by the stored
+# value matches ordering by the decayed activity at any moment, and new events
+# can be folded in with log-sum-exp without touching older ones. Donations
+# count once, when they complete, so a pending donation that completes after
+# the watermark has passed its created_at is still picked up.
+REFRESH_TRENDING_SQL = text(
+    """
+    WITH events AS (
+        SELECT d.campaign_id, d.completed_at AS created_at,
+               :donation_weight
+               + CASE WHEN c.goal_amount > 0
+                      THEN :percent_of_goal_weight * 100 * d.amount / c.goal_amount
+                      ELSE 0 END AS weight
+        FROM donations d
+        JOIN campaigns c ON c.campaign_id = d.campaign_id
+        WHERE d.status = 'COMPLETED'
+          AND d.completed_at > :since AND d.completed_at <= :until
+        UNION ALL
+        SELECT campaign_id, created_at, :follow_weight
+        FROM follows
+        WHERE created_at > :since AND created_at <= :until
+        UNION ALL
+        SELECT campaign_id, created_at, :comment_weight
+        FROM comments
+        WHERE created_at > :since AND created_at <= :until
+    ), deltas AS (
+        SELECT campaign_id,
+               :base + LN(SUM(
+                   weight * EXP(GREATEST(
+                       EXTRACT(EPOCH FROM (created_at - :until)) / :tau, -700
+                   ))
+               )) AS score
+        FROM events
+        GROUP BY campaign_id
+        HAVING SUM(weight * EXP(GREATEST(
+            EXTRACT(EPOCH FROM (created_at - :until)) / :tau, -700
+        ))) > 0
+    )
+    UPDATE campaigns c
+    SET trending_score = CASE
+        WHEN c.trending_score IS NULL THEN deltas.score
+        ELSE GREATEST(c.trending_score, deltas.score)
+             + LN(1 + EXP(LEAST(c.trending_score, deltas.score)
+                          - GREATEST(c.trending_score, deltas.score)))
+    END
+    FROM deltas
+    WHERE c.campaign_id = deltas.campaign_id
+    RETURNING c.campaign_id
+    """
+)
+
+
+def _config(name, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return default
+
+
+def _tau_seconds():
+    half_life = _config("TRENDING_HALF_LIFE_HOURS", DEFAULT_HALF_LIFE_HOURS)
+    return half_life * 3600 / math.log(2)
+
+
+def refresh_trending_scores(full=False):
+    until = datetime.utcnow() - timedelta(
+        seconds=_config("TRENDING_SETTLE_SECONDS", DEFAULT_SETTLE_SECONDS)
+    )
+    watermark = db.session.get(AnalyticsWatermarks, WATERMARK_NAME, with_for_update=True)
+    since = datetime.min if full or watermark is None else watermark.refreshed_through
+    if since >= until:
+        return {"refreshed_from": since, "refreshed_through": until, "campaigns": 0}
+
+    weights = {**DEFAULT_WEIGHTS, **_config("TRENDING_WEIGHTS", {})}
+    tau = _tau_seconds()
+    try:
+        if full:
+            db.session.query(Campaigns).update(
+                {"trending_score": None}, synchronize_session=False
+            )
+        updated = db.session.execute(
+            REFRESH_TRENDING_SQL,
+            {
+                "since": since,
+                "until": until,
+                "tau": tau,
+                "base": (until - TRENDING_EPOCH).total_seconds() / tau,
+                "donation_weight": weights["donation"],
+                "percent_of_goal_weight": weights["percent_of_goal"],
+                "follow_weight": weights["follow"],
+                "comment_weight": weights["comment"],
+            },
+        ).all()
+
+        if watermark is None:
+            db.session.add(AnalyticsWatermarks(name=WATERMARK_NAME, refreshed_through=until))
+        else:
+            watermark.refreshed_through = until
+        if updated:
+            invalidate_on_commit(db.session, prefixes={"campaign_list:trending"})
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise RuntimeError(f"Could not refresh trending scores: {str(e)}")
+
+    return {
+        "refreshed_from": None if since == datetime.min else since,
+        "refreshed_through": until,
+        "campaigns": len(updated),
+    }
+
+
+@cached("campaign_list:trending")
+@read_only
+def view_trending_campaigns(category=None, limit=10, projection=True):
+    query = _campaign_list_query(projection).filter(
+        Campaigns.status == CampaignStatus.ACTIVE,
+        Campaigns.trending_score.isnot(None),
+    )
+    if category is not None:
+        try:
+            category = (
+                category
+                if isinstance(category, CampaignCategory)
+                else CampaignCategory(category)
+            )
+        except ValueError:
+            raise ValueError(f"Invalid category: {category}")
+        query = query.filter(Campaigns.category == category)
+
+    rows = (
+        query.order_by(Campaigns.trending_score.desc(), Campaigns.campaign_id.desc())
+        .limit(limit)
+        .all()
+    )
+    serializer = _campaign_row_to_dict if projection else Campaigns.to_dict
+    return [serializer(row) for row in rows]
@@ -1,7 +1,18 @@
-from api import db, bcrypt
+from api import db
+from api.database import read_only
 from api.models.cf_models import Users, UserRole
+from api.serializers import model_serializer
 from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
+from api.helpers.pagination_helper import get_page_size, is_paginated, keyset_paginate
+from api.helpers.cache_helper import cached, invalidate_on_commit
+from api.helpers.batch_helper import batch_get, load_one
+from api.helpers.password_helper import (
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
 
 
 def create_user(username, password, email, role=None, profile_image=None):
@@ -11,7 +22,7 @@ def create_user(username, password, email, role=None, profile_image=None):
         user_args["role"] = role if isinstance(role, UserRole) else UserRole(role)
 
     user = Users(**user_args)
-    user.setPasswordHash(password)
+    user.password_hash = hash_password(password)
 
     db.session.add(user)
     try:
@@ -31,7 +42,7 @@ def change_password(user_id, new_password):
     if not user:
         raise ValueError("User not found")
 
-    user.setPasswordHash(new_password)
+    user.password_hash = hash_password(new_password)
 
     try:
         db.session.commit()
@@ -42,10 +53,24 @@ def change_password(user_id, new_password):
     return {"message": "Password updated successfully", "user_id": user.user_id}
 
 
-def search_users(keyword):
-    users = Users.query.filter(
-        (Users.username.ilike(f"%{keyword}%")) | (Users.email.ilike(f"%{keyword}%"))
-    ).all()
+def search_users(keyword, limit=None):
+    if not keyword or not keyword.strip():
+        raise ValueError("Search keyword cannot be empty")
+
+    keyword = keyword.strip()
+    score = func.greatest(
+        func.similarity(Users.username, keyword), func.similarity(Users.email, keyword)
+    )
+    users = (
+        Users.query.filter(
+            (Users.username.ilike(f"%{keyword}%"))
+            | (Users.email.ilike(f"%{keyword}%"))
+            | (Users.username.op("%")(keyword))
+        )
+        .order_by(score.desc(), Users.user_id)
+        .limit(get_page_size(limit))
+        .all()
+    )
     return [u.to_dict() for u in users]
 
 
@@ -82,17 +107,35 @@ def checkLoginCredentials(identifier, password):
     if not user:
         raise ValueError("Incorrect username/email or password")
 
-    if not user.checkHashedPassword(password):
+    if not verify_password(user.password_hash, password):
         raise ValueError("Incorrect username/email or password")
 
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+
     return user.to_dict()
 
 
-def get_all_users():
+def get_all_users(cursor=None, limit=None, with_total=False):
+    if is_paginated(cursor, limit):
+        return keyset_paginate(
+            Users.query,
+            Users.created_at,
+            Users.user_id,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+
     users = Users.query.all()
     return [u.to_dict() for u in users]
 
 
+@cached("user_by_username")
 def get_user_by_username(username):
     user = Users.query.filter_by(username=username).first()
     if not user:
@@ -107,11 +150,29 @@ def get_user_by_email(email):
     return user.to_dict()
 
 
+@cached("user")
 def view_user(user_id):
-    user = Users.query.get(user_id)
+    # The /users/batch loader holds the public projection, so full profiles
+    # get a loader of their own.
+    user = load_one("users:full", _view_full_users_by_ids, "user_id", user_id)
     if not user:
         raise ValueError("User not found")
-    return user.to_dict()
+    return user
+
+
+_public_user_columns = model_serializer(
+    Users, ("user_id", "username", "profile_image", "created_at")
+)
+
+
+@read_only
+def view_users_by_ids(user_ids):
+    return batch_get(Users, Users.user_id, user_ids, serializer=_public_user_columns)
+
+
+@read_only
+def _view_full_users_by_ids(user_ids):
+    return batch_get(Users, Users.user_id, user_ids)
 
 
 def delete_user(user_id):
@@ -132,6 +193,10 @@ def delete_user(user_id):
 def delete_all_users():
     try:
         deleted = db.session.query(Users).delete()
+        invalidate_on_commit(
+            db.session,
+            prefixes={"user:", "user_by_username:", "campaign:", "campaign_list:"},
+        )
         db.session.commit()
         return {"message": f"Successfully deleted {deleted} users"}
     except Exception as e:
@@ -0,0 +1,262 @@
+import hmac
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import wraps
+
+from flask import Response, current_app, g, has_request_context, jsonify, request
+from flask import request_finished, request_started
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from api.models import cf_models
+
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+DEBUG_HEADER = "X-Debug-Queries"
+MAX_STATEMENT_LENGTH = 300
+LOOPBACK_ADDRESSES = {"127.0.0.1", "::1"}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+
+    def inc(self, name, labels=None, amount=1):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def render(self, extra=(), gauges=()):
+        lines = []
+        seen = set()
+        samples = [(key, value, "counter") for key, value in self.snapshot().items()]
+        samples += [(key, value, "counter") for key, value in extra]
+        samples += [(key, value, "gauge") for key, value in gauges]
+        for (name, labels), value, kind in sorted(samples):
+            if name not in seen:
+                lines.append(f"# TYPE {name} {kind}")
+                seen.add(name)
+            label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _statement_shape(statement):
+    return " ".join(statement.split())[:MAX_STATEMENT_LENGTH]
+
+
+class RequestStats:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest_statement = None
+        self.slowest_time = 0.0
+        self.statements = Counter()
+        self.serialization_time = 0.0
+        self.serialization_depth = 0
+
+    def record_query(self, statement, elapsed):
+        self.query_count += 1
+        self.db_time += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def repeated_statements(self, threshold):
+        return {s: n for s, n in self.statements.items() if n > threshold}
+
+    def summary(self, threshold, response_size=None):
+        return {
+            "query_count": self.query_count,
+            "db_time_ms": round(self.db_time * 1000, 3),
+            "slowest_statement": (
+                _statement_shape(self.slowest_statement)
+                if self.slowest_statement
+                else None
+            ),
+            "slowest_time_ms": round(self.slowest_time * 1000, 3),
+            "n_plus_one": [
+                {"statement": _statement_shape(s), "count": n}
+                for s, n in self.repeated_statements(threshold).items()
+            ],
+            "serialization_time_ms": round(self.serialization_time * 1000, 3),
+            "response_size": response_size,
+        }
+
+
+def _current_stats():
+    if has_request_context():
+        return g.get("_request_stats")
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats() is not None:
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    if stats is None:
+        return
+    starts = conn.info.get("_query_start")
+    if not starts:
+        return
+    stats.record_query(statement, time.perf_counter() - starts.pop())
+
+
+def timed_serialization(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        stats = _current_stats()
+        if stats is None or stats.serialization_depth:
+            return f(*args, **kwargs)
+
+        stats.serialization_depth += 1
+        started = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            stats.serialization_time += time.perf_counter() - started
+            stats.serialization_depth -= 1
+
+    return decorated_function
+
+
+def _instrument_serializers():
+    from api.helpers import campaign_helper
+    from api.helpers.fieldset_helper import Fieldset
+
+    if not hasattr(Fieldset.serialize, "__wrapped__"):
+        Fieldset.serialize = timed_serialization(Fieldset.serialize)
+    if not hasattr(campaign_helper._campaign_row_to_dict, "__wrapped__"):
+        campaign_helper._campaign_row_to_dict = timed_serialization(
+            campaign_helper._campaign_row_to_dict
+        )
+
+
+def _instrument_models():
+    for model in vars(cf_models).values():
+        if (
+            isinstance(model, type)
+            and issubclass(model, cf_models.db.Model)
+            and "to_dict" in vars(model)
+            and not hasattr(model.to_dict, "__wrapped__")
+        ):
+            model.to_dict = timed_serialization(model.to_dict)
+
+
+def _on_request_started(app, **extra):
+    sample_rate = app.config.get("INSTRUMENTATION_SAMPLE_RATE", DEFAULT_SAMPLE_RATE)
+    debug_requested = app.config.get("INSTRUMENTATION_DEBUG_HEADER", False) and (
+        request.headers.get(DEBUG_HEADER)
+    )
+    g._request_debug = bool(debug_requested)
+    if debug_requested or random.random() < sample_rate:
+        g._request_stats = RequestStats()
+
+
+def _on_request_finished(app, response, **extra):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    labels = {"endpoint": endpoint, "method": request.method}
+    metrics.inc(
+        "http_requests_total", {**labels, "status": str(response.status_code)}
+    )
+
+    stats = g.pop("_request_stats", None)
+    if stats is None:
+        return
+
+    threshold = app.config.get(
+        "INSTRUMENTATION_N_PLUS_ONE_THRESHOLD", DEFAULT_N_PLUS_ONE_THRESHOLD
+    )
+    response_size = None if response.is_streamed else response.calculate_content_length()
+    duration = time.perf_counter() - stats.started_at
+
+    metrics.inc("http_sampled_requests_total", labels)
+    metrics.inc("http_request_duration_seconds_total", labels, duration)
+    metrics.inc("db_queries_total", labels, stats.query_count)
+    metrics.inc("db_query_duration_seconds_total", labels, stats.db_time)
+    metrics.inc("serialization_duration_seconds_total", labels, stats.serialization_time)
+    if response_size is not None:
+        metrics.inc("http_response_bytes_total", labels, response_size)
+    if stats.repeated_statements(threshold):
+        metrics.inc("db_n_plus_one_detected_total", labels)
+
+    if g.pop("_request_debug", False):
+        response.headers[DEBUG_HEADER] = json.dumps(
+            stats.summary(threshold, response_size), separators=(",", ":")
+        )
+
+
+def _extra_metrics():
+    from api.database import get_pool_stats, get_replica_health
+    from api.helpers import cache_helper, password_helper
+
+    counters, gauges = [], []
+    for bind, stats in get_pool_stats().items():
+        for name, value in stats.items():
+            gauges.append(((f"db_pool_{name}", (("bind", bind),)), value))
+    for replica, healthy in get_replica_health().items():
+        gauges.append((("db_replica_healthy", (("replica", replica),)), int(healthy)))
+    if cache_helper._cache is not None:
+        counters += [
+            ((f"cache_{name}_total", ()), value)
+            for name, value in cache_helper.get_cache_stats().items()
+        ]
+    if password_helper._hasher is not None:
+        stats = password_helper.get_password_hashing_stats()
+        counters.append((("password_hash_completed_total", ()), stats["completed"]))
+        counters.append((("password_hash_rejected_total", ()), stats["rejected"]))
+        gauges.append((("password_hash_queue_depth", ()), stats["queue_depth"]))
+        gauges.append((("password_hash_max_pending", ()), stats["max_pending"]))
+    return counters, gauges
+
+
+def _metrics_allowed(app):
+    # Without a token only loopback scrapers are served; set one whenever the
+    # app sits behind a proxy that connects from localhost.
+    token = app.config.get("INSTRUMENTATION_METRICS_TOKEN")
+    if token:
+        auth_header = request.headers.get("Authorization", "")
+        return auth_header.startswith("Bearer ") and hmac.compare_digest(
+            auth_header[7:].encode(), token.encode()
+        )
+    return request.remote_addr in LOOPBACK_ADDRESSES
+
+
+def metrics_endpoint():
+    if not _metrics_allowed(current_app):
+        return jsonify({"status": "error", "message": "Forbidden"}), 403
+    return Response(
+        metrics.render(*_extra_metrics()),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+
+def init_instrumentation(app):
+    if not app.config.get("INSTRUMENTATION_ENABLED", True):
+        return
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    _instrument_models()
+    _instrument_serializers()
+    request_started.connect(_on_request_started, app)
+    request_finished.connect(_on_request_finished, app)
+    app.add_url_rule("/metrics", "metrics", metrics_endpoint)
@@ -1,9 +1,12 @@
 from datetime import datetime
 from enum import Enum
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
-db = SQLAlchemy()
+from api.database import db
+from api.helpers.password_helper import hash_password, verify_password
+from api.serializers import model_serializer
 
 
 class DonationStatus(Enum):
@@ -43,6 +46,22 @@ class CampaignPaymentStatus(Enum):
 
 class Users(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        db.Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        db.Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        db.Index("ix_users_created_at_user_id", "created_at", "user_id"),
+        db.Index("ix_users_updated_at", "updated_at"),
+    )
 
     user_id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50), nullable=False, unique=True)
@@ -55,39 +74,83 @@ class Users(db.Model):
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
-    user_comment_likes = db.Table(
-        "user_comment_likes",
-        db.Column(
-            "user_id", db.Integer, db.ForeignKey("users.user_id"), primary_key=True
-        ),
-        db.Column(
-            "comment_id",
-            db.Integer,
-            db.ForeignKey("comments.comment_id"),
-            primary_key=True,
-        ),
+    liked_comments = db.relationship(
+        "Comments",
+        secondary="user_comment_likes",
+        back_populates="liked_by_users",
+        lazy="dynamic",
     )
 
     def setPasswordHash(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def checkHashedPassword(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
     def to_dict(self):
-        return {
-            "user_id": self.user_id,
-            "username": self.username,
-            "email": self.email,
-            "role": self.role.value if self.role else None,
-            "profile_image": self.profile_image,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-        }
+        return _user_columns(self)
+
+
+_user_columns = model_serializer(
+    Users,
+    (
+        "user_id",
+        "username",
+        "email",
+        "role",
+        "profile_image",
+        "created_at",
+        "updated_at",
+    ),
+)
 
 
 class Campaigns(db.Model):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        db.Index("ix_campaigns_search_vector", "search_vector", postgresql_using="gin"),
+        db.Index(
+            "ix_campaigns_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        db.Index("ix_campaigns_created_at_campaign_id", "created_at", "campaign_id"),
+        db.Index("ix_campaigns_updated_at", "updated_at"),
+        db.Index(
+            "ix_campaigns_creator_id_created_at", "creator_id", "created_at", "campaign_id"
+        ),
+        db.Index(
+            "ix_campaigns_category_created_at", "category", "created_at", "campaign_id"
+        ),
+        db.Index(
+            "ix_campaigns_status_created_at", "status", "created_at", "campaign_id"
+        ),
+        db.Index(
+            "ix_campaigns_active_category_created_at",
+            "category",
+            "created_at",
+            "campaign_id",
+            postgresql_where=db.text("status = 'ACTIVE'"),
+        ),
+        db.Index(
+            "ix_campaigns_active_trending_score",
+            db.text("trending_score DESC"),
+            db.text("campaign_id DESC"),
+            postgresql_where=db.text(
+                "status = 'ACTIVE' AND trending_score IS NOT NULL"
+            ),
+        ),
+        db.Index(
+            "ix_campaigns_active_category_trending_score",
+            "category",
+            db.text("trending_score DESC"),
+            db.text("campaign_id DESC"),
+            postgresql_where=db.text(
+                "status = 'ACTIVE' AND trending_score IS NOT NULL"
+            ),
+        ),
+    )
 
     campaign_id = db.Column(db.Integer, primary_key=True)
     creator_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
@@ -96,11 +159,28 @@ class Campaigns(db.Model):
     category = db.Column(db.Enum(CampaignCategory), nullable=False)
     goal_amount = db.Column(db.Numeric(10, 2), nullable=False)
     raised_amount = db.Column(db.Numeric(10, 2), default=0)
+    donor_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    completed_donation_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
     status = db.Column(db.Enum(CampaignStatus), default=CampaignStatus.PENDING)
+    trending_score = db.Column(db.Float)
+    fan_out_on_read = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false()
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    search_vector = deferred(
+        db.Column(
+            TSVECTOR,
+            Computed(
+                "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True,
+            ),
+        )
+    )
 
     creator = db.relationship(
         "Users",
@@ -125,18 +205,7 @@ class Campaigns(db.Model):
 
     def to_dict(self):
         return {
-            "campaign_id": self.campaign_id,
-            "title": self.title,
-            "short_description": self.short_description,
-            "long_description": self.long_description,
-            "category": self.category.value,
-            "goal_amount": float(self.goal_amount),
-            "raised_amount": float(self.raised_amount),
-            "image_url": self.image_url,
-            "start_date": self.start_date,
-            "end_date": self.end_date,
-            "status": self.status.value,
-            "created_at": self.created_at,
+            **_campaign_columns(self),
             "creator": (
                 {
                     "user_id": self.creator.user_id,
@@ -149,8 +218,31 @@ class Campaigns(db.Model):
         }
 
 
+_campaign_columns = model_serializer(
+    Campaigns,
+    (
+        "campaign_id",
+        "title",
+        "description",
+        "category",
+        "goal_amount",
+        "raised_amount",
+        "donor_count",
+        "completed_donation_count",
+        "status",
+        "created_at",
+    ),
+)
+
+
 class Comments(db.Model):
     __tablename__ = "comments"
+    __table_args__ = (
+        db.Index(
+            "ix_comments_campaign_id_created_at", "campaign_id", "created_at", "comment_id"
+        ),
+        db.Index("ix_comments_user_id_created_at", "user_id", "created_at", "comment_id"),
+    )
 
     comment_id = db.Column(db.Integer, primary_key=True)
     campaign_id = db.Column(
@@ -160,21 +252,24 @@ class Comments(db.Model):
     content = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     likes = db.Column(db.Integer, default=0)
+    sharded_likes = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false()
+    )
 
     user = db.relationship(
         "Users", backref=db.backref("comments", lazy=True, cascade="all, delete-orphan")
     )
 
     liked_by_users = db.relationship(
-        "Users", secondary="user_comment_likes", back_populates="liked_comments"
+        "Users",
+        secondary="user_comment_likes",
+        back_populates="liked_comments",
+        lazy="dynamic",
     )
 
     def to_dict(self):
         return {
-            "comment_id": self.comment_id,
-            "content": self.content,
-            "likes": self.likes,
-            "created_at": self.created_at,
+            **_comment_columns(self),
             "user": (
                 {
                     "user_id": self.user.user_id,
@@ -192,8 +287,21 @@ class Comments(db.Model):
         }
 
 
+_comment_columns = model_serializer(
+    Comments, ("comment_id", "content", "likes", "created_at")
+)
+
+
 class Payments(db.Model):
     __tablename__ = "payments"
+    __table_args__ = (
+        db.Index("ix_payments_donation_id", "donation_id"),
+        db.Index("ix_payments_payment_status", "payment_status"),
+        db.Index(
+            "ix_payments_transaction_date_payment_id", "transaction_date", "payment_id"
+        ),
+        db.Index("ix_payments_payment_method_lower", db.text("lower(payment_method)")),
+    )
 
     payment_id = db.Column(db.Integer, primary_key=True)
     donation_id = db.Column(
@@ -202,6 +310,7 @@ class Payments(db.Model):
     amount = db.Column(db.Numeric(8, 2), nullable=False)
     payment_method = db.Column(db.String(50), nullable=False)
     payment_status = db.Column(db.Enum(CampaignPaymentStatus), nullable=False)
+    transaction_ref = db.Column(db.String(100), unique=True)
     transaction_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     donation = db.relationship(
@@ -211,21 +320,17 @@ class Payments(db.Model):
 
     def to_dict(self):
         return {
-            "payment_id": self.payment_id,
-            "amount": float(self.amount),
-            "payment_method": self.payment_method,
-            "payment_status": self.payment_status.value,
-            "transaction_date": self.transaction_date,
+            **_payment_columns(self),
             "donation": (
                 {
                     "donation_id": self.donation.donation_id,
                     "amount": float(self.donation.amount),
                     "donor": (
                         {
-                            "user_id": self.donation.donor.user_id,
-                            "username": self.donation.donor.username,
+                            "user_id": self.donation.user.user_id,
+                            "username": self.donation.user.username,
                         }
-                        if self.donation and self.donation.donor
+                        if self.donation and self.donation.user
                         else None
                     ),
                     "campaign": (
@@ -243,8 +348,44 @@ class Payments(db.Model):
         }
 
 
+_payment_columns = model_serializer(
+    Payments,
+    (
+        "payment_id",
+        "amount",
+        "payment_method",
+        "payment_status",
+        "transaction_ref",
+        "transaction_date",
+    ),
+)
+
+
 class Donations(db.Model):
     __tablename__ = "donations"
+    __table_args__ = (
+        db.Index(
+            "ix_donations_campaign_id_created_at",
+            "campaign_id",
+            "created_at",
+            "donation_id",
+        ),
+        db.Index(
+            "ix_donations_user_id_created_at", "user_id", "created_at", "donation_id"
+        ),
+        db.Index(
+            "ix_donations_completed_campaign_id_user_id",
+            "campaign_id",
+            "user_id",
+            postgresql_where=db.text("status = 'COMPLETED'"),
+        ),
+        db.Index("ix_donations_updated_at", "updated_at"),
+        db.Index(
+            "ix_donations_completed_at",
+            "completed_at",
+            postgresql_where=db.text("status = 'COMPLETED'"),
+        ),
+    )
 
     donation_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
@@ -253,6 +394,10 @@ class Donations(db.Model):
     )
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    completed_at = db.Column(db.DateTime, nullable=True)
     status = db.Column(db.Enum(DonationStatus), default=DonationStatus.PENDING)
     user = db.relationship(
         "Users",
@@ -261,18 +406,14 @@ class Donations(db.Model):
 
     def to_dict(self):
         return {
-            "donation_id": self.donation_id,
-            "amount": float(self.amount),
-            "donation_date": self.donation_date,
-            "message": self.message,
-            "status": self.status.value,
+            **_donation_columns(self),
             "donor": (
                 {
-                    "user_id": self.donor.user_id,
-                    "username": self.donor.username,
-                    "profile_image": self.donor.profile_image,
+                    "user_id": self.user.user_id,
+                    "username": self.user.username,
+                    "profile_image": self.user.profile_image,
                 }
-                if self.donor
+                if self.user
                 else None
             ),
             "campaign": (
@@ -283,8 +424,20 @@ class Donations(db.Model):
         }
 
 
+_donation_columns = model_serializer(
+    Donations, ("donation_id", "amount", ("donation_date", "created_at"), "status")
+)
+
+
 class Follows(db.Model):
     __tablename__ = "follows"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "campaign_id", name="uq_follows_user_id_campaign_id"),
+        db.Index(
+            "ix_follows_campaign_id_created_at", "campaign_id", "created_at", "follow_id"
+        ),
+        db.Index("ix_follows_created_at_follow_id", "created_at", "follow_id"),
+    )
 
     follow_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.user_id"), nullable=False)
@@ -299,8 +452,7 @@ class Follows(db.Model):
 
     def to_dict(self):
         return {
-            "follow_id": self.follow_id,
-            "followed_at": self.followed_at,
+            **_follow_columns(self),
             "user": (
                 {
                     "user_id": self.user.user_id,
@@ -318,8 +470,26 @@ class Follows(db.Model):
         }
 
 
+_follow_columns = model_serializer(
+    Follows, ("follow_id", ("followed_at", "created_at"))
+)
+
+
 class CampaignUpdates(db.Model):
     __tablename__ = "campaign_updates"
+    __table_args__ = (
+        db.Index(
+            "ix_campaign_updates_campaign_id_created_at",
+            "campaign_id",
+            "created_at",
+            "update_id",
+        ),
+        db.Index(
+            "ix_campaign_updates_pending_fan_out",
+            "update_id",
+            postgresql_where=db.text("NOT fanned_out"),
+        ),
+    )
 
     update_id = db.Column(db.Integer, primary_key=True)
     campaign_id = db.Column(
@@ -327,6 +497,9 @@ class CampaignUpdates(db.Model):
     )
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    fanned_out = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false()
+    )
 
     def to_dict(self):
         return {
@@ -389,4 +562,135 @@ user_comment_likes = db.Table(
     db.Column(
         "comment_id", db.Integer, db.ForeignKey("comments.comment_id"), primary_key=True
     ),
+    db.Index("ix_user_comment_likes_comment_id", "comment_id"),
+)
+
+
+class CommentLikeShards(db.Model):
+    __tablename__ = "comment_like_shards"
+
+    comment_id = db.Column(
+        db.Integer,
+        db.ForeignKey("comments.comment_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    shard = db.Column(db.SmallInteger, primary_key=True)
+    likes = db.Column(db.Integer, nullable=False, default=0)
+
+
+class CampaignDailyStats(db.Model):
+    __tablename__ = "campaign_daily_stats"
+
+    campaign_id = db.Column(
+        db.Integer,
+        db.ForeignKey("campaigns.campaign_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = db.Column(db.Date, primary_key=True)
+    donation_count = db.Column(db.Integer, nullable=False, default=0)
+    completed_donation_count = db.Column(db.Integer, nullable=False, default=0)
+    donation_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    new_followers = db.Column(db.Integer, nullable=False, default=0)
+    new_comments = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return _daily_stats_columns(self)
+
+
+_daily_stats_columns = model_serializer(
+    CampaignDailyStats,
+    (
+        "campaign_id",
+        "day",
+        "donation_count",
+        "completed_donation_count",
+        "donation_amount",
+        "new_followers",
+        "new_comments",
+    ),
 )
+
+
+class DonorCampaignTotals(db.Model):
+    __tablename__ = "donor_campaign_totals"
+    __table_args__ = (
+        db.Index("ix_donor_campaign_totals_total_amount", "total_amount"),
+        db.Index(
+            "ix_donor_campaign_totals_campaign_id_total_amount",
+            "campaign_id",
+            "total_amount",
+        ),
+    )
+
+    campaign_id = db.Column(
+        db.Integer,
+        db.ForeignKey("campaigns.campaign_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    total_amount = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    donation_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AnalyticsWatermarks(db.Model):
+    __tablename__ = "analytics_watermarks"
+
+    name = db.Column(db.String(50), primary_key=True)
+    refreshed_through = db.Column(db.DateTime, nullable=False)
+
+
+class PaymentDailyTotals(db.Model):
+    __tablename__ = "payment_daily_totals"
+
+    day = db.Column(db.Date, primary_key=True)
+    payment_method = db.Column(db.String(50), primary_key=True)
+    payment_status = db.Column(db.Enum(CampaignPaymentStatus), primary_key=True)
+    payment_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+
+class IdempotencyKeys(db.Model):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (db.Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    scope = db.Column(db.String(50), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    response = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+
+class Notifications(db.Model):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id", "update_id", name="uq_notifications_user_id_update_id"
+        ),
+        db.Index(
+            "ix_notifications_user_id_created_at",
+            "user_id",
+            "created_at",
+            "update_id",
+        ),
+    )
+
+    notification_id = db.Column(db.BigInteger, primary_key=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
+    )
+    campaign_id = db.Column(
+        db.Integer,
+        db.ForeignKey("campaigns.campaign_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    update_id = db.Column(
+        db.Integer,
+        db.ForeignKey("campaign_updates.update_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    is_read = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,126 @@
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter
+
+import orjson
+from flask import make_response, request
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy import Float, Numeric, inspect
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+
+def _to_float(value):
+    return float(value)
+
+
+def _enum_value(value):
+    return value.value
+
+
+def _converter(column):
+    column_type = column.type
+    if isinstance(column_type, Numeric) and not isinstance(column_type, Float):
+        return _to_float
+    if isinstance(column_type, SAEnum) and column_type.enum_class is not None:
+        return _enum_value
+    return None
+
+
+def _compile(model, fields):
+    mapper = inspect(model)
+    steps = []
+    for field in fields:
+        name, attr = field if isinstance(field, tuple) else (field, field)
+        column = mapper.attrs[attr].columns[0]
+        steps.append((name, attrgetter(attr), _converter(column)))
+    return tuple(steps)
+
+
+def compile_serializer(model, fields):
+    steps = None
+
+    def serialize(obj):
+        nonlocal steps
+        if steps is None:
+            steps = _compile(model, fields)
+        out = {}
+        for name, getter, convert in steps:
+            value = getter(obj)
+            out[name] = value if convert is None or value is None else convert(value)
+        return out
+
+    return serialize
+
+
+_default_fields = {}
+
+
+def model_serializer(model, fields):
+    _default_fields[model] = tuple(fields)
+    return compile_serializer(model, fields)
+
+
+def default_fields(model):
+    return _default_fields[model]
+
+
+def parse_fields(fields):
+    if not fields:
+        return None
+    tree = {}
+    for path in fields.split(","):
+        node = tree
+        for part in path.strip().split("."):
+            if part:
+                node = node.setdefault(part, {})
+    return tree or None
+
+
+def select_fields(value, tree):
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [select_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: select_fields(value[key], subtree)
+            for key, subtree in tree.items()
+            if key in value
+        }
+    return value
+
+
+def _select_payload(data, tree):
+    if not isinstance(data, dict) or "data" not in data:
+        return data
+    payload = data["data"]
+    if isinstance(payload, dict) and "items" in payload:
+        payload = {**payload, "items": select_fields(payload["items"], tree)}
+    else:
+        payload = select_fields(payload, tree)
+    return {**data, "data": payload}
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(data):
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+def output_orjson(data, code, headers=None):
+    tree = parse_fields(request.args.get("fields"))
+    if tree:
+        data = _select_payload(data, tree)
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    response.mimetype = "application/json"
+    return response
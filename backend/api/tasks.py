@@ -0,0 +1,67 @@
+from celery import shared_task
+from sqlalchemy.exc import OperationalError
+
+RETRY_OPTIONS = {
+    "autoretry_for": (RuntimeError, OperationalError),
+    "retry_backoff": True,
+    "retry_backoff_max": 600,
+    "retry_jitter": True,
+    "max_retries": 5,
+}
+
+
+@shared_task(name="api.tasks.notify_campaign_followers", **RETRY_OPTIONS)
+def notify_campaign_followers(update_id):
+    from api.helpers.notification_helper import fan_out_campaign_update
+
+    return fan_out_campaign_update(update_id)
+
+
+@shared_task(name="api.tasks.retry_fan_outs", **RETRY_OPTIONS)
+def retry_fan_outs():
+    from api.helpers.notification_helper import retry_pending_fan_outs
+
+    return retry_pending_fan_outs()
+
+
+@shared_task(name="api.tasks.refresh_analytics", **RETRY_OPTIONS)
+def refresh_analytics(full=False):
+    from api.helpers.campaign_analytics_helper import refresh_campaign_analytics
+
+    report = refresh_campaign_analytics(full=full)
+    return {key: str(value) for key, value in report.items()}
+
+
+@shared_task(name="api.tasks.refresh_trending", **RETRY_OPTIONS)
+def refresh_trending(full=False):
+    from api.helpers.trending_helper import refresh_trending_scores
+
+    report = refresh_trending_scores(full=full)
+    return {key: str(value) for key, value in report.items()}
+
+
+@shared_task(name="api.tasks.reconcile_payments", **RETRY_OPTIONS)
+def reconcile_payments():
+    from api.helpers.campaign_counter_helper import reconcile_campaign_counters
+    from api.helpers.payment_helper import close_payment_days
+
+    counters = reconcile_campaign_counters(dry_run=False)
+    closed = close_payment_days()
+    return {
+        "counters": counters,
+        "payments": {key: str(value) for key, value in closed.items()},
+    }
+
+
+@shared_task(name="api.tasks.fold_like_shards", **RETRY_OPTIONS)
+def fold_like_shards():
+    from api.helpers.comment_helper import fold_all_like_shards
+
+    return fold_all_like_shards()
+
+
+@shared_task(name="api.tasks.purge_idempotency_keys", **RETRY_OPTIONS)
+def purge_idempotency_keys(batch_size=1000):
+    from api.helpers.idempotency_helper import purge_expired_idempotency_keys
+
+    return purge_expired_idempotency_keys(batch_size)
@@ -0,0 +1,5 @@
+from asgiref.wsgi import WsgiToAsgi
+
+from api import app
+
+asgi_app = WsgiToAsgi(app)
@@ -0,0 +1,130 @@
+"""Sync helpers on a thread pool versus the async read helpers under concurrency.
+
+    python -m benchmarks.async_reads --concurrency 64 --requests 2000
+
+Runs the same four reads (campaign detail, active list, follower count and
+comment page) both ways at equal concurrency and reports throughput and
+latency percentiles. The sync path is limited by the SQLAlchemy pool
+(DB_POOL_SIZE + DB_MAX_OVERFLOW) and one thread per in-flight request; the
+async path multiplexes every request over the asyncpg pool on one loop.
+
+This measures the helper layer only, not the served endpoints. No HTTP
+request is made, so neither asgi.py (WsgiToAsgi) nor the Flask async views
+in api/blueprints/async_reads.py are exercised, and routing, JSON rendering
+and the WSGI/ASGI adapters are left out of both sides. Under asgi.py Flask
+still runs each async view on a worker thread via async_to_sync, so treat
+the async numbers as an upper bound for /async, not as its throughput.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import app, db, report, reset_schema, seed, summarize
+from api.async_db import dispose_async_db, init_async_db, run_on_db_loop
+from api.helpers.async_read_helper import (
+    count_followers_async,
+    view_all_active_campaigns_async,
+    view_all_comments_by_campaign_async,
+    view_campaign_by_campaign_id_async,
+)
+from api.helpers.campaign_helper import (
+    view_all_active_campaigns,
+    view_campaign_by_campaign_id,
+)
+from api.helpers.comment_helper import view_all_comments_by_campaign
+from api.helpers.follow_helper import count_followers
+
+PAGE = 20
+
+
+def sync_reads(campaign_id):
+    return {
+        "campaign detail": lambda: view_campaign_by_campaign_id(campaign_id),
+        "active campaigns": lambda: view_all_active_campaigns(projection=True, limit=PAGE),
+        "follower count": lambda: count_followers(campaign_id),
+        "comment page": lambda: view_all_comments_by_campaign(campaign_id, limit=PAGE),
+    }
+
+
+def async_reads(campaign_id):
+    return {
+        "campaign detail": (view_campaign_by_campaign_id_async, campaign_id),
+        "active campaigns": (view_all_active_campaigns_async, PAGE),
+        "follower count": (count_followers_async, campaign_id),
+        "comment page": (view_all_comments_by_campaign_async, campaign_id, PAGE),
+    }
+
+
+def run_sync(read, concurrency, requests):
+    def one(_):
+        with app.app_context():
+            start = time.perf_counter()
+            read()
+            elapsed = time.perf_counter() - start
+            db.session.remove()
+            return elapsed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(requests)))
+    return summarize(latencies), requests / (time.perf_counter() - started)
+
+
+async def _run_async(call, concurrency, requests):
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            start = time.perf_counter()
+            await run_on_db_loop(*call)
+            return time.perf_counter() - start
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(latencies), requests / (time.perf_counter() - started)
+
+
+def run_async(call, concurrency, requests):
+    with app.app_context():
+        return asyncio.run(_run_async(call, concurrency, requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse existing rows")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if not args.skip_seed:
+            reset_schema()
+            seed(users=args.users, campaigns=args.campaigns, follows_per_campaign=5)
+    init_async_db(app)
+
+    campaign_id = args.campaigns // 2
+    rows, throughput = [], []
+    try:
+        sync_calls, async_calls = sync_reads(campaign_id), async_reads(campaign_id)
+        for name in sync_calls:
+            stats, rate = run_sync(sync_calls[name], args.concurrency, args.requests)
+            rows.append((f"sync  {name}", stats))
+            throughput.append((f"sync  {name}", rate))
+            stats, rate = run_async(async_calls[name], args.concurrency, args.requests)
+            rows.append((f"async {name}", stats))
+            throughput.append((f"async {name}", rate))
+    finally:
+        dispose_async_db()
+
+    print(f"concurrency={args.concurrency} requests={args.requests} per read")
+    report(rows)
+    for label, rate in throughput:
+        print(f"{label}: {rate:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# Shared setup for the scripts in this package. Run them from backend/, e.g.
+#   BENCHMARK_DATABASE_URL=postgresql+psycopg2://localhost/cf_bench \
+#       python -m benchmarks.search --rows 1000000
+# Benchmarks that seed data drop and recreate every table in that database,
+# so never point BENCHMARK_DATABASE_URL at anything but a scratch database.
+
+import os
+import statistics
+import sys
+import time
+
+BENCHMARK_DATABASE_URL = os.environ.get("BENCHMARK_DATABASE_URL")
+
+os.environ["DATABASE_URL"] = BENCHMARK_DATABASE_URL or "sqlite://"
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark-secret-key-of-at-least-32-bytes")
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "1")
+
+from api import app, db  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+app.config.update(CACHE_ENABLED=False, INSTRUMENTATION_ENABLED=False)
+
+WORDS = (
+    "water", "school", "clinic", "forest", "shelter", "books", "solar", "river",
+    "garden", "library", "surgery", "rescue", "village", "ocean", "teachers",
+    "vaccines", "wildlife", "bridge", "meals", "scholarship",
+)
+
+
+def require_database():
+    if not BENCHMARK_DATABASE_URL:
+        sys.exit("BENCHMARK_DATABASE_URL must point at a scratch PostgreSQL database")
+
+
+def has_trigram():
+    with db.engine.connect() as connection:
+        return bool(
+            connection.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).scalar()
+        )
+
+
+def reset_schema():
+    """Recreate every table; trigram indexes are skipped if pg_trgm is missing."""
+    require_database()
+    db.drop_all()
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception:
+        print("pg_trgm is not available; trigram indexes are skipped", file=sys.stderr)
+        for table in db.metadata.tables.values():
+            for index in list(table.indexes):
+                ops = index.dialect_options["postgresql"].get("ops") or {}
+                if "gin_trgm_ops" in ops.values():
+                    table.indexes.discard(index)
+    db.create_all()
+
+
+def seed(users, campaigns, donations_per_campaign=0, follows_per_campaign=0):
+    """Bulk-load synthetic rows with set-based INSERT ... SELECT statements."""
+    words = "ARRAY[" + ", ".join(f"'{w}'" for w in WORDS) + "]"
+    statements = [
+        f"""
+        INSERT INTO users (username, email, password_hash, role, created_at)
+        SELECT 'user' || n, 'user' || n || '@example.com', 'x',
+               (ARRAY['DONOR', 'CREATOR', 'ADMIN'])[1 + n % 3]::userrole,
+               now() - n * interval '1 minute'
+        FROM generate_series(1, {users}) AS n
+        """,
+        f"""
+        INSERT INTO campaigns (creator_id, title, description, category,
+                               goal_amount, raised_amount, status, created_at)
+        SELECT 1 + (n * 7919) % {users},
+               initcap(w[1 + n % 20]) || ' for ' || w[1 + (n / 20) % 20] || ' ' || n,
+               'Help fund ' || w[1 + (n / 7) % 20] || ' and ' || w[1 + (n / 3) % 20]
+                   || ' in region ' || n % 500,
+               (ARRAY['EDUCATION', 'HEALTHCARE', 'ENVIRONMENT', 'ANIMALS', 'OTHER'])
+                   [1 + n % 5]::campaigncategory,
+               1000 + n % 50000, 0,
+               (ARRAY['ACTIVE', 'ACTIVE', 'ACTIVE', 'COMPLETED', 'PENDING', 'REJECTED'])
+                   [1 + n % 6]::campaignstatus,
+               now() - n * interval '10 seconds'
+        FROM generate_series(1, {campaigns}) AS n, (SELECT {words} AS w) AS vocab
+        """,
+    ]
+    if donations_per_campaign:
+        statements.append(
+            f"""
+            INSERT INTO donations (user_id, campaign_id, amount, status, created_at)
+            SELECT 1 + (c * 31 + d * 17) % {users}, c, 5 + (c + d) % 200,
+                   (ARRAY['PENDING', 'COMPLETED', 'COMPLETED', 'REFUNDED', 'CANCELLED'])
+                       [1 + (c + d) % 5]::donationstatus,
+                   now() - (c + d) * interval '1 minute'
+            FROM generate_series(1, {campaigns}) AS c,
+                 generate_series(1, {donations_per_campaign}) AS d
+            """
+        )
+        statements.append(
+            "UPDATE donations SET updated_at = created_at, completed_at = CASE"
+            " WHEN status = 'COMPLETED' THEN created_at END"
+        )
+        statements.append(
+            """
+            INSERT INTO payments (donation_id, amount, payment_method,
+                                  payment_status, transaction_date)
+            SELECT donation_id, amount,
+                   CASE WHEN donation_id % 50 = 0 THEN 'paypal' ELSE 'card' END,
+                   (CASE donation_id % 100
+                        WHEN 0 THEN 'FAILED'
+                        WHEN 1 THEN 'REFUNDED'
+                        WHEN 2 THEN 'PENDING'
+                        ELSE 'SUCCESSFUL'
+                    END)::campaignpaymentstatus,
+                   created_at
+            FROM donations
+            """
+        )
+    if follows_per_campaign:
+        statements.append(
+            f"""
+            INSERT INTO follows (user_id, campaign_id, created_at)
+            SELECT DISTINCT 1 + (c * 13 + f * 101) % {users}, c, now()
+            FROM generate_series(1, {campaigns}) AS c,
+                 generate_series(1, {follows_per_campaign}) AS f
+            """
+        )
+        statements.append(
+            """
+            INSERT INTO comments (user_id, campaign_id, content, created_at)
+            SELECT user_id, campaign_id, 'Good luck!', created_at FROM follows
+            """
+        )
+
+    with db.engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+        connection.execute(text("ANALYZE"))
+
+
+def measure(fn, repeat=20, warmup=2):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        "n": len(samples),
+        "min_ms": min(samples) * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def report(rows):
+    """Print ``(label, stats)`` pairs as an aligned table."""
+    width = max(len(label) for label, _ in rows)
+    print(f"{'':{width}}  {'n':>6} {'min ms':>10} {'median ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for label, stats in rows:
+        print(
+            f"{label:{width}}  {stats['n']:>6} {stats['min_ms']:>10.3f} "
+            f"{stats['median_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['p99_ms']:>10.3f}"
+        )
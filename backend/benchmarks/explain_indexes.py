@@ -0,0 +1,209 @@
+"""Fail if any helper query plans a sequential scan over a seeded table.
+
+    python -m benchmarks.explain_indexes --campaigns 100000
+
+Every SELECT a helper emits is captured with its bound parameters and re-run
+under EXPLAIN (ANALYZE, BUFFERS). List helpers are called with a page size,
+as the endpoints call them: an unpaged list that returns a large share of a
+table is allowed to scan it.
+"""
+
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+
+from sqlalchemy import event, text
+
+from benchmarks.common import app, db, reset_schema, seed
+from api.helpers.campaign_helper import (
+    view_all_active_campaigns,
+    view_all_campaigns,
+    view_all_campaigns_by_creator,
+    view_all_campaigns_paginated,
+    view_all_completed_campaigns,
+    view_campaign_by_campaign_id,
+    view_campaigns_by_category,
+)
+from api.helpers.comment_helper import (
+    view_all_comments_by_campaign,
+    view_all_comments_by_user,
+)
+from api.helpers.donation_helper import (
+    view_all_donations_by_campaign,
+    view_all_donations_by_user,
+)
+from api.helpers.follow_helper import (
+    count_followed_campaigns,
+    count_followers,
+    is_user_following,
+    view_all_followed_campaigns_by_user,
+    view_all_followers_by_campaign,
+)
+from api.helpers.payment_helper import (
+    filter_payments_by_method,
+    filter_payments_by_status,
+    view_all_payments,
+    view_all_payments_by_donation,
+)
+from api.helpers.user_helper import get_all_users, get_user_by_email
+
+SEEDED_TABLES = {"users", "campaigns", "donations", "payments", "follows", "comments"}
+PAGE = 20
+
+
+def helper_calls(user_id, campaign_id, donation_id):
+    return [
+        ("view_campaign_by_campaign_id", lambda: view_campaign_by_campaign_id(campaign_id)),
+        ("view_all_campaigns", lambda: view_all_campaigns(limit=PAGE)),
+        ("view_all_active_campaigns", lambda: view_all_active_campaigns(limit=PAGE)),
+        ("view_all_completed_campaigns", lambda: view_all_completed_campaigns(limit=PAGE)),
+        (
+            "view_campaigns_by_category",
+            lambda: view_campaigns_by_category("education", limit=PAGE),
+        ),
+        (
+            "view_all_campaigns_by_creator",
+            lambda: view_all_campaigns_by_creator(user_id, limit=PAGE),
+        ),
+        (
+            "view_all_campaigns_paginated",
+            lambda: view_all_campaigns_paginated(category="animals", status="active"),
+        ),
+        (
+            "view_all_donations_by_user",
+            lambda: view_all_donations_by_user(user_id, limit=PAGE),
+        ),
+        (
+            "view_all_donations_by_campaign",
+            lambda: view_all_donations_by_campaign(campaign_id, limit=PAGE),
+        ),
+        (
+            "view_all_followed_campaigns_by_user",
+            lambda: view_all_followed_campaigns_by_user(user_id, limit=PAGE),
+        ),
+        (
+            "view_all_followers_by_campaign",
+            lambda: view_all_followers_by_campaign(campaign_id),
+        ),
+        ("is_user_following", lambda: is_user_following(user_id, campaign_id)),
+        ("count_followers", lambda: count_followers(campaign_id)),
+        ("count_followed_campaigns", lambda: count_followed_campaigns(user_id)),
+        (
+            "view_all_comments_by_campaign",
+            lambda: view_all_comments_by_campaign(campaign_id, limit=PAGE),
+        ),
+        (
+            "view_all_comments_by_user",
+            lambda: view_all_comments_by_user(user_id, limit=PAGE),
+        ),
+        ("view_all_payments", lambda: view_all_payments(limit=PAGE)),
+        (
+            "view_all_payments_by_donation",
+            lambda: view_all_payments_by_donation(donation_id),
+        ),
+        ("filter_payments_by_status", lambda: filter_payments_by_status("refunded")),
+        ("filter_payments_by_method", lambda: filter_payments_by_method("PayPal")),
+        ("get_all_users", lambda: get_all_users(limit=PAGE)),
+        ("get_user_by_email", lambda: get_user_by_email(f"user{user_id}@example.com")),
+    ]
+
+
+@contextmanager
+def captured_selects():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append(cursor.mogrify(statement, parameters).decode())
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def explain(statement):
+    plan = db.session.execute(
+        text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement.replace(":", r"\:"))
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--donations-per-campaign", type=int, default=10)
+    parser.add_argument("--follows-per-campaign", type=int, default=5)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse existing rows")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    failures = []
+    with app.app_context():
+        if not args.skip_seed:
+            reset_schema()
+            seed(
+                users=args.users,
+                campaigns=args.campaigns,
+                donations_per_campaign=args.donations_per_campaign,
+                follows_per_campaign=args.follows_per_campaign,
+            )
+
+        user_id = db.session.execute(
+            text("SELECT user_id FROM follows ORDER BY follow_id LIMIT 1")
+        ).scalar()
+        campaign_id = args.campaigns // 2
+        donation_id = db.session.execute(
+            text("SELECT max(donation_id) / 2 FROM donations")
+        ).scalar()
+
+        for name, call in helper_calls(user_id, campaign_id, donation_id):
+            with captured_selects() as statements:
+                try:
+                    call()
+                except ValueError:
+                    pass
+            db.session.rollback()
+
+            elapsed, scanned = 0.0, set()
+            for statement in statements:
+                result = explain(statement)
+                plan = result["Plan"]
+                scans = {
+                    node["Relation Name"]
+                    for node in _plan_nodes(plan)
+                    if node["Node Type"] == "Seq Scan"
+                    and node.get("Relation Name") in SEEDED_TABLES
+                }
+                elapsed += result["Execution Time"]
+                scanned |= scans
+                if args.verbose:
+                    print(statement)
+                    print(json.dumps(plan, indent=2))
+                if scans:
+                    failures.append((name, sorted(scans), statement))
+
+            status = "SEQ SCAN " + ", ".join(sorted(scanned)) if scanned else "ok"
+            print(f"{name:40} {len(statements):>5} queries {elapsed:>10.3f} ms  {status}")
+            db.session.rollback()
+
+    if failures:
+        print(f"\n{len(failures)} helper queries fall back to sequential scans:")
+        for name, scans, statement in failures:
+            print(f"- {name} ({', '.join(scans)}): {statement}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
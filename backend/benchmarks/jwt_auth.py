@@ -0,0 +1,123 @@
+"""Per-request overhead of the auth decorators, before and after claim caching.
+
+    python -m benchmarks.jwt_auth --iterations 20000
+
+Each iteration pushes a fresh request context, as a real request would, and
+calls a no-op view through the decorators. The "legacy" decorators reproduce
+the previous implementation: a flask_login probe and a full HS256 decode in
+every decorator.
+"""
+
+import argparse
+import time
+from functools import wraps
+
+import jwt
+from flask import current_app, jsonify, request
+
+from benchmarks.common import app
+from api.helpers.security_helper import (
+    admin_required,
+    clear_token_cache,
+    generate_jwt,
+    jwt_required,
+)
+
+
+def _legacy_claims():
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    token = auth_header.split(" ")[1]
+    try:
+        return jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    except jwt.InvalidTokenError:
+        return None
+
+
+def legacy_jwt_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        payload = _legacy_claims()
+        if payload is None:
+            return jsonify({"status": "error", "message": "Invalid token"}), 401
+        return f(user_id=payload["user_id"], *args, **kwargs)
+
+    return decorated_function
+
+
+def legacy_admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            from flask_login import current_user
+
+            if getattr(current_user, "is_authenticated", False):
+                return f(*args, **kwargs)
+        except Exception:
+            pass
+
+        payload = _legacy_claims()
+        if payload is None:
+            return jsonify({"status": "error", "message": "Invalid token"}), 401
+        if payload.get("role") != "admin":
+            return jsonify({"status": "error", "message": "Admins only"}), 403
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def view(*args, **kwargs):
+    return None
+
+
+def per_call_us(fn, headers, iterations, before=None):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if before:
+            before()
+        with app.test_request_context(headers=headers):
+            fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with app.app_context():
+        token = generate_jwt(1, "admin")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    cases = [
+        ("legacy jwt_required", legacy_jwt_required(view), None),
+        (
+            "legacy jwt_required + admin_required",
+            legacy_jwt_required(legacy_admin_required(view)),
+            None,
+        ),
+        ("jwt_required (cached token)", jwt_required(view), None),
+        (
+            "jwt_required + admin_required (cached token)",
+            jwt_required(admin_required(view)),
+            None,
+        ),
+        (
+            "jwt_required + admin_required (cold cache)",
+            jwt_required(admin_required(view)),
+            clear_token_cache,
+        ),
+    ]
+
+    baseline = per_call_us(view, headers, args.iterations)
+    width = max(len(label) for label, _, _ in cases)
+    print(f"request context baseline: {baseline:.2f} us/request")
+    print(f"{'':{width}}  {'us/request':>10}  {'overhead us':>11}")
+    for label, fn, before in cases:
+        elapsed = per_call_us(fn, headers, args.iterations, before)
+        print(f"{label:{width}}  {elapsed:>10.2f}  {elapsed - baseline:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Login latency under concurrency, with hashing inline versus in the worker pool.
+
+    python -m benchmarks.login_load --concurrency 32 --logins 400
+
+Runs a burst of concurrent logins while one thread keeps issuing a cheap
+primary-key read, and reports p50/p99 for both. The "inline" mode verifies
+passwords in the request thread the way checkLoginCredentials used to; the
+"pool" mode goes through checkLoginCredentials and the bounded hashing pool.
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash
+
+from benchmarks.common import app, db, report, reset_schema, summarize
+from api.helpers.password_helper import get_password_hasher, hash_password
+from api.helpers.user_helper import checkLoginCredentials, view_user
+from api.models.cf_models import UserRole, Users
+
+PASSWORD = "correct horse battery staple"
+
+
+def inline_login(identifier, password):
+    user = Users.query.filter(
+        (Users.username == identifier) | (Users.email == identifier)
+    ).first()
+    if not user or not check_password_hash(user.password_hash, password):
+        raise ValueError("Incorrect username/email or password")
+    return user.to_dict()
+
+
+def seed_users(count):
+    password_hash = hash_password(PASSWORD)
+    db.session.add_all(
+        Users(
+            username=f"login{n}",
+            email=f"login{n}@example.com",
+            password_hash=password_hash,
+            role=UserRole.DONOR,
+        )
+        for n in range(count)
+    )
+    db.session.commit()
+    return [u.user_id for u in Users.query.order_by(Users.user_id)]
+
+
+def run(login, users, concurrency, logins):
+    latencies, read_latencies = [], []
+    done = threading.Event()
+
+    def one_login(n):
+        with app.app_context():
+            start = time.perf_counter()
+            try:
+                login(f"login{n % users}", PASSWORD)
+            except RuntimeError:
+                pass
+            latencies.append(time.perf_counter() - start)
+            db.session.remove()
+
+    def reader():
+        with app.app_context():
+            while not done.is_set():
+                start = time.perf_counter()
+                view_user(1)
+                read_latencies.append(time.perf_counter() - start)
+                db.session.remove()
+
+    read_thread = threading.Thread(target=reader)
+    read_thread.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_login, range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    read_thread.join()
+    return summarize(latencies), summarize(read_latencies), logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--method", help="override PASSWORD_HASH_METHOD")
+    args = parser.parse_args()
+
+    if args.method:
+        app.config["PASSWORD_HASH_METHOD"] = args.method
+
+    with app.app_context():
+        reset_schema()
+        seed_users(args.users)
+        hasher = get_password_hasher()
+
+    rows = []
+    for mode, login in (("inline", inline_login), ("pool", checkLoginCredentials)):
+        logins, reads, throughput = run(login, args.users, args.concurrency, args.logins)
+        rows.append((f"{mode} login", logins))
+        rows.append((f"{mode} concurrent read", reads))
+        print(f"{mode}: {throughput:.1f} logins/s")
+
+    print(
+        f"method={hasher.method} workers={hasher.workers} "
+        f"concurrency={args.concurrency} stats={hasher.stats()}"
+    )
+    report(rows)
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
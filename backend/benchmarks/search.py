@@ -0,0 +1,98 @@
+"""Full-text campaign search and trigram user search against the old ILIKE scans.
+
+    python -m benchmarks.search --rows 1000000
+"""
+
+import argparse
+
+from benchmarks.common import (
+    WORDS,
+    app,
+    db,
+    has_trigram,
+    measure,
+    report,
+    reset_schema,
+    seed,
+)
+from api.helpers.pagination_helper import get_page_size
+from api.helpers.search_helper import search_campaigns
+from api.helpers.user_helper import search_users
+from api.models.cf_models import Campaigns, Users
+
+
+def ilike_campaign_search(keyword):
+    pattern = f"%{keyword}%"
+    return (
+        Campaigns.query.filter(
+            Campaigns.title.ilike(pattern) | Campaigns.description.ilike(pattern)
+        )
+        .order_by(Campaigns.created_at.desc(), Campaigns.campaign_id.desc())
+        .limit(get_page_size(None))
+        .all()
+    )
+
+
+def ilike_user_search(keyword):
+    pattern = f"%{keyword}%"
+    return (
+        Users.query.filter(Users.username.ilike(pattern) | Users.email.ilike(pattern))
+        .limit(get_page_size(None))
+        .all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="campaigns to seed")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse existing rows")
+    args = parser.parse_args()
+
+    with app.app_context():
+        if not args.skip_seed:
+            reset_schema()
+            seed(users=args.users, campaigns=args.rows)
+
+        # A common word, a rare phrase and a term with no matches: LIMIT lets the
+        # ILIKE scan stop early only when matches are dense.
+        keywords = (WORDS[0], WORDS[5], "region 417", "zebra")
+        rows = []
+        for keyword in keywords:
+            rows.append(
+                (
+                    f"campaigns ILIKE    {keyword!r}",
+                    measure(lambda: ilike_campaign_search(keyword), args.repeat),
+                )
+            )
+            rows.append(
+                (
+                    f"campaigns tsvector {keyword!r}",
+                    measure(lambda: search_campaigns(keyword), args.repeat),
+                )
+            )
+            db.session.remove()
+
+        for keyword in ("user4242", "example"):
+            rows.append(
+                (
+                    f"users ILIKE        {keyword!r}",
+                    measure(lambda: ilike_user_search(keyword), args.repeat),
+                )
+            )
+            if has_trigram():
+                rows.append(
+                    (
+                        f"users trigram      {keyword!r}",
+                        measure(lambda: search_users(keyword), args.repeat),
+                    )
+                )
+            db.session.remove()
+
+    print(f"{args.rows} campaigns, {args.users} users")
+    report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Serialization cost of a large campaign list response.
+
+    python -m benchmarks.serialization --rows 10000
+
+Builds transient Campaigns with creators (no database needed) and times the
+full path from model instances to response bytes: the previous hand-written
+to_dict + jsonify, the compiled to_dict with jsonify and with the orjson
+renderer, and a ?fields= selection through the compiled Fieldset.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import jsonify
+
+from benchmarks.common import app, measure, report
+from api.helpers.fieldset_helper import Fieldset
+from api.models.cf_models import (
+    CampaignCategory,
+    Campaigns,
+    CampaignStatus,
+    UserRole,
+    Users,
+)
+from api.serializers import output_orjson, parse_fields
+
+
+def legacy_to_dict(campaign):
+    return {
+        "campaign_id": campaign.campaign_id,
+        "title": campaign.title,
+        "description": campaign.description,
+        "category": campaign.category.value,
+        "goal_amount": float(campaign.goal_amount),
+        "raised_amount": float(campaign.raised_amount or 0),
+        "donor_count": campaign.donor_count,
+        "completed_donation_count": campaign.completed_donation_count,
+        "status": campaign.status.value,
+        "created_at": campaign.created_at,
+        "creator": (
+            {
+                "user_id": campaign.creator.user_id,
+                "username": campaign.creator.username,
+                "profile_image": campaign.creator.profile_image,
+            }
+            if campaign.creator
+            else None
+        ),
+    }
+
+
+def build_campaigns(rows):
+    categories, statuses = list(CampaignCategory), list(CampaignStatus)
+    creators = [
+        Users(user_id=n, username=f"user{n}", role=UserRole.CREATOR, profile_image=None)
+        for n in range(1, 101)
+    ]
+    start = datetime(2026, 1, 1)
+    return [
+        Campaigns(
+            campaign_id=n,
+            title=f"Clean water for village {n}",
+            description="Help fund wells and filters for remote villages. " * 3,
+            category=categories[n % len(categories)],
+            goal_amount=Decimal("5000.00") + n,
+            raised_amount=Decimal("1234.56"),
+            donor_count=n % 97,
+            completed_donation_count=n % 131,
+            status=statuses[n % len(statuses)],
+            created_at=start + timedelta(minutes=n),
+            creator=creators[n % len(creators)],
+        )
+        for n in range(1, rows + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    campaigns = build_campaigns(args.rows)
+    fieldset = Fieldset(Campaigns, parse_fields("campaign_id,title,raised_amount"))
+
+    def envelope(serializer):
+        return {"status": "success", "data": [serializer(c) for c in campaigns]}
+
+    cases = [
+        (
+            "legacy to_dict + jsonify",
+            lambda: jsonify(envelope(legacy_to_dict)).get_data(),
+        ),
+        (
+            "compiled to_dict + jsonify",
+            lambda: jsonify(envelope(Campaigns.to_dict)).get_data(),
+        ),
+        (
+            "compiled to_dict + orjson",
+            lambda: output_orjson(envelope(Campaigns.to_dict), 200).get_data(),
+        ),
+        (
+            "fields=campaign_id,title,raised_amount + orjson",
+            lambda: output_orjson(envelope(fieldset.serialize), 200).get_data(),
+        ),
+    ]
+
+    with app.test_request_context():
+        rows = [(label, measure(fn, args.repeat, warmup=1)) for label, fn in cases]
+        size = {label: len(fn()) for label, fn in cases}
+
+    print(f"{args.rows} campaigns per response")
+    report(rows)
+    for label, nbytes in size.items():
+        print(f"{label}: {nbytes / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
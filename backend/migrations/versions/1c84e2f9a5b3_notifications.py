@@ -0,0 +1,51 @@
+"""notifications
+
+Revision ID: 1c84e2f9a5b3
+Revises: 0a6d93b5c7e1
+Create Date: 2026-10-18 17:22:37.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c84e2f9a5b3'
+down_revision = '0a6d93b5c7e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notifications',
+    sa.Column('notification_id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('update_id', sa.Integer(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.campaign_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['update_id'], ['campaign_updates.update_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('notification_id'),
+    sa.UniqueConstraint('user_id', 'update_id', name='uq_notifications_user_id_update_id')
+    )
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_id_created_at', ['user_id', 'created_at', 'notification_id'], unique=False)
+
+    # Updates written before notifications existed have nothing to fan out.
+    with op.batch_alter_table('campaign_updates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fanned_out', sa.Boolean(), server_default=sa.true(), nullable=False))
+        batch_op.alter_column('fanned_out', server_default=sa.false())
+        batch_op.create_index('ix_campaign_updates_pending_fan_out', ['update_id'], unique=False, postgresql_where=sa.text('NOT fanned_out'))
+
+
+def downgrade():
+    with op.batch_alter_table('campaign_updates', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaign_updates_pending_fan_out', postgresql_where=sa.text('NOT fanned_out'))
+        batch_op.drop_column('fanned_out')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_created_at')
+
+    op.drop_table('notifications')
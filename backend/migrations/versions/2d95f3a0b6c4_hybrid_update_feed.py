@@ -0,0 +1,40 @@
+"""hybrid update feed
+
+Revision ID: 2d95f3a0b6c4
+Revises: 1c84e2f9a5b3
+Create Date: 2026-10-18 18:03:52.731640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d95f3a0b6c4'
+down_revision = '1c84e2f9a5b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('fan_out_on_read', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    with op.batch_alter_table('campaign_updates', schema=None) as batch_op:
+        batch_op.create_index('ix_campaign_updates_campaign_id_created_at', ['campaign_id', 'created_at', 'update_id'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_created_at')
+        batch_op.create_index('ix_notifications_user_id_created_at', ['user_id', 'created_at', 'update_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_created_at')
+        batch_op.create_index('ix_notifications_user_id_created_at', ['user_id', 'created_at', 'notification_id'], unique=False)
+
+    with op.batch_alter_table('campaign_updates', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaign_updates_campaign_id_created_at')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_column('fan_out_on_read')
@@ -0,0 +1,40 @@
+"""campaign trending scores
+
+Revision ID: 3e0a7b6c2d18
+Revises: 2d95f3a0b6c4
+Create Date: 2026-10-18 18:47:15.284903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e0a7b6c2d18'
+down_revision = '2d95f3a0b6c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('trending_score', sa.Float(), nullable=True))
+        batch_op.create_index('ix_campaigns_active_trending_score', [sa.text('trending_score DESC'), sa.text('campaign_id DESC')], unique=False, postgresql_where=sa.text("status = 'ACTIVE' AND trending_score IS NOT NULL"))
+        batch_op.create_index('ix_campaigns_active_category_trending_score', ['category', sa.text('trending_score DESC'), sa.text('campaign_id DESC')], unique=False, postgresql_where=sa.text("status = 'ACTIVE' AND trending_score IS NOT NULL"))
+
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE donations SET completed_at = created_at WHERE status = 'COMPLETED'")
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.create_index('ix_donations_completed_at', ['completed_at'], unique=False, postgresql_where=sa.text("status = 'COMPLETED'"))
+
+
+def downgrade():
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.drop_index('ix_donations_completed_at')
+        batch_op.drop_column('completed_at')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaigns_active_category_trending_score')
+        batch_op.drop_index('ix_campaigns_active_trending_score')
+        batch_op.drop_column('trending_score')
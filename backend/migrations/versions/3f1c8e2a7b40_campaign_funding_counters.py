@@ -0,0 +1,48 @@
+"""campaign funding counters
+
+Revision ID: 3f1c8e2a7b40
+Revises: 9b721a2ac24c
+Create Date: 2026-10-18 10:02:11.204318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c8e2a7b40'
+down_revision = '9b721a2ac24c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('donor_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('completed_donation_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute("UPDATE campaigns SET raised_amount = 0")
+    op.execute(
+        """
+        UPDATE campaigns AS c
+        SET raised_amount = t.raised_amount,
+            donor_count = t.donor_count,
+            completed_donation_count = t.completed_donation_count
+        FROM (
+            SELECT campaign_id,
+                   SUM(amount) AS raised_amount,
+                   COUNT(DISTINCT user_id) AS donor_count,
+                   COUNT(*) AS completed_donation_count
+            FROM donations
+            WHERE status = 'COMPLETED'
+            GROUP BY campaign_id
+        ) AS t
+        WHERE c.campaign_id = t.campaign_id
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_column('completed_donation_count')
+        batch_op.drop_column('donor_count')
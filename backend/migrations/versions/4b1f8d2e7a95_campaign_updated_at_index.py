@@ -0,0 +1,31 @@
+"""campaign and user updated_at indexes
+
+Revision ID: 4b1f8d2e7a95
+Revises: 3e0a7b6c2d18
+Create Date: 2026-10-18 20:11:46.390572
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1f8d2e7a95'
+down_revision = '3e0a7b6c2d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.create_index('ix_campaigns_updated_at', ['updated_at'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_updated_at')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaigns_updated_at')
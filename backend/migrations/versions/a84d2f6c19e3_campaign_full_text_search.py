@@ -0,0 +1,41 @@
+"""campaign full text search
+
+Revision ID: a84d2f6c19e3
+Revises: 3f1c8e2a7b40
+Create Date: 2026-10-18 11:24:37.918452
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a84d2f6c19e3'
+down_revision = '3f1c8e2a7b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True), nullable=True))
+        batch_op.create_index('ix_campaigns_search_vector', ['search_vector'], unique=False, postgresql_using='gin')
+        batch_op.create_index('ix_campaigns_title_trgm', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_username_trgm', ['username'], unique=False, postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+        batch_op.create_index('ix_users_email_trgm', ['email'], unique=False, postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_email_trgm', postgresql_using='gin')
+        batch_op.drop_index('ix_users_username_trgm', postgresql_using='gin')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaigns_title_trgm', postgresql_using='gin')
+        batch_op.drop_index('ix_campaigns_search_vector', postgresql_using='gin')
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,89 @@
+"""secondary indexes for helper queries
+
+Revision ID: c5e07b93d21f
+Revises: a84d2f6c19e3
+Create Date: 2026-10-18 12:41:05.377120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e07b93d21f'
+down_revision = 'a84d2f6c19e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_at_user_id', ['created_at', 'user_id'], unique=False)
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.create_index('ix_campaigns_created_at_campaign_id', ['created_at', 'campaign_id'], unique=False)
+        batch_op.create_index('ix_campaigns_creator_id_created_at', ['creator_id', 'created_at', 'campaign_id'], unique=False)
+        batch_op.create_index('ix_campaigns_category_created_at', ['category', 'created_at', 'campaign_id'], unique=False)
+        batch_op.create_index('ix_campaigns_status_created_at', ['status', 'created_at', 'campaign_id'], unique=False)
+        batch_op.create_index('ix_campaigns_active_category_created_at', ['category', 'created_at', 'campaign_id'], unique=False, postgresql_where=sa.text("status = 'ACTIVE'"))
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.create_index('ix_comments_campaign_id_created_at', ['campaign_id', 'created_at', 'comment_id'], unique=False)
+        batch_op.create_index('ix_comments_user_id_created_at', ['user_id', 'created_at', 'comment_id'], unique=False)
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_donation_id', ['donation_id'], unique=False)
+        batch_op.create_index('ix_payments_payment_status', ['payment_status'], unique=False)
+        batch_op.create_index('ix_payments_transaction_date_payment_id', ['transaction_date', 'payment_id'], unique=False)
+        batch_op.create_index('ix_payments_payment_method_lower', [sa.text('lower(payment_method)')], unique=False)
+
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.create_index('ix_donations_campaign_id_created_at', ['campaign_id', 'created_at', 'donation_id'], unique=False)
+        batch_op.create_index('ix_donations_user_id_created_at', ['user_id', 'created_at', 'donation_id'], unique=False)
+        batch_op.create_index('ix_donations_completed_campaign_id_user_id', ['campaign_id', 'user_id'], unique=False, postgresql_where=sa.text("status = 'COMPLETED'"))
+
+    op.execute(
+        """
+        DELETE FROM follows f
+        USING follows dup
+        WHERE f.user_id = dup.user_id
+          AND f.campaign_id = dup.campaign_id
+          AND f.follow_id > dup.follow_id
+        """
+    )
+    with op.batch_alter_table('follows', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_follows_user_id_campaign_id', ['user_id', 'campaign_id'])
+        batch_op.create_index('ix_follows_campaign_id_created_at', ['campaign_id', 'created_at', 'follow_id'], unique=False)
+        batch_op.create_index('ix_follows_created_at_follow_id', ['created_at', 'follow_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('follows', schema=None) as batch_op:
+        batch_op.drop_index('ix_follows_created_at_follow_id')
+        batch_op.drop_index('ix_follows_campaign_id_created_at')
+        batch_op.drop_constraint('uq_follows_user_id_campaign_id', type_='unique')
+
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.drop_index('ix_donations_completed_campaign_id_user_id')
+        batch_op.drop_index('ix_donations_user_id_created_at')
+        batch_op.drop_index('ix_donations_campaign_id_created_at')
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_payment_method_lower')
+        batch_op.drop_index('ix_payments_transaction_date_payment_id')
+        batch_op.drop_index('ix_payments_payment_status')
+        batch_op.drop_index('ix_payments_donation_id')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_user_id_created_at')
+        batch_op.drop_index('ix_comments_campaign_id_created_at')
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaigns_active_category_created_at')
+        batch_op.drop_index('ix_campaigns_status_created_at')
+        batch_op.drop_index('ix_campaigns_category_created_at')
+        batch_op.drop_index('ix_campaigns_creator_id_created_at')
+        batch_op.drop_index('ix_campaigns_created_at_campaign_id')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_created_at_user_id')
@@ -0,0 +1,42 @@
+"""comment like shards
+
+Revision ID: d19a4c7e5b82
+Revises: c5e07b93d21f
+Create Date: 2026-10-18 13:58:22.640917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd19a4c7e5b82'
+down_revision = 'c5e07b93d21f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sharded_likes', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    op.create_table('comment_like_shards',
+    sa.Column('comment_id', sa.Integer(), nullable=False),
+    sa.Column('shard', sa.SmallInteger(), nullable=False),
+    sa.Column('likes', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['comment_id'], ['comments.comment_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('comment_id', 'shard')
+    )
+
+    with op.batch_alter_table('user_comment_likes', schema=None) as batch_op:
+        batch_op.create_index('ix_user_comment_likes_comment_id', ['comment_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_comment_likes', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_comment_likes_comment_id')
+
+    op.drop_table('comment_like_shards')
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_column('sharded_likes')
@@ -0,0 +1,68 @@
+"""campaign analytics rollups
+
+Revision ID: e2b6f0a9c734
+Revises: d19a4c7e5b82
+Create Date: 2026-10-18 15:12:48.503361
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f0a9c734'
+down_revision = 'd19a4c7e5b82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('campaign_daily_stats',
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('donation_count', sa.Integer(), nullable=False),
+    sa.Column('completed_donation_count', sa.Integer(), nullable=False),
+    sa.Column('donation_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('new_followers', sa.Integer(), nullable=False),
+    sa.Column('new_comments', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.campaign_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('campaign_id', 'day')
+    )
+    op.create_table('donor_campaign_totals',
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('donation_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.campaign_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('campaign_id', 'user_id')
+    )
+    with op.batch_alter_table('donor_campaign_totals', schema=None) as batch_op:
+        batch_op.create_index('ix_donor_campaign_totals_total_amount', ['total_amount'], unique=False)
+        batch_op.create_index('ix_donor_campaign_totals_campaign_id_total_amount', ['campaign_id', 'total_amount'], unique=False)
+
+    op.create_table('analytics_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('refreshed_through', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE donations SET updated_at = created_at")
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.create_index('ix_donations_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('donations', schema=None) as batch_op:
+        batch_op.drop_index('ix_donations_updated_at')
+        batch_op.drop_column('updated_at')
+
+    op.drop_table('analytics_watermarks')
+    with op.batch_alter_table('donor_campaign_totals', schema=None) as batch_op:
+        batch_op.drop_index('ix_donor_campaign_totals_campaign_id_total_amount')
+        batch_op.drop_index('ix_donor_campaign_totals_total_amount')
+
+    op.drop_table('donor_campaign_totals')
+    op.drop_table('campaign_daily_stats')
@@ -0,0 +1,32 @@
+"""payment daily totals
+
+Revision ID: f3a7c1d84e26
+Revises: e2b6f0a9c734
+Create Date: 2026-10-18 16:04:21.118902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c1d84e26'
+down_revision = 'e2b6f0a9c734'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payment_daily_totals',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('payment_method', sa.String(length=50), nullable=False),
+    sa.Column('payment_status', postgresql.ENUM('PENDING', 'SUCCESSFUL', 'FAILED', 'REFUNDED', name='campaignpaymentstatus', create_type=False), nullable=False),
+    sa.Column('payment_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'payment_method', 'payment_status')
+    )
+
+
+def downgrade():
+    op.drop_table('payment_daily_totals')
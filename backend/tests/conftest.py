@@ -0,0 +1,163 @@
+# Runs against a throwaway PostgreSQL database, e.g.
+#   TEST_DATABASE_URL=postgresql+psycopg2://postgres@localhost/cf_test pytest
+# Every table is created on start and truncated after each test.
+
+import os
+from contextlib import contextmanager
+from decimal import Decimal
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "sqlite://"
+os.environ.setdefault("FLASK_SECRET_KEY", "test-secret")
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "1")
+
+from api import app as flask_app  # noqa: E402
+from api import db  # noqa: E402
+from api.models.cf_models import (  # noqa: E402
+    CampaignCategory,
+    Campaigns,
+    CampaignStatus,
+    Donations,
+    DonationStatus,
+    UserRole,
+    Users,
+)
+from sqlalchemy import event, text  # noqa: E402
+
+
+def _drop_trigram_indexes():
+    for table in db.metadata.tables.values():
+        for index in list(table.indexes):
+            ops = index.dialect_options["postgresql"].get("ops") or {}
+            if "gin_trgm_ops" in ops.values():
+                table.indexes.discard(index)
+
+
+@pytest.fixture(scope="session")
+def app():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    flask_app.config.update(
+        TESTING=True,
+        CACHE_ENABLED=False,
+        INSTRUMENTATION_ENABLED=False,
+        PASSWORD_HASH_METHOD="pbkdf2:sha256:1000",
+        PASSWORD_HASH_WORKERS=1,
+    )
+    with flask_app.app_context():
+        with db.engine.begin() as connection:
+            try:
+                with connection.begin_nested():
+                    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            except Exception:
+                _drop_trigram_indexes()
+        db.drop_all()
+        db.create_all()
+    yield flask_app
+    with flask_app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def app_context(app):
+    with app.app_context():
+        yield
+        db.session.rollback()
+        tables = ", ".join(t.name for t in db.metadata.sorted_tables)
+        db.session.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+        db.session.commit()
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app, app_context):
+    return app.test_client()
+
+
+@contextmanager
+def _counting(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries(app_context):
+    return lambda: _counting(db.engine)
+
+
+@pytest.fixture
+def make_user(app_context):
+    counter = iter(range(1, 1_000_000))
+
+    def factory(role=UserRole.DONOR, **kwargs):
+        n = next(counter)
+        user = Users(
+            username=kwargs.pop("username", f"user{n}"),
+            email=kwargs.pop("email", f"user{n}@example.com"),
+            password_hash="x",
+            role=role,
+            **kwargs,
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return factory
+
+
+@pytest.fixture
+def make_campaign(app_context, make_user):
+    def factory(creator=None, **kwargs):
+        campaign = Campaigns(
+            creator_id=(creator or make_user(role=UserRole.CREATOR)).user_id,
+            title=kwargs.pop("title", "Clean water"),
+            description=kwargs.pop("description", "Wells for villages"),
+            category=kwargs.pop("category", CampaignCategory.HEALTHCARE),
+            goal_amount=kwargs.pop("goal_amount", Decimal("1000.00")),
+            status=kwargs.pop("status", CampaignStatus.ACTIVE),
+            **kwargs,
+        )
+        db.session.add(campaign)
+        db.session.commit()
+        return campaign
+
+    return factory
+
+
+@pytest.fixture
+def make_donation(app_context):
+    def factory(user, campaign, amount="50.00", status=DonationStatus.PENDING):
+        donation = Donations(
+            user_id=user.user_id,
+            campaign_id=campaign.campaign_id,
+            amount=Decimal(amount),
+            status=status,
+        )
+        db.session.add(donation)
+        db.session.commit()
+        return donation
+
+    return factory
+
+
+@pytest.fixture
+def auth_header(app_context):
+    from api.helpers.security_helper import generate_jwt
+
+    def factory(user):
+        return {"Authorization": f"Bearer {generate_jwt(user.user_id, user.role.value)}"}
+
+    return factory
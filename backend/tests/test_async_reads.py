@@ -0,0 +1,53 @@
+import pytest
+from flask import Flask
+
+from api.async_db import dispose_async_db, init_async_db
+from api.blueprints.async_reads import async_reads_bp
+
+
+@pytest.fixture(scope="module")
+def async_client(app):
+    async_app = Flask(__name__)
+    async_app.config["ASYNC_DATABASE_URI"] = app.config["SQLALCHEMY_DATABASE_URI"]
+    async_app.register_blueprint(async_reads_bp)
+    init_async_db(async_app)
+    yield async_app.test_client()
+    dispose_async_db()
+
+
+def test_campaign_uses_shared_envelope_and_iso_dates(async_client, make_campaign):
+    campaign = make_campaign()
+    response = async_client.get(f"/async/campaigns/{campaign.campaign_id}")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "success"
+    assert body["data"]["campaign_id"] == campaign.campaign_id
+    assert body["data"]["created_at"].startswith(
+        campaign.created_at.strftime("%Y-%m-%dT%H:%M:%S")
+    )
+
+
+def test_missing_campaign_is_404(async_client, app_context):
+    response = async_client.get("/async/campaigns/999999")
+    assert response.status_code == 404
+    assert response.get_json()["status"] == "error"
+
+
+def test_bad_limit_is_400(async_client, app_context):
+    response = async_client.get("/async/campaigns/active?limit=abc")
+    assert response.status_code == 400
+    assert response.get_json() == {"status": "error", "message": "Invalid page size: abc"}
+
+
+def test_active_campaigns_and_follower_count(async_client, make_campaign):
+    campaign = make_campaign()
+    active = async_client.get("/async/campaigns/active?limit=5").get_json()
+    assert [c["campaign_id"] for c in active["data"]] == [campaign.campaign_id]
+
+    count = async_client.get(
+        f"/async/campaigns/{campaign.campaign_id}/followers/count"
+    ).get_json()
+    assert count == {
+        "status": "success",
+        "data": {"campaign_id": campaign.campaign_id, "follower_count": 0},
+    }
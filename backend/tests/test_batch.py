@@ -0,0 +1,64 @@
+from flask import g
+
+from api import db
+from api.helpers.batch_helper import get_loader
+from api.helpers.campaign_helper import view_campaign_by_campaign_id, view_campaigns_by_ids
+from api.models.cf_models import UserRole
+
+
+def _get(client, path, headers):
+    # The test client shares the fixture's app context, so drop the claims
+    # and loaders cached on g by the previous request.
+    g.pop("jwt_claims", None)
+    g.pop("batch_loaders", None)
+    return client.get(path, headers=headers).get_json()["data"]
+
+
+def test_user_batch_is_public_projection(client, auth_header, make_user):
+    viewer, other = make_user(), make_user()
+    data = _get(client, f"/users/batch?ids={other.user_id}", auth_header(viewer))
+    [user] = data["items"]
+    assert user["user_id"] == other.user_id
+    assert set(user) == {"user_id", "username", "profile_image", "created_at"}
+
+
+def test_donation_batch_is_scoped_to_caller(
+    client, auth_header, make_user, make_campaign, make_donation
+):
+    alice, bob = make_user(), make_user()
+    admin = make_user(role=UserRole.ADMIN)
+    campaign = make_campaign()
+    mine = make_donation(alice, campaign).donation_id
+    theirs = make_donation(bob, campaign).donation_id
+    path = f"/donations/batch?ids={mine},{theirs}"
+
+    data = _get(client, path, auth_header(alice))
+    assert [d["donation_id"] for d in data["items"]] == [mine]
+    assert data["missing"] == [theirs]
+
+    data = _get(client, path, auth_header(admin))
+    assert [d["donation_id"] for d in data["items"]] == [mine, theirs]
+
+
+def test_single_lookups_share_the_request_loader(app, make_campaign, count_queries):
+    first, second = make_campaign().campaign_id, make_campaign().campaign_id
+    g.pop("batch_loaders", None)
+
+    with app.test_request_context(), count_queries() as statements:
+        get_loader("campaigns", view_campaigns_by_ids, "campaign_id").want([first, second])
+        assert view_campaign_by_campaign_id(first)["campaign_id"] == first
+        assert view_campaign_by_campaign_id(second)["campaign_id"] == second
+        assert view_campaign_by_campaign_id(first)["campaign_id"] == first
+    assert len(statements) == 1
+
+
+def test_commit_resets_the_request_loader(app, make_campaign, count_queries):
+    campaign = make_campaign()
+    g.pop("batch_loaders", None)
+
+    with app.test_request_context(), count_queries() as statements:
+        view_campaign_by_campaign_id(campaign.campaign_id)
+        campaign.title = "Renamed"
+        db.session.commit()
+        assert view_campaign_by_campaign_id(campaign.campaign_id)["title"] == "Renamed"
+    assert len([s for s in statements if "batch_ids" in s]) == 2
@@ -0,0 +1,94 @@
+import json
+from decimal import Decimal
+
+from api import db
+from api.helpers.bulk_import_helper import import_donations
+from api.helpers.campaign_counter_helper import find_counter_drift
+from api.models.cf_models import Campaigns, DonationStatus, Payments
+
+HEADER = "transaction_ref,user_id,campaign_id,amount,payment_method,payment_status\n"
+
+
+def test_import_settlements_updates_campaign_totals(
+    app, make_user, make_campaign, make_donation, tmp_path
+):
+    alice, bob = make_user(), make_user()
+    campaign = make_campaign()
+    make_donation(alice, campaign, amount="10.00", status=DonationStatus.COMPLETED)
+    db.session.execute(
+        Campaigns.__table__.update().values(
+            raised_amount=10, donor_count=1, completed_donation_count=1
+        )
+    )
+    db.session.commit()
+
+    settlement = tmp_path / "settlement.csv"
+    settlement.write_text(
+        HEADER
+        + f"ref-1,{alice.user_id},{campaign.campaign_id},25.00,card,successful\n"
+        + f"ref-2,{bob.user_id},{campaign.campaign_id},40.50,card,successful\n"
+        + f"ref-3,{bob.user_id},{campaign.campaign_id},5.00,card,pending\n"
+        + f"ref-4,{bob.user_id},999999,5.00,card,successful\n"
+    )
+
+    result = app.test_cli_runner().invoke(args=["import-settlements", str(settlement)])
+    assert result.exit_code == 0, result.output
+    totals = json.loads(result.stdout.strip().splitlines()[-1])
+    assert totals == {"rows": 4, "imported": 3, "errors": 1}
+
+    db.session.expire_all()
+    campaign = db.session.get(Campaigns, campaign.campaign_id)
+    assert campaign.raised_amount == Decimal("75.50")
+    assert campaign.donor_count == 2
+    assert campaign.completed_donation_count == 3
+    assert Payments.query.count() == 3
+    assert find_counter_drift() == []
+
+
+def test_import_donations_caps_reported_errors(make_user):
+    user = make_user()
+    records = [
+        {
+            "transaction_ref": f"ref-{n}",
+            "user_id": user.user_id,
+            "campaign_id": 999999,
+            "amount": "1.00",
+            "payment_method": "card",
+        }
+        for n in range(25)
+    ]
+
+    summary = import_donations(records, batch_size=10, max_errors=5)
+    assert summary["failed"] == 25
+    assert len(summary["errors"]) == 5
+    assert summary["errors_truncated"] is True
+
+
+def test_oversized_amount_is_a_row_error(make_user, make_campaign, count_queries):
+    user = make_user()
+    first, second = make_campaign(), make_campaign()
+    records = [
+        {
+            "transaction_ref": f"ref-{n}",
+            "user_id": user.user_id,
+            "campaign_id": campaign.campaign_id,
+            "amount": amount,
+            "payment_method": "card",
+        }
+        for n, (campaign, amount) in enumerate(
+            [(second, "999999.99"), (first, "1000000.00"), (first, "NaN"), (first, "5.00")]
+        )
+    ]
+
+    with count_queries() as statements:
+        summary = import_donations(records)
+
+    assert (summary["imported"], summary["failed"]) == (2, 2)
+    assert [e["row"] for e in summary["errors"]] == [1, 2]
+    assert "cannot exceed 999999.99" in summary["errors"][0]["error"]
+
+    [lock] = [s for s in statements if "FOR UPDATE" in s]
+    assert "ORDER BY campaigns.campaign_id" in lock
+    donor_check = next(s for s in statements if "DISTINCT donations.campaign_id" in s)
+    assert statements.index(lock) < statements.index(donor_check)
+    assert find_counter_drift() == []
@@ -0,0 +1,126 @@
+import pytest
+
+from api import db
+from api.database import read_only
+from api.helpers import cache_helper
+from api.helpers.cache_helper import LRUCache, RedisCache, cached, make_key
+from api.helpers.campaign_helper import view_campaign_by_campaign_id
+
+
+class DictRedis:
+    """The handful of redis-py commands RedisCache uses, backed by dicts."""
+
+    def __init__(self):
+        self.data = {}
+        self.hashes = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def hmget(self, name, fields):
+        values = self.hashes.get(name, {})
+        return [values.get(field) for field in fields]
+
+    def hincrby(self, name, field, amount=1):
+        values = self.hashes.setdefault(name, {})
+        values[field] = str(int(values.get(field, 0)) + amount).encode()
+        return int(values[field])
+
+    def scan_iter(self, *args, **kwargs):
+        raise AssertionError("RedisCache must not scan the keyspace")
+
+
+@pytest.fixture
+def redis_cache():
+    return RedisCache(DictRedis())
+
+
+def test_redis_delete_prefix_bumps_generation(redis_cache):
+    redis_cache.set("campaign_list:all:limit=20", ["a"])
+    redis_cache.set("campaign_list:trending:limit=5", ["b"])
+    redis_cache.set("campaign:1", {"campaign_id": 1})
+
+    redis_cache.delete_prefix("campaign_list:trending")
+    assert redis_cache.get("campaign_list:trending:limit=5") is None
+    assert redis_cache.get("campaign_list:all:limit=20") == ["a"]
+
+    redis_cache.delete_prefix("campaign_list:")
+    assert redis_cache.get("campaign_list:all:limit=20") is None
+    assert redis_cache.get("campaign:1") == {"campaign_id": 1}
+
+    redis_cache.set("campaign_list:all:limit=20", ["c"])
+    assert redis_cache.get("campaign_list:all:limit=20") == ["c"]
+
+
+def test_redis_delete_and_clear(redis_cache):
+    redis_cache.set("campaign:1", 1)
+    redis_cache.set("campaign:2", 2)
+    redis_cache.delete("campaign:1")
+    assert redis_cache.get("campaign:1") is None
+    assert redis_cache.get("campaign:2") == 2
+
+    redis_cache.clear()
+    assert redis_cache.get("campaign:2") is None
+
+
+@pytest.fixture
+def fake_replica(app_context, monkeypatch):
+    replica = object()
+    monkeypatch.setattr("api.database._replica_engines", lambda db: [replica])
+    monkeypatch.setattr("api.database.replica_router.choose", lambda engines: engines[0])
+    return replica
+
+
+@pytest.fixture
+def enabled_cache(app, monkeypatch):
+    monkeypatch.setitem(app.config, "CACHE_ENABLED", True)
+    previous = cache_helper._cache
+    cache_helper.set_cache(LRUCache())
+    yield cache_helper.get_cache()
+    cache_helper.set_cache(previous)
+
+
+def test_cache_miss_fills_from_primary(fake_replica, enabled_cache):
+    binds = []
+
+    @cached("test_bind")
+    @read_only
+    def lookup(n):
+        binds.append(db.session.get_bind())
+        return n
+
+    @read_only
+    def uncached_lookup():
+        return db.session.get_bind()
+
+    assert lookup(1) == 1
+    assert lookup(1) == 1
+    assert binds == [db.engine]
+    assert enabled_cache.get(make_key("test_bind", 1)) == 1
+    assert uncached_lookup() is fake_replica
+
+
+def test_keyword_calls_share_the_invalidated_key(enabled_cache, make_campaign):
+    calls = []
+
+    @cached("test_kwargs")
+    def lookup(n, projection=False):
+        calls.append(n)
+        return n
+
+    assert lookup(1) == lookup(n=1) == lookup(1, projection=False) == 1
+    assert calls == [1]
+    assert enabled_cache.get(make_key("test_kwargs", 1, False)) == 1
+
+    campaign = make_campaign(title="Before")
+    assert view_campaign_by_campaign_id(campaign_id=campaign.campaign_id)["title"] == "Before"
+    campaign.title = "After"
+    db.session.commit()
+    assert view_campaign_by_campaign_id(campaign_id=campaign.campaign_id)["title"] == "After"
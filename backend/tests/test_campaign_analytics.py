@@ -0,0 +1,65 @@
+from datetime import date, datetime, timedelta
+
+from api import db
+from api.helpers.campaign_analytics_helper import (
+    get_campaign_daily_stats,
+    get_comment_velocity,
+    get_follow_to_donate_conversion,
+    get_follower_growth,
+    get_top_donors,
+    refresh_campaign_analytics,
+)
+from api.helpers.donation_helper import updateDonationStatus
+from api.models.cf_models import Comments, DonationStatus, Follows
+
+
+def test_refresh_feeds_the_dashboard_readers(make_user, make_campaign, make_donation):
+    alice, bob = make_user(), make_user()
+    campaign = make_campaign()
+    make_donation(alice, campaign, amount="30.00", status=DonationStatus.COMPLETED)
+    make_donation(bob, campaign, amount="10.00", status=DonationStatus.COMPLETED)
+    make_donation(bob, campaign, amount="99.00")
+    db.session.add_all(
+        [
+            Follows(user_id=alice.user_id, campaign_id=campaign.campaign_id),
+            Follows(user_id=make_user().user_id, campaign_id=campaign.campaign_id),
+            Comments(user_id=bob.user_id, campaign_id=campaign.campaign_id, content="Go!"),
+        ]
+    )
+    db.session.commit()
+
+    refresh_campaign_analytics()
+
+    [today] = get_campaign_daily_stats(campaign.campaign_id)
+    assert today["donation_count"] == 3
+    assert today["completed_donation_count"] == 2
+    assert get_follower_growth(campaign.campaign_id) == [
+        {"day": date.today().isoformat(), "new_followers": 2, "total_followers": 2}
+    ]
+    assert get_comment_velocity(campaign.campaign_id)["comments"] == 1
+    assert get_follow_to_donate_conversion(campaign.campaign_id)["converted_followers"] == 1
+
+    top = get_top_donors(campaign_id=campaign.campaign_id, limit=1)
+    assert [(d["user_id"], d["total_amount"]) for d in top] == [(alice.user_id, 30.0)]
+    assert [d["user_id"] for d in get_top_donors()] == [alice.user_id, bob.user_id]
+
+
+def test_late_completion_reaches_the_rollups(make_user, make_campaign, make_donation):
+    donor, campaign = make_user(), make_campaign()
+    donation = make_donation(donor, campaign, amount="25.00")
+    created = datetime.utcnow() - timedelta(days=10)
+    donation.created_at = donation.updated_at = created
+    db.session.commit()
+    refresh_campaign_analytics()
+    assert get_top_donors(campaign_id=campaign.campaign_id) == []
+
+    # Completed well outside the lookback window of its creation day.
+    updateDonationStatus(donation.donation_id, "Completed")
+    report = refresh_campaign_analytics()
+    assert report["refreshed_from"] is not None
+
+    [donor_total] = get_top_donors(campaign_id=campaign.campaign_id)
+    assert donor_total["total_amount"] == 25.0
+    [day] = get_campaign_daily_stats(campaign.campaign_id)
+    assert day["day"] == created.date()
+    assert day["completed_donation_count"] == 1
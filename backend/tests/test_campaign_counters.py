@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from api import db
+from api.helpers.campaign_counter_helper import (
+    find_counter_drift,
+    reconcile_campaign_counters,
+)
+from api.helpers.donation_helper import (
+    cancel_donation,
+    create_donation,
+    updateDonationStatus,
+)
+from api.models.cf_models import Campaigns, DonationStatus
+
+
+def _counters(campaign_id):
+    campaign = db.session.get(Campaigns, campaign_id, populate_existing=True)
+    return (
+        campaign.raised_amount,
+        campaign.donor_count,
+        campaign.completed_donation_count,
+    )
+
+
+def test_transitions_adjust_counters(make_user, make_campaign):
+    donor = make_user()
+    campaign = make_campaign()
+    first = create_donation(donor.user_id, campaign.campaign_id, 40, "Pending")
+    second = create_donation(donor.user_id, campaign.campaign_id, 60, "Pending")
+
+    updateDonationStatus(first["donation_id"], "Completed")
+    updateDonationStatus(second["donation_id"], "Completed")
+    assert _counters(campaign.campaign_id) == (Decimal("100.00"), 1, 2)
+
+    cancel_donation(first["donation_id"])
+    assert _counters(campaign.campaign_id) == (Decimal("60.00"), 1, 1)
+    assert find_counter_drift() == []
+
+
+def test_transition_reads_committed_status(make_user, make_campaign, make_donation):
+    donor = make_user()
+    campaign = make_campaign()
+    donation = make_donation(donor, campaign, amount="50.00")
+    assert donation.status == DonationStatus.PENDING
+
+    # Another worker completes the donation after this session loaded it.
+    with db.engine.begin() as connection:
+        connection.execute(
+            text("UPDATE donations SET status = 'COMPLETED' WHERE donation_id = :id"),
+            {"id": donation.donation_id},
+        )
+        connection.execute(
+            text(
+                "UPDATE campaigns SET raised_amount = 50, donor_count = 1, "
+                "completed_donation_count = 1 WHERE campaign_id = :id"
+            ),
+            {"id": campaign.campaign_id},
+        )
+
+    updateDonationStatus(donation.donation_id, "Completed")
+    assert _counters(campaign.campaign_id) == (Decimal("50.00"), 1, 1)
+    assert find_counter_drift() == []
+
+
+def test_reconcile_locks_campaigns_before_recounting(
+    make_user, make_campaign, make_donation, count_queries
+):
+    first, second = make_campaign(), make_campaign()
+    for campaign in (second, first):
+        make_donation(make_user(), campaign, status=DonationStatus.COMPLETED)
+    db.session.execute(text("UPDATE campaigns SET raised_amount = 0, donor_count = 0"))
+    db.session.commit()
+
+    with count_queries() as statements:
+        report = reconcile_campaign_counters()
+
+    assert (report["drifted_campaigns"], report["fixed"]) == (2, True)
+    [lock] = [s for s in statements if "FOR UPDATE" in s]
+    assert "ORDER BY campaigns.campaign_id" in lock
+    assert statements.index(lock) < [s.startswith("UPDATE") for s in statements].index(True)
+    assert _counters(first.campaign_id) == (Decimal("50.00"), 1, 1)
+    assert find_counter_drift() == []
@@ -0,0 +1,109 @@
+import pytest
+
+from api import db
+
+from api.helpers.campaign_helper import (
+    search_campaign_by_title,
+    view_all_active_campaigns,
+    view_all_campaigns,
+    view_all_campaigns_paginated,
+    view_campaign_by_campaign_id,
+    view_campaigns_by_category,
+)
+from api.models.cf_models import CampaignCategory, CampaignStatus
+
+CAMPAIGNS = 5
+
+
+@pytest.fixture
+def campaigns(make_campaign):
+    return [
+        make_campaign(title=f"Clean water {n}", category=CampaignCategory.HEALTHCARE)
+        for n in range(CAMPAIGNS)
+    ]
+
+
+LIST_CALLS = [
+    ("view_all_campaigns", lambda **kw: view_all_campaigns(**kw)),
+    ("view_all_active_campaigns", lambda **kw: view_all_active_campaigns(**kw)),
+    (
+        "view_campaigns_by_category",
+        lambda **kw: view_campaigns_by_category("healthcare", **kw),
+    ),
+    ("search_campaign_by_title", lambda **kw: search_campaign_by_title("water", **kw)),
+]
+
+
+@pytest.mark.parametrize("projection", [False, True])
+@pytest.mark.parametrize("name,call", LIST_CALLS, ids=[name for name, _ in LIST_CALLS])
+def test_list_helpers_issue_one_query(campaigns, count_queries, name, call, projection):
+    with count_queries() as statements:
+        rows = call(projection=projection)
+
+    assert len(rows) == CAMPAIGNS
+    assert all(row["creator"]["username"] for row in rows)
+    assert len(statements) == 1, statements
+
+
+@pytest.mark.parametrize("projection", [False, True])
+@pytest.mark.parametrize("name,call", LIST_CALLS, ids=[name for name, _ in LIST_CALLS])
+def test_keyset_pages_issue_one_query(campaigns, count_queries, name, call, projection):
+    with count_queries() as statements:
+        page = call(projection=projection, limit=2)
+
+    assert len(page["items"]) == 2
+    assert page["next_cursor"]
+    assert len(statements) == 1, statements
+
+
+@pytest.mark.parametrize("projection", [False, True])
+def test_paginated_view_adds_only_the_estimate_query(campaigns, count_queries, projection):
+    with count_queries() as statements:
+        page = view_all_campaigns_paginated(per_page=3, projection=projection)
+
+    assert len(page["items"]) == 3
+    assert "approximate_total" in page
+    assert len(statements) == 2, statements
+
+
+def test_paginated_total_estimates_the_filtered_rows(campaigns, make_campaign):
+    for n in range(CAMPAIGNS * 4):
+        make_campaign(title=f"Campaign {n}", category=CampaignCategory.ANIMALS)
+    make_campaign(category=CampaignCategory.ANIMALS, status=CampaignStatus.PENDING)
+    db.session.execute(db.text("ANALYZE campaigns"))
+
+    assert view_all_campaigns_paginated()["approximate_total"] == CAMPAIGNS * 5 + 1
+    assert view_all_campaigns_paginated(category="healthcare")["approximate_total"] == CAMPAIGNS
+    pending = view_all_campaigns_paginated(category="animals", status="pending")
+    assert pending["approximate_total"] == 1
+    assert len(pending["items"]) == 1
+
+
+def test_query_count_does_not_grow_with_rows(make_campaign, count_queries):
+    for n in range(CAMPAIGNS * 4):
+        make_campaign(title=f"Campaign {n}")
+
+    with count_queries() as statements:
+        rows = view_all_campaigns()
+
+    assert len(rows) == CAMPAIGNS * 4
+    assert len(statements) == 1
+
+
+def test_campaign_detail_helper(campaigns, count_queries):
+    campaign_id, creator_id = campaigns[0].campaign_id, campaigns[0].creator_id
+    with count_queries() as statements:
+        campaign = view_campaign_by_campaign_id(campaign_id)
+
+    assert campaign["creator"]["user_id"] == creator_id
+    assert len(statements) == 1, statements
+
+
+def test_campaign_list_endpoint(client, campaigns, count_queries):
+    with count_queries() as statements:
+        response = client.get("/campaigns/?limit=3")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]["items"]) == 3
+    # version check + page + approximate total
+    assert len(statements) == 3, statements
@@ -0,0 +1,43 @@
+from api import db
+from api.helpers.comment_helper import (
+    create_comment,
+    fold_all_like_shards,
+    get_total_likes,
+    set_sharded_likes,
+    toggle_like,
+)
+from api.models.cf_models import CommentLikeShards, Comments
+
+
+def test_toggle_like_likes_then_unlikes(make_user, make_campaign):
+    alice, bob = make_user(), make_user()
+    comment_id = create_comment(alice.user_id, make_campaign().campaign_id, "Hi")["comment_id"]
+
+    liked = toggle_like(comment_id, alice.user_id)
+    assert (liked["liked"], liked["likes"]) == (True, 1)
+    assert toggle_like(comment_id, bob.user_id)["likes"] == 2
+
+    unliked = toggle_like(comment_id, alice.user_id)
+    assert unliked["message"] == "Comment unliked successfully"
+    assert (unliked["liked"], unliked["likes"]) == (False, 1)
+
+    # Liking again after an unlike counts once more, not twice.
+    assert toggle_like(comment_id, alice.user_id)["likes"] == 2
+    assert db.session.get(Comments, comment_id).likes == 2
+
+
+def test_sharded_likes_are_folded_into_the_served_count(make_user, make_campaign):
+    alice, bob = make_user(), make_user()
+    comment_id = create_comment(alice.user_id, make_campaign().campaign_id, "Hi")["comment_id"]
+    toggle_like(comment_id, alice.user_id)
+    set_sharded_likes(comment_id)
+
+    assert toggle_like(comment_id, bob.user_id)["likes"] == 2
+    assert get_total_likes(comment_id) == 2
+    assert CommentLikeShards.query.count() == 1
+
+    assert fold_all_like_shards() == 1
+    db.session.expire_all()
+    assert db.session.get(Comments, comment_id).to_dict()["likes"] == 2
+    assert CommentLikeShards.query.count() == 0
+    assert get_total_likes(comment_id) == 2
@@ -0,0 +1,42 @@
+from api import db
+from api.helpers.campaign_helper import delete_campaign
+
+
+def _revalidate(client, path, etag):
+    return client.get(path, headers={"If-None-Match": etag})
+
+
+def test_campaign_etag_follows_creator_changes(client, make_campaign):
+    campaign = make_campaign()
+    path = f"/campaigns/{campaign.campaign_id}"
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert _revalidate(client, path, etag).status_code == 304
+
+    campaign.creator.username = "renamed"
+    db.session.commit()
+    response = _revalidate(client, path, etag)
+    assert response.status_code == 200
+    assert response.get_json()["data"]["creator"]["username"] == "renamed"
+    assert response.headers["ETag"] != etag
+
+
+def test_collection_etag_sees_deletions_and_creator_changes(client, make_campaign):
+    kept, deleted = make_campaign(), make_campaign()
+    etag = client.get("/campaigns/").headers["ETag"]
+    assert _revalidate(client, "/campaigns/", etag).status_code == 304
+
+    delete_campaign(deleted.campaign_id)
+    response = _revalidate(client, "/campaigns/", etag)
+    assert response.status_code == 200
+    assert [c["campaign_id"] for c in response.get_json()["data"]["items"]] == [
+        kept.campaign_id
+    ]
+
+    etag = response.headers["ETag"]
+    kept.creator.profile_image = "avatar.png"
+    db.session.commit()
+    response = _revalidate(client, "/campaigns/", etag)
+    assert response.status_code == 200
+    assert response.get_json()["data"]["items"][0]["creator"]["profile_image"] == "avatar.png"
@@ -0,0 +1,38 @@
+from api import db
+from api.helpers.campaign_helper import update_campaign_status
+from api.helpers.notification_helper import retry_pending_fan_outs
+from api.models.cf_models import CampaignStatus, CampaignUpdates, Follows, Notifications
+
+
+def test_failed_fan_out_does_not_fail_committed_write(make_campaign, monkeypatch):
+    def fail(update_id):
+        raise RuntimeError("broker down")
+
+    monkeypatch.setattr("api.helpers.notification_helper.fan_out_campaign_update", fail)
+    campaign = make_campaign(status=CampaignStatus.PENDING)
+
+    result = update_campaign_status(campaign.campaign_id, CampaignStatus.ACTIVE)
+    assert result["status"] == CampaignStatus.ACTIVE.value
+    assert CampaignUpdates.query.filter_by(campaign_id=campaign.campaign_id).count() == 1
+
+
+def test_dropped_fan_out_is_retried(app, make_user, make_campaign, monkeypatch):
+    campaign = make_campaign(status=CampaignStatus.PENDING)
+    follower = make_user()
+    db.session.add(Follows(user_id=follower.user_id, campaign_id=campaign.campaign_id))
+    db.session.commit()
+
+    # The broker is down: enqueue() logs and returns None.
+    monkeypatch.setattr("api.helpers.campaign_helper.enqueue", lambda *args: None)
+    update_campaign_status(campaign.campaign_id, CampaignStatus.ACTIVE)
+    update = CampaignUpdates.query.filter_by(campaign_id=campaign.campaign_id).one()
+    assert update.fanned_out is False
+
+    assert retry_pending_fan_outs()["retried"] == []
+    monkeypatch.setitem(app.config, "FAN_OUT_RETRY_AFTER_SECONDS", 0)
+    assert retry_pending_fan_outs() == {"retried": [update.update_id], "failed": []}
+
+    db.session.expire_all()
+    assert db.session.get(CampaignUpdates, update.update_id).fanned_out is True
+    assert Notifications.query.filter_by(update_id=update.update_id).count() == 1
+    assert retry_pending_fan_outs()["retried"] == []
@@ -0,0 +1,90 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from flask import g
+
+from api import db
+from api.models.cf_models import CampaignPaymentStatus, Payments, UserRole
+
+
+def _get(client, path, headers):
+    g.pop("jwt_claims", None)
+    return client.get(path, headers=headers)
+
+
+@pytest.fixture
+def export_setup(make_user, make_campaign, make_donation, auth_header):
+    campaign = make_campaign()
+    donations = [
+        make_donation(make_user(), campaign, amount=amount)
+        for amount in ("10.00", "25.50")
+    ]
+    db.session.add_all(
+        Payments(
+            donation_id=donation.donation_id,
+            amount=donation.amount,
+            payment_method="card",
+            payment_status=CampaignPaymentStatus.SUCCESSFUL,
+            transaction_ref=f"ref-{donation.donation_id}",
+        )
+        for donation in donations
+    )
+    db.session.commit()
+    return campaign.campaign_id, auth_header(make_user(role=UserRole.ADMIN))
+
+
+def test_payment_export_streams_csv(client, export_setup):
+    _, headers = export_setup
+    response = _get(client, "/payments/export", headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in response.headers
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(r["transaction_ref"], r["amount"]) for r in rows] == [
+        ("ref-1", "10.0"),
+        ("ref-2", "25.5"),
+    ]
+
+
+def test_donation_export_streams_ndjson(client, export_setup):
+    campaign_id, headers = export_setup
+    response = _get(
+        client, f"/donations/campaign/{campaign_id}/export?format=ndjson", headers
+    )
+
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(r["donation_id"], r["amount"]) for r in rows] == [(1, 10.0), (2, 25.5)]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, compressed",
+    [
+        ("gzip", True),
+        ("br, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("identity", False),
+    ],
+)
+def test_export_negotiates_gzip(client, export_setup, accept_encoding, compressed):
+    _, headers = export_setup
+    response = _get(
+        client,
+        "/payments/export?format=ndjson",
+        {**headers, "Accept-Encoding": accept_encoding},
+    )
+
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert (response.headers.get("Content-Encoding") == "gzip") is compressed
+    body = response.get_data()
+    if compressed:
+        body = gzip.decompress(body)
+    assert [json.loads(line)["transaction_ref"] for line in body.splitlines()] == [
+        "ref-1",
+        "ref-2",
+    ]
@@ -0,0 +1,161 @@
+import re
+
+import pytest
+
+from api import db
+from api.helpers.donation_helper import view_all_donations_by_campaign
+from api.helpers.payment_helper import view_all_payments
+from api.models.cf_models import CampaignPaymentStatus, Payments
+
+
+@pytest.fixture
+def payment_id(make_user, make_campaign, make_donation):
+    campaign = make_campaign()
+    payment_ids = []
+    for n in range(3):
+        donation = make_donation(make_user(), campaign)
+        payment = Payments(
+            donation_id=donation.donation_id,
+            amount=donation.amount,
+            payment_method="card",
+            payment_status=CampaignPaymentStatus.SUCCESSFUL,
+            transaction_ref=f"ref-{n}",
+        )
+        db.session.add(payment)
+        db.session.commit()
+        payment_ids.append(payment.payment_id)
+    db.session.expunge_all()
+    return payment_ids[0]
+
+
+def _select_list(statement):
+    return re.split(r"\sFROM\s", statement)[0]
+
+
+def _table(statement):
+    return re.split(r"\sFROM\s", statement)[1].split()[0]
+
+
+def _campaign_id():
+    return db.session.execute(db.text("SELECT min(campaign_id) FROM campaigns")).scalar()
+
+
+PAYMENT_COLUMNS = ("payment_id", "donation_id", "amount", "payment_method", "payment_status")
+
+# (label, helper, fields, expand, one entry per emitted SELECT:
+#  (table, columns it must select, columns it must not select))
+CASES = [
+    (
+        "default",
+        view_all_payments,
+        None,
+        None,
+        [
+            ("payments", PAYMENT_COLUMNS, ()),
+            ("donations", ("donation_id", "amount", "user_id", "campaign_id"), ()),
+            ("users", ("user_id", "username"), ()),
+            ("campaigns", ("campaign_id", "title"), ()),
+        ],
+    ),
+    (
+        "ids only",
+        view_all_payments,
+        "payment_id",
+        None,
+        [("payments", ("payment_id",), ("amount", "payment_method", "donation_id"))],
+    ),
+    (
+        "fields without expand",
+        view_all_payments,
+        "payment_id,payment_method",
+        None,
+        [("payments", ("payment_id", "payment_method"), ("amount", "donation_id"))],
+    ),
+    (
+        "expand donation",
+        view_all_payments,
+        "payment_id,donation",
+        "donation",
+        [
+            ("payments", ("payment_id", "donation_id"), ("amount", "payment_method")),
+            ("donations", ("donation_id", "amount"), ("user_id", "status", "created_at")),
+        ],
+    ),
+    (
+        "nested expand",
+        view_all_payments,
+        None,
+        "donation.donor",
+        [
+            ("payments", PAYMENT_COLUMNS, ()),
+            ("donations", ("donation_id", "user_id"), ("campaign_id", "status")),
+            ("users", ("user_id", "username"), ("email", "role", "password_hash")),
+        ],
+    ),
+    (
+        "expand donor",
+        view_all_donations_by_campaign,
+        "donation_id,donor",
+        "donor",
+        [
+            ("donations", ("donation_id", "user_id"), ("amount", "campaign_id", "status")),
+            ("users", ("user_id", "username"), ("email", "role")),
+        ],
+    ),
+    (
+        "expand campaign",
+        view_all_donations_by_campaign,
+        "donation_id,campaign",
+        "campaign",
+        [
+            ("donations", ("donation_id", "campaign_id"), ("amount", "user_id", "status")),
+            ("campaigns", ("campaign_id", "title"), ("description", "goal_amount")),
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "helper, fields, expand, expected",
+    [case[1:] for case in CASES],
+    ids=[case[0] for case in CASES],
+)
+def test_fieldset_sql(payment_id, count_queries, helper, fields, expand, expected):
+    args = (_campaign_id(),) if helper is view_all_donations_by_campaign else ()
+    with count_queries() as statements:
+        rows = helper(*args, fields=fields, expand=expand)
+
+    assert len(rows) == 3
+    assert len(statements) == len(expected), statements
+    by_table = {_table(statement): statement for statement in statements}
+    for table, included, excluded in expected:
+        selected = _select_list(by_table[table])
+        for column in included:
+            assert f"{table}.{column}" in selected
+        for column in excluded:
+            assert f"{table}.{column}" not in selected
+
+
+def test_dotted_field_implies_expand_and_loads_only_requested_columns(
+    payment_id, count_queries
+):
+    with count_queries() as statements:
+        rows = view_all_payments(fields="payment_id,donation.amount")
+
+    assert rows[0] == {"payment_id": payment_id, "donation": {"amount": 50.0}}
+    assert len(statements) == 2
+
+    parent = _select_list(statements[0])
+    assert "payments.payment_id" in parent and "payments.donation_id" in parent
+    for column in ("payment_method", "payment_status", "transaction_ref", "amount"):
+        assert f"payments.{column}" not in parent
+
+    child = _select_list(statements[1])
+    assert "donations.donation_id" in child and "donations.amount" in child
+    for column in ("user_id", "campaign_id", "status", "created_at", "completed_at"):
+        assert f"donations.{column}" not in child
+
+
+def test_unknown_nested_field_is_rejected(payment_id):
+    with pytest.raises(ValueError):
+        view_all_payments(fields="donation.status")
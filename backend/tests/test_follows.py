@@ -0,0 +1,15 @@
+import pytest
+
+from api.helpers.follow_helper import follow_campaign
+
+
+def test_follow_errors_are_told_apart(make_user, make_campaign):
+    user, campaign = make_user(), make_campaign()
+    follow_campaign(user.user_id, campaign.campaign_id)
+
+    with pytest.raises(ValueError):
+        follow_campaign(user.user_id, campaign.campaign_id)
+    with pytest.raises(LookupError):
+        follow_campaign(user.user_id, 999999)
+    with pytest.raises(LookupError):
+        follow_campaign(999999, campaign.campaign_id)
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from flask import g
+
+from api.helpers.fieldset_helper import apply_fieldset
+from api.instrumentation import DEBUG_HEADER, RequestStats
+from api.models.cf_models import Campaigns
+
+REMOTE = {"REMOTE_ADDR": "10.0.0.5"}
+
+
+def test_metrics_only_served_to_loopback_without_token(client):
+    assert client.get("/metrics", environ_overrides=REMOTE).status_code == 403
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert b"http_requests_total" in response.data
+
+
+def test_metrics_token(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "INSTRUMENTATION_METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 403
+    wrong = {"Authorization": "Bearer nope"}
+    assert client.get("/metrics", headers=wrong).status_code == 403
+    right = {"Authorization": "Bearer s3cret"}
+    assert client.get("/metrics", headers=right, environ_overrides=REMOTE).status_code == 200
+
+
+@pytest.fixture
+def debug_header(app, monkeypatch):
+    monkeypatch.setitem(app.config, "INSTRUMENTATION_DEBUG_HEADER", True)
+
+
+def test_projection_serializer_is_timed(client, debug_header, make_campaign):
+    make_campaign()
+    response = client.get("/campaigns/", headers={DEBUG_HEADER: "1"})
+    assert response.status_code == 200
+    summary = json.loads(response.headers[DEBUG_HEADER])
+    assert summary["serialization_time_ms"] > 0
+
+
+def test_fieldset_serializer_is_timed(app, make_campaign):
+    campaign = make_campaign()
+    query, serializer = apply_fieldset(Campaigns.query, Campaigns, "campaign_id,title")
+    with app.test_request_context():
+        g._request_stats = RequestStats()
+        assert serializer(query.filter_by(campaign_id=campaign.campaign_id).one()) == {
+            "campaign_id": campaign.campaign_id,
+            "title": campaign.title,
+        }
+        assert g._request_stats.serialization_time > 0
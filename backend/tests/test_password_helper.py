@@ -0,0 +1,41 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from api.helpers.password_helper import PasswordHasher, _hash
+from api.models.cf_models import Users
+
+SCRYPT = generate_password_hash("pw", method="scrypt")
+PBKDF2 = generate_password_hash("pw", method="pbkdf2")
+
+
+@pytest.mark.parametrize(
+    "method,stored_hash,expected",
+    [
+        ("scrypt", SCRYPT, False),
+        ("scrypt:32768:8:1", SCRYPT, False),
+        ("scrypt:65536:8:1", SCRYPT, True),
+        ("pbkdf2", PBKDF2, False),
+        ("pbkdf2:sha256", PBKDF2, False),
+        ("pbkdf2:sha512", PBKDF2, True),
+        ("scrypt", PBKDF2, True),
+    ],
+)
+def test_needs_rehash_compares_normalized_parameters(method, stored_hash, expected):
+    assert PasswordHasher(method=method).needs_rehash(stored_hash) is expected
+
+
+def test_needs_rehash_bcrypt_default_rounds():
+    pytest.importorskip("bcrypt")
+    stored_hash = _hash("pw", "bcrypt:4")
+    assert PasswordHasher(method="bcrypt:4").needs_rehash(stored_hash) is False
+    assert PasswordHasher(method="bcrypt:04").needs_rehash(stored_hash) is False
+    assert PasswordHasher(method="bcrypt").needs_rehash(stored_hash) is True
+    assert PasswordHasher(method="bcrypt").needs_rehash(_hash("pw", "bcrypt")) is False
+
+
+def test_user_model_methods_use_the_configured_hasher(app_context):
+    user = Users()
+    user.setPasswordHash("pw")
+    assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+    assert user.checkHashedPassword("pw") is True
+    assert user.checkHashedPassword("nope") is False
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from api import db
+from api.helpers.payment_helper import close_payment_days
+from api.models.cf_models import CampaignPaymentStatus, PaymentDailyTotals, Payments
+
+
+def _ledger():
+    return {
+        (row.day, row.payment_status): (row.payment_count, row.total_amount)
+        for row in PaymentDailyTotals.query
+    }
+
+
+def test_late_status_change_is_reclosed(make_user, make_campaign, make_donation):
+    donation = make_donation(make_user(), make_campaign())
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    payment = Payments(
+        donation_id=donation.donation_id,
+        amount=donation.amount,
+        payment_method="card",
+        payment_status=CampaignPaymentStatus.PENDING,
+        transaction_date=yesterday,
+    )
+    db.session.add(payment)
+    db.session.commit()
+
+    close_payment_days()
+    day = yesterday.date()
+    assert _ledger() == {(day, CampaignPaymentStatus.PENDING): (1, donation.amount)}
+
+    payment.payment_status = CampaignPaymentStatus.SUCCESSFUL
+    db.session.commit()
+
+    report = close_payment_days()
+    assert report["closed_through"] == day
+    assert _ledger() == {(day, CampaignPaymentStatus.SUCCESSFUL): (1, donation.amount)}
+
+    # An earlier --through must not move the watermark backwards.
+    assert close_payment_days(through=day - timedelta(days=5))["closed_through"] == day
+
+
+def test_open_day_is_rejected(app, app_context):
+    with pytest.raises(ValueError):
+        close_payment_days(through=datetime.utcnow().date())
+
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    result = app.test_cli_runner().invoke(
+        args=["close-payment-days", "--through", today]
+    )
+    assert result.exit_code != 0
+    assert "before today" in result.output
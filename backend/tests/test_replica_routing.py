@@ -0,0 +1,176 @@
+import itertools
+
+import pytest
+from sqlalchemy import create_engine, insert, make_url, text
+from sqlalchemy.exc import OperationalError
+
+from api import db
+from api.database import _watch_replica, read_only, replica_router
+from api.helpers.campaign_helper import view_all_campaigns
+from api.models.cf_models import Campaigns, UserRole, Users
+
+REPLICA_DATABASES = ("cf_test_replica_0", "cf_test_replica_1")
+
+
+@pytest.fixture
+def dead_replica(app_context, monkeypatch, tmp_path):
+    engine = create_engine(
+        f"postgresql+psycopg2://postgres@/postgres?host={tmp_path}&connect_timeout=1"
+    )
+    _watch_replica(engine)
+    monkeypatch.setattr("api.database._replica_engines", lambda db: [engine])
+    monkeypatch.setattr(replica_router, "_unhealthy_until", {})
+    yield engine
+    engine.dispose()
+
+
+def test_dead_replica_read_is_retried_on_primary(dead_replica, make_campaign):
+    campaign_id = make_campaign().campaign_id
+    db.session.remove()
+
+    rows = view_all_campaigns()
+    assert [row["campaign_id"] for row in rows] == [campaign_id]
+    assert replica_router.is_marked_unhealthy(dead_replica)
+
+    # The replica stays out of rotation until its retry window passes.
+    assert view_all_campaigns() == rows
+
+
+def test_failover_does_not_discard_pending_changes(dead_replica):
+    db.session.remove()
+    db.session.autoflush = False
+    db.session.add(
+        Users(
+            username="pending",
+            email="pending@example.com",
+            password_hash="x",
+            role=UserRole.DONOR,
+        )
+    )
+
+    @read_only
+    def read():
+        return db.session.execute(db.select(db.literal(1))).scalar()
+
+    with pytest.raises(OperationalError):
+        read()
+    db.session.rollback()
+
+
+@pytest.fixture(scope="session")
+def replica_engines(app):
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    admin = create_engine(url, isolation_level="AUTOCOMMIT")
+    with admin.connect() as connection:
+        for name in REPLICA_DATABASES:
+            connection.execute(text(f"DROP DATABASE IF EXISTS {name}"))
+            connection.execute(text(f"CREATE DATABASE {name}"))
+
+    engines = [create_engine(url.set(database=name)) for name in REPLICA_DATABASES]
+    for engine in engines:
+        with engine.begin() as connection:
+            # Without pg_trgm the app fixture has already dropped the
+            # trigram indexes from the metadata.
+            try:
+                with connection.begin_nested():
+                    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            except Exception:
+                pass
+        db.metadata.create_all(engine, tables=[Users.__table__, Campaigns.__table__])
+    yield engines
+
+    for engine in engines:
+        engine.dispose()
+    with admin.connect() as connection:
+        for name in REPLICA_DATABASES:
+            connection.execute(text(f"DROP DATABASE IF EXISTS {name}"))
+    admin.dispose()
+
+
+def _seed(engine, campaign_id, title):
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE campaigns, users RESTART IDENTITY CASCADE"))
+        creator_id = connection.execute(
+            insert(Users.__table__).returning(Users.__table__.c.user_id),
+            {
+                "username": title,
+                "email": f"{campaign_id}@example.com",
+                "password_hash": "x",
+                "role": UserRole.CREATOR,
+            },
+        ).scalar()
+        connection.execute(
+            insert(Campaigns.__table__),
+            {
+                "campaign_id": campaign_id,
+                "creator_id": creator_id,
+                "title": title,
+                "description": "Served by a replica",
+                "category": "HEALTHCARE",
+                "goal_amount": 100,
+                "status": "ACTIVE",
+            },
+        )
+
+
+@pytest.fixture
+def replicas(replica_engines, make_campaign, monkeypatch):
+    make_campaign(title="Primary")
+    for index, engine in enumerate(replica_engines):
+        _seed(engine, 1000 + index, f"Replica {index}")
+    monkeypatch.setattr("api.database._replica_engines", lambda db: replica_engines)
+    monkeypatch.setattr(replica_router, "_unhealthy_until", {})
+    monkeypatch.setattr(replica_router, "_counter", itertools.count())
+    # Start from a fresh session, as a new request would.
+    db.session.remove()
+    yield replica_engines
+    db.session.remove()
+
+
+def _titles():
+    return [row["title"] for row in view_all_campaigns()]
+
+
+def test_read_only_helper_reads_from_healthy_replica(replicas, monkeypatch):
+    monkeypatch.setattr("api.database._replica_engines", lambda db: replicas[:1])
+    assert _titles() == ["Replica 0"]
+    assert _titles() == ["Replica 0"]
+
+
+def test_reads_alternate_between_replicas(replicas):
+    assert [_titles() for _ in range(4)] == [
+        ["Replica 0"],
+        ["Replica 1"],
+        ["Replica 0"],
+        ["Replica 1"],
+    ]
+
+
+def _flush_write():
+    Campaigns.query.filter_by(title="Primary").one().title = "Written"
+    db.session.flush()
+
+
+def _commit_write():
+    _flush_write()
+    db.session.commit()
+
+
+def _text_write():
+    db.session.execute(text("UPDATE campaigns SET title = 'Written'"))
+
+
+@pytest.mark.parametrize(
+    "write", [_flush_write, _commit_write, _text_write], ids=["flush", "commit", "text"]
+)
+def test_reads_after_a_write_stay_on_primary(replicas, write):
+    assert _titles() == ["Replica 0"]
+
+    write()
+    assert _titles() == ["Written"]
+    assert _titles() == ["Written"]
+
+    # The pin lasts for the session; the next request reads replicas again.
+    db.session.rollback()
+    db.session.remove()
+    assert _titles() in (["Replica 0"], ["Replica 1"])
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+from flask import g
+
+from api import db
+from api.helpers.idempotency_helper import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    purge_expired_idempotency_keys,
+)
+from api.models.cf_models import DonationStatus, Donations, IdempotencyKeys, Payments
+
+
+def _post(client, path, body, headers):
+    # The test client shares the fixture's app context, so drop the claims
+    # cached on g by the previous request.
+    g.pop("jwt_claims", None)
+    return client.post(path, json=body, headers=headers)
+
+
+def test_donations_are_always_created_pending(client, auth_header, make_user, make_campaign):
+    donor, campaign = make_user(), make_campaign()
+    response = client.post(
+        "/donations/",
+        json={"campaign_id": campaign.campaign_id, "amount": "20.00", "status": "Completed"},
+        headers=auth_header(donor),
+    )
+    assert response.status_code == 201
+    assert Donations.query.one().status == DonationStatus.PENDING
+
+
+def test_payment_requires_own_donation_and_matching_amount(
+    client, auth_header, make_user, make_campaign, make_donation
+):
+    donor, other = make_user(), make_user()
+    donation = make_donation(donor, make_campaign(), amount="20.00")
+    body = {"donation_id": donation.donation_id, "payment_method": "card"}
+
+    response = _post(client, "/payments/", body, auth_header(other))
+    assert response.status_code == 403
+
+    response = _post(client, "/payments/", {**body, "amount": "999.00"}, auth_header(donor))
+    assert response.status_code == 400
+
+    response = _post(
+        client, "/payments/", {**body, "payment_status": "successful"}, auth_header(donor)
+    )
+    assert response.status_code == 201
+    payment = Payments.query.one()
+    assert payment.payment_status.value == "pending"
+    assert payment.amount == donation.amount
+
+
+def test_retry_replays_the_stored_response(client, auth_header, make_user, make_campaign):
+    donor, campaign = make_user(), make_campaign()
+    headers = {**auth_header(donor), IDEMPOTENCY_HEADER: "k" * 255}
+    body = {"campaign_id": campaign.campaign_id, "amount": "20.00"}
+
+    first = _post(client, "/donations/", body, headers)
+    assert first.status_code == 201
+    replay = _post(client, "/donations/", body, headers)
+    assert replay.status_code == 201
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    assert replay.get_json() == first.get_json()
+    assert Donations.query.count() == 1
+
+    mismatch = _post(client, "/donations/", {**body, "amount": "30.00"}, headers)
+    assert mismatch.status_code == 422
+    assert Donations.query.count() == 1
+
+
+def test_response_is_stored_with_the_write(client, auth_header, make_user, make_campaign):
+    donor, campaign = make_user(), make_campaign()
+    headers = {**auth_header(donor), IDEMPOTENCY_HEADER: "once"}
+    _post(client, "/donations/", {"campaign_id": campaign.campaign_id, "amount": "20.00"}, headers)
+
+    [record] = IdempotencyKeys.query.all()
+    assert record.status_code == 201
+    assert record.response["data"]["donation_id"] == Donations.query.one().donation_id
+
+
+def test_failed_write_releases_the_key(client, auth_header, make_user):
+    donor = make_user()
+    headers = {**auth_header(donor), IDEMPOTENCY_HEADER: "bad-campaign"}
+    body = {"campaign_id": 999999, "amount": "20.00"}
+
+    assert _post(client, "/donations/", body, headers).status_code == 500
+    assert IdempotencyKeys.query.count() == 0
+
+
+def test_purge_removes_only_expired_keys(app_context):
+    now = datetime.utcnow()
+    for n, expires_at in enumerate([now - timedelta(hours=1)] * 3 + [now + timedelta(hours=1)]):
+        db.session.add(
+            IdempotencyKeys(
+                scope="donations.create",
+                key=f"key-{n}",
+                request_hash="x",
+                created_at=now - timedelta(days=1),
+                expires_at=expires_at,
+            )
+        )
+    db.session.commit()
+
+    assert purge_expired_idempotency_keys(batch_size=2) == 3
+    assert [k.key for k in IdempotencyKeys.query] == ["key-3"]
@@ -0,0 +1,25 @@
+from api import db
+from api.helpers.donation_helper import create_donation, updateDonationStatus
+from api.helpers.trending_helper import refresh_trending_scores
+from api.models.cf_models import Campaigns, DonationStatus
+
+
+def _score(campaign_id):
+    db.session.expire_all()
+    return db.session.get(Campaigns, campaign_id).trending_score
+
+
+def test_donation_counts_when_it_completes(app, make_user, make_campaign, monkeypatch):
+    monkeypatch.setitem(app.config, "TRENDING_SETTLE_SECONDS", 0)
+    campaign = make_campaign()
+    donation = create_donation(
+        make_user().user_id, campaign.campaign_id, "25.00", DonationStatus.PENDING
+    )
+
+    refresh_trending_scores()
+    assert _score(campaign.campaign_id) is None
+
+    # Completed after the watermark passed the donation's created_at.
+    updateDonationStatus(donation["donation_id"], "Completed")
+    refresh_trending_scores()
+    assert _score(campaign.campaign_id) is not None
@@ -0,0 +1,3 @@
+from api import app
+
+celery_app = app.extensions["celery"]